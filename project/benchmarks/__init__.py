@@ -0,0 +1,5 @@
+"""
+Benchmarks do caminho quente (leitura de frames, calibração, colorização, ROIs e CSV)
+em frames sintéticos, sem interface nem arquivos de câmera. Ver benchmarks/__main__.py.
+"""
+from benchmarks.harness import compare, load_results, measure, run_cases
@@ -0,0 +1,59 @@
+"""
+Roda os benchmarks e grava os resultados em JSON; opcionalmente compara com um baseline.
+
+Exemplos (de dentro da pasta do projeto):
+    python -m benchmarks --out baseline.json
+    python -m benchmarks --filter update_image --compare baseline.json --threshold 0.2
+
+Com --compare, o código de saída é 1 se algum caso ficou mais lento que o baseline além
+do limite (--threshold, fração da mediana), o que permite usar o comando num CI.
+"""
+import argparse
+import json
+import sys
+
+from benchmarks.cases import all_cases
+from benchmarks.harness import compare, load_results, run_cases, save_results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks do pipeline de frames.")
+    parser.add_argument("--filter", help="Só os casos cujo nome contém este texto (ex: calibration_apply/vga)")
+    parser.add_argument("--out", help="Arquivo JSON de saída (sem ele, o JSON vai para a saída padrão)")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Lentidão tolerada na comparação, em fração da mediana (padrão: 0.15 = 15%%)")
+    parser.add_argument("--min-time", type=float, default=0.3, help="Segundos mínimos de medição por caso")
+    parser.add_argument("--list", action="store_true", help="Só lista os nomes dos casos")
+    args = parser.parse_args(argv)
+
+    cases = list(all_cases())
+    if args.list:
+        for name, _, _ in cases:
+            if not args.filter or args.filter in name:
+                print(name)
+        return 0
+
+    log = lambda line: print(line, file=sys.stderr)
+    doc = run_cases(cases, args.filter, args.min_time, log=log)
+    if args.out:
+        save_results(doc, args.out)
+    elif not args.compare:
+        json.dump(doc, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        rows, regressions = compare(doc, load_results(args.compare), args.threshold)
+        print(f"\n{'caso':<55} {'baseline':>10} {'atual':>10} {'razão':>7}")
+        for name, old, new, ratio in rows:
+            flag = "  <-- mais lento" if name in regressions else ""
+            print(f"{name:<55} {old:10.3f} {new:10.3f} {ratio:7.2f}{flag}")
+        if regressions:
+            print(f"\n{len(regressions)} caso(s) mais de {args.threshold:.0%} mais lento(s) que o baseline.")
+            return 1
+        print(f"\nNenhuma regressão acima de {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
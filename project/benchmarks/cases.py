@@ -0,0 +1,206 @@
+import os
+import tempfile
+
+import numpy as np
+
+from core.calibration import UserCalibration
+from core.colorize import Colorizer
+from core.roi_manager import RoiManager
+from core.sources import SyntheticFrameSource
+from core.thermal_model import ThermalModel
+
+# Tamanhos de frame (largura, altura) e tipos medidos
+SIZES = {"qvga": (320, 256), "vga": (640, 512), "sxga": (1280, 1024)}
+DTYPES = ("uint16", "float32")
+POLY_DEGREES = (1, 2, 3, 5)
+ROI_SIDES = (16, 64, 256)
+PRECISIONS = ("float32", "float64")
+
+NUM_FRAMES = 256
+
+
+def _frame(size, dtype):
+    w, h = SIZES[size]
+    source = SyntheticFrameSource(w, h, num_frames=NUM_FRAMES)
+    frame = source.read_frame(0)
+    if dtype == "float32":
+        # Mesma faixa de uma unidade calibrada (°C)
+        frame = (frame.astype(np.float32) * 0.01 - 50.0)
+    return frame
+
+
+def _model(size, dtype, cache_mb=0, precision=np.float64):
+    w, h = SIZES[size]
+    model = ThermalModel(cache_mb=cache_mb, precision=precision)
+    model.load_source(SyntheticFrameSource(w, h, num_frames=NUM_FRAMES))
+    if dtype == "float32":
+        model.set_unit("Temperature (Factory)")
+    return model
+
+
+def _qt_app():
+    # Qt sem janela: o widget é criado e desenhado na plataforma "offscreen"
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+def _delete_widget(widget):
+    # Sem event loop o deleteLater nunca roda: entrega a remoção na hora, antes do QApplication sair
+    from PySide6.QtCore import QCoreApplication, QEvent
+    widget.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+
+def frame_data_cases():
+    for size in SIZES:
+        for dtype in DTYPES:
+            def sequential(size=size, dtype=dtype):
+                # Leitura em sequência (reprodução): pré-decodificação ativa, sem cache LRU
+                model = _model(size, dtype)
+                state = {"i": 0}
+                def run():
+                    model.get_frame_data(state["i"] % NUM_FRAMES)
+                    state["i"] += 1
+                return run, model.close
+
+            def seek(size=size, dtype=dtype):
+                # Saltos aleatórios: nada pré-decodificado, o frame é lido na hora
+                model = _model(size, dtype)
+                order = np.random.default_rng(0).permutation(NUM_FRAMES)
+                state = {"i": 0}
+                def run():
+                    model.get_frame_data(int(order[state["i"] % NUM_FRAMES]))
+                    state["i"] += 1
+                return run, model.close
+
+            def sequential_into(size=size, dtype=dtype):
+                # Mesma reprodução, escrevendo num buffer reaproveitado (caminho da interface)
+                model = _model(size, dtype)
+                state = {"i": 0, "out": None}
+                def run():
+                    state["out"] = model.get_frame_into(state["i"] % NUM_FRAMES, state["out"])
+                    state["i"] += 1
+                return run, model.close
+
+            params = {"size": size, "dtype": dtype}
+            yield f"get_frame_data/sequential/{size}/{dtype}", params, sequential
+            yield f"get_frame_data/seek/{size}/{dtype}", params, seek
+            yield f"get_frame_into/sequential/{size}/{dtype}", params, sequential_into
+
+
+def calibration_cases():
+    for size in SIZES:
+        for dtype in DTYPES:
+            for degree in POLY_DEGREES:
+                def factory(size=size, dtype=dtype, degree=degree):
+                    frame = _frame(size, dtype)
+                    coeffs = [-50.0, 0.01] + [1e-9] * (degree - 1)
+                    cal = UserCalibration()
+                    cal.apply(frame, coeffs) # Monta a tabela (counts inteiros) fora da medição
+                    return (lambda: cal.apply(frame, coeffs)), None
+                yield (f"calibration_apply/{size}/{dtype}/deg{degree}",
+                       {"size": size, "dtype": dtype, "degree": degree}, factory)
+
+
+def update_image_cases():
+    for size in SIZES:
+        for dtype in DTYPES:
+            def factory(size=size, dtype=dtype):
+                _qt_app()
+                from ui.video_widget import ThermalVideoWidget
+                from utils.config import PALETTES
+                widget = ThermalVideoWidget()
+                frame = _frame(size, dtype)
+                v_min, v_max = float(frame.min()), float(frame.max())
+                return (lambda: widget.update_image(frame, PALETTES["Ironbow"], v_min, v_max)), lambda: _delete_widget(widget)
+            yield f"update_image/{size}/{dtype}", {"size": size, "dtype": dtype}, factory
+
+
+def roi_stats_cases():
+    size = "vga"
+    for dtype in DTYPES:
+        for kind in ("Rect", "Circle"):
+            for side in ROI_SIDES:
+                def factory(dtype=dtype, kind=kind, side=side):
+                    _qt_app()
+                    from ui.video_widget import ThermalVideoWidget
+                    widget = ThermalVideoWidget()
+                    frame = _frame(size, dtype)
+                    widget.raw_data = frame
+                    widget.roi_engine.set_frame(frame)
+                    h, w = frame.shape
+                    x0, y0 = (w - side) / 2, (h - side) / 2
+                    widget.roi_manager.add(kind, (x0, y0, x0 + side, y0 + side))
+                    return widget.calculate_roi_stats, lambda: _delete_widget(widget)
+                yield (f"calculate_roi_stats/{size}/{dtype}/{kind.lower()}{side}",
+                       {"size": size, "dtype": dtype, "kind": kind, "side": side}, factory)
+
+
+def export_csv_cases():
+    for size in SIZES:
+        for dtype in DTYPES:
+            def factory(size=size, dtype=dtype):
+                model = _model(size, dtype)
+                model.get_frame_data(0)
+                # Pasta criada só quando o caso roda (não no --list) e apagada junto com ele
+                tmp_dir = tempfile.TemporaryDirectory(prefix="thermal-bench-")
+                path = os.path.join(tmp_dir.name, f"{size}_{dtype}.csv")
+                def cleanup():
+                    model.close()
+                    tmp_dir.cleanup()
+                return (lambda: model.export_csv(path)), cleanup
+            yield f"export_csv/{size}/{dtype}", {"size": size, "dtype": dtype}, factory
+
+
+def precision_cases():
+    # Mesmo trabalho em float32 e float64: a diferença é a banda de memória de cada etapa
+    coeffs = [-50.0, 0.01, 1e-9]
+    for size in ("vga", "sxga"):
+        for precision in PRECISIONS:
+            def calibration(size=size, precision=precision, dtype="uint16"):
+                frame = _frame(size, dtype)
+                cal = UserCalibration(precision)
+                out = cal.apply(frame, coeffs)
+                return (lambda: cal.apply(frame, coeffs, out=out)), None
+
+            def playback(size=size, precision=precision):
+                # Reprodução calibrada sem cache (pool de buffers), como na interface
+                model = _model(size, "uint16", precision=precision)
+                model.user_cal.set_temp_coeffs(coeffs)
+                model.set_unit("Temperature (User)")
+                state = {"i": 0, "out": None}
+                def run():
+                    state["out"] = model.get_frame_into(state["i"] % NUM_FRAMES, state["out"])
+                    state["i"] += 1
+                return run, model.close
+
+            def roi_stats(size=size, precision=precision):
+                frame = UserCalibration(precision).apply(_frame(size, "uint16"), coeffs)
+                rois = RoiManager(dtype=precision)
+                h, w = frame.shape
+                for k in range(4):
+                    rois.add("Rect", (k * w // 5, h // 4, (k + 1) * w // 5, 3 * h // 4))
+                return (lambda: rois.compute(frame)), None
+
+            def colorize(size=size, precision=precision):
+                frame = UserCalibration(precision).apply(_frame(size, "uint16"), coeffs)
+                colorizer = Colorizer()
+                out = np.empty(frame.shape, dtype=np.uint32)
+                v_min, v_max = float(frame.min()), float(frame.max())
+                return (lambda: colorizer.colorize(frame, v_min, v_max, out=out)), None
+
+            params = {"size": size, "precision": precision}
+            yield f"precision/calibration/{size}/{precision}", params, calibration
+            yield f"precision/playback/{size}/{precision}", params, playback
+            yield f"precision/roi_stats/{size}/{precision}", params, roi_stats
+            yield f"precision/colorize/{size}/{precision}", params, colorize
+
+
+def all_cases():
+    yield from frame_data_cases()
+    yield from calibration_cases()
+    yield from update_image_cases()
+    yield from roi_stats_cases()
+    yield from export_csv_cases()
+    yield from precision_cases()
@@ -0,0 +1,117 @@
+import ctypes
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import cv2
+import numpy as np
+
+
+def measure(fn, min_time=0.3, min_repeats=5, max_repeats=200, warmup=1):
+    """
+    Cronometra fn() repetidas vezes (pelo menos `min_repeats` e até somar `min_time`
+    segundos) depois de `warmup` chamadas descartadas. Tempos em milissegundos.
+    """
+    for _ in range(warmup):
+        fn()
+    times = []
+    total = 0.0
+    while len(times) < min_repeats or (total < min_time and len(times) < max_repeats):
+        t0 = time.perf_counter()
+        fn()
+        dt = time.perf_counter() - t0
+        times.append(dt * 1000)
+        total += dt
+    return {
+        "median_ms": statistics.median(times),
+        "min_ms": min(times),
+        "mean_ms": statistics.fmean(times),
+        "stdev_ms": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "repeats": len(times),
+    }
+
+
+def run_cases(cases, pattern=None, min_time=0.3, log=None):
+    """
+    Executa os casos (nome, parâmetros, fábrica) cujo nome contém `pattern`. A fábrica
+    monta os dados fora da medição e devolve (função cronometrada, limpeza ou None);
+    a limpeza roda logo depois, para um caso não deixar threads trabalhando no próximo.
+    Retorna o documento JSON com o ambiente e os resultados por nome.
+    """
+    results = {}
+    for name, params, factory in cases:
+        if pattern and pattern not in name:
+            continue
+        refs = _bool_refs()
+        fn, cleanup = factory()
+        try:
+            result = measure(fn, min_time=min_time)
+        finally:
+            if cleanup: cleanup()
+            _restore_bool_refs(refs)
+        result["params"] = params
+        results[name] = result
+        if log:
+            log(f"{name:<55} {result['median_ms']:10.3f} ms  (n={result['repeats']})")
+    return {"environment": environment(), "results": results}
+
+
+def _bool_refs():
+    return sys.getrefcount(True), sys.getrefcount(False)
+
+
+def _restore_bool_refs(before):
+    """
+    Devolve as referências a True/False perdidas durante um caso. No PySide6 6.12 com
+    Python < 3.12, cada Signal.emit() devolve True sem incrementar a contagem; somando
+    os casos de Qt ela chega a zero e o interpretador aborta ao sair (bool_dealloc).
+    """
+    for value, count in zip((True, False), before):
+        for _ in range(count - sys.getrefcount(value)):
+            ctypes.pythonapi.Py_IncRef(ctypes.py_object(value))
+
+
+def environment():
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def load_results(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_results(doc, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2)
+
+
+def compare(current, baseline, threshold=0.15, stat="median_ms"):
+    """
+    Compara dois documentos de resultados caso a caso. Um caso regrediu quando ficou
+    mais de `threshold` (fração, 0.15 = 15%) mais lento que no baseline.
+    Retorna (linhas, regressões), onde cada linha é (nome, baseline, atual, razão).
+    Casos que só existem de um lado ficam de fora.
+    """
+    rows = []
+    regressions = []
+    base = baseline["results"]
+    for name, result in current["results"].items():
+        if name not in base:
+            continue
+        old, new = base[name][stat], result[stat]
+        ratio = new / old if old > 0 else float("inf")
+        rows.append((name, old, new, ratio))
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return rows, regressions
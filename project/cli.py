@@ -0,0 +1,255 @@
+"""
+Processamento em lote sem interface gráfica (não importa o PySide6).
+
+Exemplos:
+    python cli.py "campanha/*.ats" --unit temperature --summary --export npz --out resultados
+    python cli.py "dados/**/*.ats" --unit user-temp --temp-coeffs="-50, 0.01" \\
+        --roi Rect:10,10,60,50 --roi "Polygon:300,50;400,60;350,150" --roi-series \\
+        --frames 0:1000:2 --workers 4 --out resultados
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from core.export import EXPORT_FORMATS, available_formats
+from core.extraction import write_series_csv
+from core.roi_manager import RoiManager
+from core.sources import UNIT_COUNTS, UNIT_RADIANCE, UNIT_TEMPERATURE
+from core.thermal_model import ThermalModel
+from utils.config import COMPUTE_PRECISION, PRECISION_CHOICES
+
+# Nomes curtos aceitos em --unit -> nomes do menu de unidades do ThermalModel
+UNIT_CHOICES = {
+    "counts": "Counts (Raw)",
+    "radiance": "Radiance (Factory)",
+    "temperature": "Temperature (Factory)",
+    "user-temp": "Temperature (User)",
+    "user-rad": "Radiance (User)",
+}
+# Unidades de fábrica que --index precisa converter além dos counts
+FACTORY_UNITS = {"radiance": UNIT_RADIANCE, "temperature": UNIT_TEMPERATURE}
+
+SUMMARY_COLUMNS = ["file", "unit", "frames", "min", "max", "mean", "std", "seconds", "error"]
+
+
+def parse_coeffs(text):
+    return [float(x) for x in text.split(",")] if text else []
+
+
+def parse_frames(text):
+    """"início:fim:passo" no estilo das fatias do Python (qualquer parte pode ficar vazia)."""
+    parts = (text or "").split(":")
+    if len(parts) > 3:
+        raise argparse.ArgumentTypeError(f"Intervalo de frames inválido: {text}")
+    try:
+        values = [int(p) if p.strip() else None for p in parts] + [None] * (3 - len(parts))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Intervalo de frames inválido: {text}")
+    return slice(*values)
+
+
+def parse_roi(text):
+    """"Rect:x1,y1,x2,y2", "Circle:x1,y1,x2,y2" ou "Polygon:x,y;x,y;x,y"."""
+    kind, _, coords = text.partition(":")
+    kind = kind.strip().capitalize()
+    try:
+        if kind in ("Rect", "Circle"):
+            geometry = tuple(float(v) for v in coords.split(","))
+            if len(geometry) == 4:
+                return kind, geometry
+        elif kind == "Polygon":
+            geometry = [tuple(float(v) for v in point.split(",")) for point in coords.split(";")]
+            if len(geometry) >= 3 and all(len(p) == 2 for p in geometry):
+                return kind, geometry
+    except ValueError:
+        pass
+    raise argparse.ArgumentTypeError(f"ROI inválido: {text}")
+
+
+def expand_inputs(patterns):
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) or ([pattern] if os.path.isfile(pattern) else [])
+        paths.extend(p for p in matches if p not in paths)
+    return paths
+
+
+def output_names(paths):
+    """
+    Nome base das saídas de cada arquivo: o nome sem extensão ou, quando dois arquivos
+    de pastas diferentes têm o mesmo nome, o caminho a partir da pasta comum a eles
+    (ex: "a/rec.ats" e "b/rec.ats" -> "a_rec" e "b_rec").
+    """
+    stems = {p: os.path.splitext(os.path.basename(p))[0] for p in paths}
+    groups = {}
+    for p, stem in stems.items():
+        groups.setdefault(stem, []).append(p)
+    for group in groups.values():
+        if len(group) < 2:
+            continue
+        root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in group])
+        for p in group:
+            rel = os.path.relpath(os.path.splitext(os.path.abspath(p))[0], root)
+            stems[p] = rel.replace(os.sep, "_")
+    return stems
+
+
+def process_file(path, options, name=None):
+    """
+    Processa uma gravação (roda num processo de trabalho). Retorna a linha do resumo;
+    erros viram a coluna "error" em vez de derrubar o lote inteiro. `name` é o nome
+    base das saídas (padrão: nome do arquivo sem extensão).
+    """
+    start = time.perf_counter()
+    row = {"file": path, "unit": options["unit"]}
+    model = ThermalModel(prefetch_depth=0, cache_mb=0, # Leitura sequencial: sem threads nem cache
+                         precision=options["precision"])
+    try:
+        model.load_file(path)
+        if options["index"] and not model.is_indexed:
+            # Só os counts, mais a unidade de fábrica pedida (se for o caso)
+            units = [UNIT_COUNTS] + ([FACTORY_UNITS[options["unit"]]] if options["unit"] in FACTORY_UNITS else [])
+            model.convert_to_cube(units=units)
+            model.reopen_indexed()
+
+        model.user_cal.set_temp_coeffs(options["temp_coeffs"])
+        model.user_cal.set_rad_coeffs(options["rad_coeffs"])
+        unit_name = UNIT_CHOICES[options["unit"]]
+        if unit_name not in model.get_supported_units():
+            raise ValueError(f"Unidade '{options['unit']}' não disponível neste arquivo.")
+        model.set_unit(unit_name)
+
+        frames = range(model.num_frames)[options["frames"]]
+        stem = os.path.join(options["out"], name or model.file_name)
+        row["frames"] = len(frames)
+
+        if options["export"]:
+            ext = next(e for e, fmt in EXPORT_FORMATS.items() if fmt == options["export"])
+            model.export_frames(f"{stem}_frames{ext}", frames.start, frames.stop, frames.step)
+
+        if options["summary"]:
+            row.update(_summary_stats(model, frames))
+
+        if options["rois"]:
+            rois = RoiManager(dtype=options["precision"])
+            for kind, geometry in options["rois"]:
+                rois.add(kind, geometry)
+            table = model.extract_roi_series(rois, frames.start, frames.stop, frames.step,
+                                             workers=options["threads"])
+            write_series_csv(f"{stem}_roi_series.csv", table)
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        model.close()
+    row["seconds"] = time.perf_counter() - start
+    return row
+
+
+def _summary_stats(model, frames):
+    """Mínimo/máximo/média/desvio de todos os pixels do intervalo, numa passada pelos frames."""
+    lo, hi = np.inf, -np.inf
+    total, total_sq, count, shift = 0.0, 0.0, 0, None
+    for frame_index in frames:
+        data = model.get_frame_data(frame_index)
+        # Somas deslocadas pela média do primeiro frame: sem cancelamento catastrófico na variância
+        if shift is None:
+            shift = float(np.mean(data))
+        d = data.astype(np.float64) - shift
+        total += float(d.sum())
+        total_sq += float(np.dot(d.ravel(), d.ravel()))
+        count += data.size
+        lo, hi = min(lo, float(data.min())), max(hi, float(data.max()))
+    if count == 0:
+        return {}
+    mean = total / count
+    return {"min": lo, "max": hi, "mean": shift + mean, "std": float(np.sqrt(max(total_sq / count - mean * mean, 0.0)))}
+
+
+def write_summary(path, rows):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(",".join(SUMMARY_COLUMNS) + "\n")
+        for row in rows:
+            values = []
+            for col in SUMMARY_COLUMNS:
+                value = row.get(col, "")
+                if isinstance(value, float):
+                    value = f"{value:.6g}"
+                value = str(value)
+                values.append(f'"{value}"' if "," in value or '"' in value else value)
+            f.write(",".join(values) + "\n")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Conversão e análise em lote de gravações térmicas (sem interface).")
+    parser.add_argument("inputs", nargs="+", help="Arquivos ou padrões glob (use aspas, ex: \"dados/**/*.ats\")")
+    parser.add_argument("--out", default=".", help="Pasta de saída (padrão: pasta atual)")
+    parser.add_argument("--unit", choices=list(UNIT_CHOICES), default="counts")
+    parser.add_argument("--temp-coeffs", type=parse_coeffs, default=[], help="Coeficientes c0,c1,... da temperatura do usuário (ex: --temp-coeffs=-50,0.01)")
+    parser.add_argument("--rad-coeffs", type=parse_coeffs, default=[], help="Coeficientes c0,c1,... da radiância do usuário")
+    parser.add_argument("--frames", type=parse_frames, default=slice(None), help="Intervalo início:fim:passo (padrão: todos)")
+    parser.add_argument("--index", action="store_true", help="Converte cada gravação para cubo memmap (sidecar) antes de processar")
+    parser.add_argument("--export", choices=available_formats(), help="Grava os frames do intervalo em <arquivo>_frames.<formato>")
+    parser.add_argument("--roi", dest="rois", action="append", type=parse_roi, default=[],
+                        help="ROI a analisar: Rect:x1,y1,x2,y2 | Circle:x1,y1,x2,y2 | Polygon:x,y;x,y;x,y (repetível)")
+    parser.add_argument("--roi-series", action="store_true", help="Grava as séries dos ROIs em <arquivo>_roi_series.csv")
+    parser.add_argument("--summary", action="store_true", help="Grava min/max/média/desvio de cada arquivo em summary.csv")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processos em paralelo (um arquivo por processo)")
+    parser.add_argument("--threads", type=int, default=1, help="Threads por arquivo na extração das séries dos ROIs")
+    parser.add_argument("--precision", choices=PRECISION_CHOICES, default=COMPUTE_PRECISION,
+                        help="Precisão dos frames calibrados (padrão: THERMAL_VIEWER_PRECISION ou float64)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("Nenhum arquivo encontrado.", file=sys.stderr)
+        return 2
+    if args.roi_series and not args.rois:
+        print("--roi-series precisa de pelo menos um --roi.", file=sys.stderr)
+        return 2
+    names = output_names(paths)
+    repeated = sorted(p for p in paths if list(names.values()).count(names[p]) > 1)
+    if repeated:
+        # Ex: "rec.ats" e "rec.npy" na mesma pasta gravariam as mesmas saídas
+        print("Arquivos com o mesmo nome de saída: " + ", ".join(repeated), file=sys.stderr)
+        return 2
+    os.makedirs(args.out, exist_ok=True)
+
+    options = {
+        "out": args.out, "unit": args.unit, "frames": args.frames, "index": args.index,
+        "temp_coeffs": args.temp_coeffs, "rad_coeffs": args.rad_coeffs,
+        "export": args.export, "summary": args.summary,
+        "rois": args.rois if args.roi_series else [], "threads": args.threads, "precision": args.precision,
+    }
+
+    rows = []
+    def report(row):
+        rows.append(row)
+        status = row.get("error") or "ok"
+        print(f"[{len(rows)}/{len(paths)}] {row['file']}: {status} ({row['seconds']:.1f} s)", flush=True)
+
+    workers = max(1, min(args.workers, len(paths)))
+    if workers == 1:
+        for path in paths:
+            report(process_file(path, options, names[path]))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(process_file, path, options, names[path]) for path in paths]
+            for future in as_completed(futures):
+                report(future.result())
+
+    if args.summary:
+        rows.sort(key=lambda r: paths.index(r["file"]))
+        write_summary(os.path.join(args.out, "summary.csv"), rows)
+    return 1 if any(r.get("error") for r in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
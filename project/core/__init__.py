@@ -1,4 +1,5 @@
 # core/__init__.py
 from .thermal_model import ThermalModel
+from .sources import FrameSource, FnvFrameSource, SyntheticFrameSource, NumpyFrameSource
 
-__all__ = ["ThermalModel"]
\ No newline at end of file
+__all__ = ["ThermalModel", "FrameSource", "FnvFrameSource", "SyntheticFrameSource", "NumpyFrameSource"]
\ No newline at end of file
@@ -0,0 +1,111 @@
+import numpy as np
+
+from core.frame_stats import frame_min_max, frame_percentiles
+
+# Modos de escala automática
+SCALE_FRAME = "frame"           # Mínimo/máximo do frame atual (comportamento original)
+SCALE_GLOBAL = "global"         # Mínimo/máximo da gravação inteira
+SCALE_PERCENTILE = "percentile" # Recorta os extremos do frame (ex: 1-99%)
+SCALE_SMOOTHED = "smoothed"     # Faixa do frame suavizada no tempo (média móvel exponencial)
+
+SCALE_MODES = (SCALE_FRAME, SCALE_GLOBAL, SCALE_PERCENTILE, SCALE_SMOOTHED)
+
+
+class AutoScaler:
+    """
+    Calcula os limites de cor (v_min, v_max) de cada frame conforme o modo.
+
+    Quando a passada de estatísticas da gravação (core.frame_stats) termina, a tabela
+    é entregue com set_stats e os modos global/percentil passam a usar os valores
+    exatos pré-calculados. Até lá, usa estimativas baratas: percentis de uma amostra
+    com passo `stride` em cada eixo e a faixa global dos frames já vistos.
+    """
+
+    SEEK_FRAMES = 30 # Saltos maiores que isso (seek, volta do loop) reiniciam a média exponencial
+
+    def __init__(self, mode=SCALE_FRAME, percentiles=(1, 99), smoothing=0.1, stride=4):
+        self.mode = mode
+        self.percentiles = tuple(percentiles)
+        self.smoothing = smoothing # Peso do frame novo na média exponencial (0-1)
+        self.stride = stride
+        self.stats = None
+        self._rows = None
+        self.reset()
+
+    def set_mode(self, mode):
+        if mode not in SCALE_MODES:
+            raise ValueError(f"Modo de escala desconhecido: {mode}")
+        self.mode = mode
+        self._ema = None
+
+    def reset(self):
+        """Esquece a tabela e o histórico (arquivo, unidade ou calibração novos)."""
+        self.stats = None
+        self._rows = None
+        self._seen = None  # Faixa global dos frames vistos até a tabela ficar pronta
+        self._ema = None
+        self._last_index = None
+
+    def set_stats(self, table):
+        """Recebe a tabela de compute_frame_stats ({"frame", "min", "max", "p1", "p99", ...})."""
+        self.stats = table
+        if table is None:
+            self._rows = None
+            return
+        frames = np.asarray(table["frame"])
+        self._rows = np.full(int(frames.max()) + 1 if len(frames) else 0, -1, dtype=np.intp)
+        self._rows[frames] = np.arange(len(frames))
+        self._global = (float(np.nanmin(table["min"])), float(np.nanmax(table["max"])))
+
+    def limits(self, frame_index, data):
+        if self.mode == SCALE_GLOBAL:
+            v_min, v_max = self._global_limits(data)
+        elif self.mode == SCALE_PERCENTILE:
+            v_min, v_max = self._percentile_limits(frame_index, data)
+        elif self.mode == SCALE_SMOOTHED:
+            v_min, v_max = self._smoothed_limits(frame_index, data)
+        else:
+            v_min, v_max = frame_min_max(data)
+        self._last_index = frame_index
+        return v_min, v_max
+
+    # --- INTERNOS ---
+
+    def _row(self, frame_index):
+        if self._rows is None or frame_index >= len(self._rows): return None
+        row = self._rows[frame_index]
+        return row if row >= 0 else None
+
+    def _global_limits(self, data):
+        if self.stats is not None:
+            return self._global
+        v_min, v_max = frame_min_max(data)
+        if self._seen is not None:
+            v_min, v_max = min(v_min, self._seen[0]), max(v_max, self._seen[1])
+        self._seen = (v_min, v_max)
+        return v_min, v_max
+
+    def _percentile_limits(self, frame_index, data):
+        lo_key, hi_key = (f"p{p:g}" for p in self.percentiles)
+        row = self._row(frame_index)
+        if row is not None and lo_key in self.stats:
+            return float(self.stats[lo_key][row]), float(self.stats[hi_key][row])
+        # Estimativa numa amostra com passo fixo: 16x menos pixels com stride=4
+        sample = data[::self.stride, ::self.stride]
+        v_min, v_max = frame_percentiles(sample, self.percentiles)
+        return float(v_min), float(v_max)
+
+    def _smoothed_limits(self, frame_index, data):
+        row = self._row(frame_index)
+        if row is not None:
+            current = (float(self.stats["min"][row]), float(self.stats["max"][row]))
+        else:
+            current = frame_min_max(data)
+        # Avanços curtos (inclusive frames pulados na reprodução) suavizam; saltos reiniciam a média
+        if self._ema is None or self._last_index is None or abs(frame_index - self._last_index) > self.SEEK_FRAMES:
+            self._ema = current
+        else:
+            a = self.smoothing
+            self._ema = (self._ema[0] + a * (current[0] - self._ema[0]),
+                         self._ema[1] + a * (current[1] - self._ema[1]))
+        return self._ema
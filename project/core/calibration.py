@@ -1,16 +1,29 @@
+import threading
+
 import numpy as np
 
 class UserCalibration:
-    def __init__(self):
+    # Quantas tabelas (conjunto de coeficientes x dtype) ficam guardadas ao mesmo tempo
+    MAX_LUTS = 8
+
+    def __init__(self, dtype=np.float64):
+        # Tipo dos valores calibrados (float32 ou float64); as tabelas são calculadas em float64
+        self.dtype = np.dtype(dtype)
         # Listas de coeficientes: [c0, c1, c2...] para a equação c0 + c1*x + c2*x^2
         self.temp_coeffs = []
         self.rad_coeffs = []
+        # Tabelas de consulta counts -> valor calibrado, por (coeficientes, dtype de entrada, dtype de saída)
+        self._luts = {}
+        # Prefetch, seek e passadas em lote consultam as tabelas em paralelo
+        self._lock = threading.Lock()
 
     def set_temp_coeffs(self, coeffs):
         self.temp_coeffs = coeffs
+        self.get_lut(coeffs, np.uint16)  # Counts do SDK são uint16: já deixa a tabela pronta
 
     def set_rad_coeffs(self, coeffs):
         self.rad_coeffs = coeffs
+        self.get_lut(coeffs, np.uint16)
 
     def has_temp_cal(self):
         return len(self.temp_coeffs) > 0
@@ -18,17 +31,63 @@ class UserCalibration:
     def has_rad_cal(self):
         return len(self.rad_coeffs) > 0
 
-    def apply(self, raw_counts, coeffs):
+    def get_lut(self, coeffs, dtype, out_dtype=None):
+        """
+        Retorna a tabela counts -> valor calibrado para inteiros de até 16 bits, ou None.
+        A tabela é indexada pelos bits do valor (inteiros com sinal são lidos como sem sinal),
+        então aplicar a calibração vira um único np.take. Os valores saem em `out_dtype`
+        (padrão: self.dtype), arredondados só no fim.
+        """
+        dtype = np.dtype(dtype)
+        if not coeffs or dtype.kind not in "ui" or dtype.itemsize > 2:
+            return None
+
+        out_dtype = np.dtype(out_dtype or self.dtype)
+        key = (tuple(coeffs), dtype.str, out_dtype.str)
+        with self._lock:
+            lut = self._luts.get(key)
+        if lut is None:
+            # Montada fora do lock; se duas threads montarem a mesma tabela, fica a primeira
+            unsigned = np.dtype(f"u{dtype.itemsize}")
+            x = np.arange(1 << (8 * dtype.itemsize), dtype=unsigned).view(dtype)
+            lut = np.polyval(list(coeffs)[::-1], x.astype(np.float64)).astype(out_dtype)
+            with self._lock:
+                if key in self._luts:
+                    return self._luts[key]
+                if len(self._luts) >= self.MAX_LUTS:
+                    self._luts.pop(next(iter(self._luts)))
+                self._luts[key] = lut
+        return lut
+
+    def apply(self, raw_counts, coeffs, out=None, dtype=None):
         """
         Aplica o polinômio à matriz raw_counts.
         A fórmula assumida é: y = c0 + c1*x + c2*x^2 + ...
+
+        O resultado sai em `dtype` (padrão: self.dtype). Com `out` (mesmo shape e diferente
+        de raw_counts), ele é escrito ali, no tipo de `out`, e nada é alocado; sem `out`,
+        um array novo é devolvido.
         """
         if not coeffs:
-            return raw_counts
-            
-        # O np.polyval espera a ordem [cn, cn-1, ..., c0] (do maior grau para o menor).
-        # Como o usuário geralmente insere [c0, c1, c2], nós invertemos a lista:
-        rev_coeffs = coeffs[::-1]
-        
-        # Converte a matriz inteira de uma vez e garante que seja float para evitar overflow
-        return np.polyval(rev_coeffs, raw_counts.astype(float))
\ No newline at end of file
+            if out is None:
+                return raw_counts
+            np.copyto(out, raw_counts, casting="unsafe")
+            return out
+
+        # Caminho rápido: counts inteiros passam por uma tabela pré-calculada
+        dtype = out.dtype if out is not None else np.dtype(dtype or self.dtype)
+        lut = self.get_lut(coeffs, raw_counts.dtype, dtype)
+        if lut is not None:
+            if raw_counts.dtype.kind == "i":
+                raw_counts = raw_counts.view(f"u{raw_counts.dtype.itemsize}")
+            return np.take(lut, raw_counts, out=out)
+
+        # Horner no próprio buffer de saída (a mesma conta do np.polyval): y = (...(cn*x + cn-1)*x + ...) + c0.
+        # O float vem da saída, então não há cópia em float nem temporários por termo
+        if out is None:
+            out = np.empty(raw_counts.shape, dtype=dtype)
+        out.fill(coeffs[-1])
+        for c in coeffs[-2::-1]:
+            np.multiply(out, raw_counts, out=out)
+            np.add(out, c, out=out)
+        return out
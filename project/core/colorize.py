@@ -0,0 +1,141 @@
+import cv2
+import numpy as np
+
+from core.histogram import equalization_remap
+from utils.config import PALETTES, PALETTE_BITS
+from utils.profiling import TRACER
+
+
+def palette_lut(colormap, bits=8):
+    """
+    Tabela (2**bits, 3) uint8 RGB com as cores de uma paleta do OpenCV.
+    Acima de 8 bits as 256 cores originais são interpoladas para gradientes mais suaves.
+    """
+    base = cv2.applyColorMap(np.arange(256, dtype=np.uint8).reshape(-1, 1), colormap).reshape(256, 3)
+    base = base[:, ::-1]  # O OpenCV devolve BGR
+    size = 1 << bits
+    if size != 256:
+        pos = np.linspace(0, 255, size)
+        base = np.stack([np.interp(pos, np.arange(256), base[:, c]) for c in range(3)], axis=1)
+    return np.ascontiguousarray(np.rint(base).astype(np.uint8))
+
+
+def pack_rgb(lut):
+    """Empacota cores RGB em uint32 0xffRRGGBB (mesmo layout do QImage.Format_RGB32)."""
+    lut = lut.astype(np.uint32)
+    return np.uint32(0xFF000000) | (lut[:, 0] << 16) | (lut[:, 1] << 8) | lut[:, 2]
+
+
+def packed_to_bgr(packed, out=None):
+    """Converte a imagem empacotada em BGR de 3 canais (formato do cv2.VideoWriter/imwrite)."""
+    # Em memória (little-endian) cada pixel 0xffRRGGBB fica como os bytes B, G, R, 0xff
+    bgra = packed.view(np.uint8).reshape(packed.shape + (4,))
+    return cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=out)
+
+
+def packed_to_rgb(packed, out=None):
+    bgra = packed.view(np.uint8).reshape(packed.shape + (4,))
+    return cv2.cvtColor(bgra, cv2.COLOR_BGRA2RGB, dst=out)
+
+
+class Colorizer:
+    """
+    Converte dados térmicos em pixels coloridos numa passada, direto no buffer de exibição.
+
+    Substitui clip -> normalize -> applyColorMap -> cvtColor: os valores em
+    [v_min, v_max] são mapeados para a paleta e o que estiver fora recebe a cor
+    extrema (isoterma). A saída é uma imagem (H, W) uint32 0xffRRGGBB, que o
+    QImage.Format_RGB32 usa sem conversão. Trocar de paleta só troca a tabela.
+
+    A equalização de histograma (set_equalization) também é só uma tabela: a posição
+    linear na faixa é remapeada pela CDF antes de escolher a cor.
+    """
+
+    def __init__(self, bits=PALETTE_BITS):
+        self.bits = bits
+        self.size = 1 << bits
+        # Todas as paletas de utils/config já ficam prontas (RGB para a colorbar, empacotada para os frames)
+        self.palettes = {cmap: palette_lut(cmap, bits) for cmap in PALETTES.values()}
+        self._packed = {cmap: pack_rgb(lut) for cmap, lut in self.palettes.items()}
+        self.colormap = None
+        self.lut = None
+        self.remap = None     # Posição linear -> posição equalizada na paleta (None = linear)
+        self.set_palette(PALETTES["Ironbow"])
+
+        self._scaled = None   # Buffer de trabalho para dados em float
+        self._index = None    # Buffer de índices na paleta para dados em float
+        self._direct = None   # Tabela valor inteiro -> cor para o último (dtype, v_min, v_max)
+        self._direct_key = None
+
+    def set_palette(self, colormap):
+        if colormap == self.colormap:
+            return
+        if colormap not in self._packed:
+            self.palettes[colormap] = palette_lut(colormap, self.bits)
+            self._packed[colormap] = pack_rgb(self.palettes[colormap])
+        self.colormap = colormap
+        self._update_lut()
+
+    def set_equalization(self, counts):
+        """Liga a equalização com o histograma `counts` da faixa [v_min, v_max] (None desliga)."""
+        self.remap = None if counts is None else equalization_remap(counts, self.size)
+        self._update_lut()
+
+    def rgb_lut(self):
+        """Cores RGB da paleta ativa na ordem exibida (já equalizada, se for o caso), para a colorbar."""
+        lut = self.palettes[self.colormap]
+        return lut if self.remap is None else lut[self.remap]
+
+    def _update_lut(self):
+        packed = self._packed[self.colormap]
+        self.lut = packed if self.remap is None else packed[self.remap]
+        self._direct_key = None
+
+    def colorize(self, data, v_min, v_max, out=None):
+        """Retorna (ou escreve em `out`) a imagem (H, W) uint32 0xffRRGGBB."""
+        if out is None:
+            out = np.empty(data.shape, dtype=np.uint32)
+
+        if data.dtype.kind in "ui" and data.dtype.itemsize <= 2:
+            # Counts inteiros: tabela direta valor -> cor, um único np.take no quadro inteiro
+            table = self._direct_table(data.dtype, v_min, v_max)
+            if data.dtype.kind == "i":
+                data = data.view(f"u{data.dtype.itemsize}")
+            np.take(table, data, out=out, mode="clip")
+            return out
+
+        np.take(self.lut, self._palette_index(data, v_min, v_max), out=out, mode="clip")
+        return out
+
+    def _palette_index(self, data, v_min, v_max):
+        dtype = data.dtype if data.dtype.kind == "f" else np.dtype(np.float32)
+        if self._scaled is None or self._scaled.shape != data.shape or self._scaled.dtype != dtype:
+            self._scaled = np.empty(data.shape, dtype=dtype)
+            self._index = np.empty(data.shape, dtype=np.uint16 if self.bits > 8 else np.uint8)
+        scale = self._scale(v_min, v_max)
+        scaled = self._scaled
+        with TRACER.span("clip"):
+            np.clip(data, v_min, v_max, out=scaled)
+
+        if self.bits == 8:
+            # O OpenCV escala, arredonda e satura para uint8 numa única passada
+            return cv2.convertScaleAbs(scaled, dst=self._index, alpha=scale, beta=-v_min * scale)
+
+        # Tabelas maiores que 8 bits: (x - v_min) * escala + 0.5, truncado para o índice
+        np.subtract(scaled, v_min - 0.5 / scale if scale else v_min, out=scaled)
+        np.multiply(scaled, scale, out=scaled)
+        np.copyto(self._index, scaled, casting="unsafe")
+        return self._index
+
+    def _scale(self, v_min, v_max):
+        return (self.size - 1) / (v_max - v_min) if v_max > v_min else 0.0
+
+    def _direct_table(self, dtype, v_min, v_max):
+        key = (dtype.str, float(v_min), float(v_max), self.colormap)
+        if key != self._direct_key:
+            x = np.arange(1 << (8 * dtype.itemsize), dtype=f"u{dtype.itemsize}").view(dtype)
+            pos = (x.astype(np.float32) - v_min) * self._scale(v_min, v_max)
+            pos = np.rint(np.clip(pos, 0, self.size - 1)).astype(np.intp)
+            self._direct = self.lut[pos]
+            self._direct_key = key
+        return self._direct
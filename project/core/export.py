@@ -0,0 +1,285 @@
+import json
+import os
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+try:
+    import h5py
+except ImportError:  # HDF5 é opcional
+    h5py = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet é opcional
+    pa = None
+
+# Extensão -> formato de exportação de vários frames
+EXPORT_FORMATS = {
+    ".npy": "npy",
+    ".npz": "npz",
+    ".raw": "raw",
+    ".bin": "raw",
+    ".h5": "hdf5",
+    ".hdf5": "hdf5",
+    ".parquet": "parquet",
+}
+
+
+def available_formats():
+    """Formatos que podem ser gravados neste ambiente (HDF5/Parquet dependem de bibliotecas opcionais)."""
+    formats = ["npy", "npz", "raw"]
+    if h5py is not None:
+        formats.append("hdf5")
+    if pa is not None:
+        formats.append("parquet")
+    return formats
+
+
+def format_for_path(path):
+    fmt = EXPORT_FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"Extensão não suportada para exportação: {path}")
+    return fmt
+
+
+def export_frames(reader_factory, context, frames, path, fmt=None, header=None,
+                  chunk_size=32, progress=None, cancel=None):
+    """
+    Grava os frames `frames` em `path` em blocos, sem manter a gravação na memória.
+
+    reader_factory() devolve read(frame_index, context) (mesmo contrato do
+    FramePrefetcher). Enquanto um bloco é gravado, o próximo já está sendo lido numa
+    thread, então a exportação fica limitada pelo disco ou pelo decodificador, o que
+    for mais lento. `header` (dict) vai para os metadados do arquivo (JSON ao lado do
+    .raw, atributos no HDF5/Parquet, "header.json" dentro do .npz).
+
+    Retorna `path`, ou None se `cancel` for acionado (o arquivo parcial é apagado).
+    """
+    fmt = fmt or format_for_path(path)
+    frames = np.asarray(frames, dtype=np.int64)
+    if len(frames) == 0:
+        raise ValueError("Nenhum frame no intervalo de exportação.")
+    if fmt == "hdf5" and h5py is None:
+        raise RuntimeError("Exportar HDF5 requer o pacote h5py.")
+    if fmt == "parquet" and pa is None:
+        raise RuntimeError("Exportar Parquet requer o pacote pyarrow.")
+
+    chunks = _read_chunks(reader_factory, context, frames, chunk_size)
+    first = next(chunks)
+    shape = (len(frames),) + first[1].shape[1:]
+    header = dict(header or {}, shape=list(shape), dtype=first[1].dtype.str, frames=frames.tolist())
+
+    writer = {"npy": _NpyWriter, "npz": _NpzWriter, "raw": _RawWriter,
+              "hdf5": _Hdf5Writer, "parquet": _ParquetWriter}[fmt](path, shape, first[1].dtype, header)
+    done = 0
+    try:
+        for start, block in _chain(first, chunks):
+            if cancel is not None and cancel.is_set():
+                writer.abort()
+                return None
+            writer.write(start, block)
+            done += len(block)
+            if progress:
+                progress(done, len(frames))
+        writer.close()
+    except BaseException:
+        writer.abort()
+        raise
+    finally:
+        chunks.close()
+    return path
+
+
+def write_frame_csv(path, data, fmt=None, delimiter=","):
+    """
+    Grava um frame (H x W) em CSV, uma linha da imagem por linha do arquivo.
+
+    Toda a formatação sai de uma única operação de string (linha de formato repetida
+    aplicada à tupla de valores), sem laço em Python por linha ou por valor.
+    """
+    data = np.asarray(data)
+    if fmt is None:
+        # Inteiros exatos; floats com os dígitos que garantem a volta exata (9 no float32, 17 no float64)
+        fmt = "%d" if data.dtype.kind in "uib" else ("%.9g" if data.dtype.itemsize <= 4 else "%.17g")
+    if data.ndim == 1:
+        data = data[np.newaxis]
+    h, w = data.shape
+    line = delimiter.join([fmt] * w) + "\n"
+    values = data.ravel().tolist() # Escalares nativos formatam bem mais rápido que np.generic
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write((line * h) % tuple(values))
+
+
+# --- INTERNOS ---
+
+def _chain(first, rest):
+    yield first
+    yield from rest
+
+
+def _read_chunks(reader_factory, context, frames, chunk_size):
+    """
+    Gera (posição inicial, bloco) com os frames lidos numa thread de leitura que
+    trabalha um bloco à frente. Dois buffers se alternam: o bloco devolvido só é
+    reescrito depois que o consumidor pede o próximo bloco e mais um.
+    """
+    local = threading.local()
+    buffers = [None, None]
+
+    def fill(slot, start):
+        if not hasattr(local, "read"):
+            local.read = reader_factory()
+        stop = min(start + chunk_size, len(frames))
+        buf = buffers[slot]
+        for k in range(start, stop):
+            frame = local.read(int(frames[k]), context)
+            if buf is None:
+                buf = buffers[slot] = np.empty((chunk_size,) + frame.shape, dtype=frame.dtype)
+            buf[k - start] = frame
+        return buf[:stop - start]
+
+    starts = list(range(0, len(frames), chunk_size))
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="export") as executor:
+        future = executor.submit(fill, 0, starts[0])
+        for i, start in enumerate(starts):
+            block = future.result()
+            if i + 1 < len(starts):
+                future = executor.submit(fill, (i + 1) % 2, starts[i + 1])
+            yield start, block
+
+
+def _npy_header(shape, dtype):
+    return {"descr": np.lib.format.dtype_to_descr(np.dtype(dtype)), "fortran_order": False, "shape": tuple(shape)}
+
+
+class _FileWriter:
+    """Escrita sequencial num arquivo temporário, renomeado para o destino só no fim."""
+
+    def __init__(self, path):
+        self.path = path
+        self.tmp = path + ".part"
+        self.f = open(self.tmp, "wb")
+
+    def write(self, start, block):
+        self.f.write(np.ascontiguousarray(block).data)
+
+    def close(self):
+        self.f.close()
+        os.replace(self.tmp, self.path)
+
+    def abort(self):
+        self.f.close()
+        if os.path.exists(self.tmp):
+            os.remove(self.tmp)
+
+
+class _NpyWriter(_FileWriter):
+    def __init__(self, path, shape, dtype, header):
+        super().__init__(path)
+        np.lib.format.write_array_header_1_0(self.f, _npy_header(shape, dtype))
+
+
+class _RawWriter(_FileWriter):
+    """Binário cru + <arquivo>.json no formato lido pelo NumpyFrameSource."""
+
+    def __init__(self, path, shape, dtype, header):
+        super().__init__(path)
+        self.header = dict(header, offset=0)
+
+    def close(self):
+        super().close()
+        with open(self.path + ".json", "w", encoding="utf-8") as f:
+            json.dump(self.header, f, indent=2)
+
+
+class _NpzWriter:
+    """
+    .npz sem compressão gravado em fluxo: "frames.npy" é escrito direto no membro do
+    zip, seguido de "frame_index.npy" e "header.json". np.load lê normalmente.
+    """
+
+    def __init__(self, path, shape, dtype, header):
+        self.path = path
+        self.tmp = path + ".part"
+        self.header = header
+        self.zf = zipfile.ZipFile(self.tmp, "w", compression=zipfile.ZIP_STORED, allowZip64=True)
+        self.member = self.zf.open("frames.npy", "w", force_zip64=True)
+        np.lib.format.write_array_header_1_0(self.member, _npy_header(shape, dtype))
+
+    def write(self, start, block):
+        self.member.write(np.ascontiguousarray(block).data)
+
+    def close(self):
+        self.member.close()
+        with self.zf.open("frame_index.npy", "w") as f:
+            np.lib.format.write_array(f, np.asarray(self.header["frames"], dtype=np.int64))
+        self.zf.writestr("header.json", json.dumps(self.header, indent=2))
+        self.zf.close()
+        os.replace(self.tmp, self.path)
+
+    def abort(self):
+        try:
+            self.member.close()
+            self.zf.close()
+        finally:
+            if os.path.exists(self.tmp):
+                os.remove(self.tmp)
+
+
+class _Hdf5Writer:
+    """Dataset "frames" em blocos de um frame; o cabeçalho vira atributos."""
+
+    def __init__(self, path, shape, dtype, header):
+        self.path = path
+        self.tmp = path + ".part"
+        self.f = h5py.File(self.tmp, "w")
+        self.dset = self.f.create_dataset("frames", shape=shape, dtype=dtype, chunks=(1,) + tuple(shape[1:]))
+        self.f.create_dataset("frame_index", data=np.asarray(header["frames"], dtype=np.int64))
+        for key, value in header.items():
+            if key != "frames":
+                self.dset.attrs[key] = json.dumps(value) if isinstance(value, (dict, list)) else value
+
+    def write(self, start, block):
+        self.dset[start:start + len(block)] = block
+
+    def close(self):
+        self.f.close()
+        os.replace(self.tmp, self.path)
+
+    def abort(self):
+        self.f.close()
+        if os.path.exists(self.tmp):
+            os.remove(self.tmp)
+
+
+class _ParquetWriter:
+    """Uma linha por frame: índice do frame e os pixels achatados (lista de tamanho fixo)."""
+
+    def __init__(self, path, shape, dtype, header):
+        self.path = path
+        self.tmp = path + ".part"
+        self.frames = np.asarray(header["frames"], dtype=np.int64)
+        self.pixels = int(np.prod(shape[1:]))
+        value_type = pa.from_numpy_dtype(np.dtype(dtype))
+        schema = pa.schema([("frame", pa.int64()), ("pixels", pa.list_(value_type, self.pixels))],
+                           metadata={"header": json.dumps(header)})
+        self.writer = pq.ParquetWriter(self.tmp, schema)
+
+    def write(self, start, block):
+        flat = pa.array(np.ascontiguousarray(block).reshape(-1))
+        pixels = pa.FixedSizeListArray.from_arrays(flat, self.pixels)
+        frames = pa.array(self.frames[start:start + len(block)])
+        self.writer.write_table(pa.Table.from_arrays([frames, pixels], schema=self.writer.schema))
+
+    def close(self):
+        self.writer.close()
+        os.replace(self.tmp, self.path)
+
+    def abort(self):
+        self.writer.close()
+        if os.path.exists(self.tmp):
+            os.remove(self.tmp)
@@ -0,0 +1,128 @@
+import copy
+import threading
+
+import numpy as np
+
+from core.parallel import run_chunks
+
+# Estatísticas guardadas por ROI e por frame (as colunas de percentil dependem do RoiManager)
+BASE_STATS = ("mean", "std", "min", "max")
+
+
+def series_column(roi_name, stat):
+    """Nome da coluna da série de uma estatística de um ROI, ex: "ROI 1:mean"."""
+    return f"{roi_name}:{stat}"
+
+
+def pixel_column(x, y):
+    """Nome da coluna da série de um pixel fixado, ex: "x120_y45"."""
+    return f"x{x}_y{y}"
+
+
+def extract_roi_series(reader_factory, context, rois, frames, times=None,
+                       workers=None, chunk_size=32, progress=None, cancel=None):
+    """
+    Estatísticas de todos os ROIs de `rois` (RoiManager) em cada frame de `frames`.
+
+    reader_factory() segue o contrato do FramePrefetcher: é chamado uma vez por
+    thread e devolve read(frame_index, context) com handle de arquivo próprio, já
+    aplicando unidade e calibração do `context`. Os frames são divididos em blocos
+    de `chunk_size` que as threads leem em sequência (leitura contígua no arquivo).
+    Sem `workers`, usa uma thread por núcleo (até 4).
+
+    Retorna uma tabela em colunas: "frame", "time" (segundos desde o primeiro frame da
+    gravação, ou NaN) e uma coluna "<roi>:<estatística>" por ROI e estatística. Retorna None
+    se `cancel` (threading.Event) for acionado.
+    """
+    frames = np.asarray(frames, dtype=np.int64)
+    total = len(frames)
+    names = list(rois.rois)
+    stats = BASE_STATS + tuple(f"p{p:g}" for p in rois.percentiles)
+    values = np.full((len(stats), len(names), total), np.nan)
+
+    table = _time_columns(frames, times)
+    if total == 0 or not names:
+        return _finish_table(table, names, stats, values)
+
+    local = threading.local()
+
+    def run_chunk(lo, hi):
+        # Leitor e cópia do RoiManager por thread (o gerenciador guarda a rasterização em cache)
+        if not hasattr(local, "read"):
+            local.read = reader_factory()
+            local.rois = copy.deepcopy(rois)
+        for i in range(lo, hi):
+            if cancel is not None and cancel.is_set():
+                return 0
+            result = local.rois.compute(local.read(int(frames[i]), context))
+            for s, stat in enumerate(stats):
+                values[s, :, i] = result[stat]
+        return hi - lo
+
+    if not run_chunks(run_chunk, total, workers, chunk_size, progress, cancel, "extract"):
+        return None
+    return _finish_table(table, names, stats, values)
+
+
+def extract_pixel_series(reader_factory, context, pixels, frames, times=None,
+                         workers=None, chunk_size=32, progress=None, cancel=None):
+    """
+    Valor de cada pixel (x, y) de `pixels` em cada frame de `frames`, numa passada
+    pela gravação (mesmo contrato de leitura e divisão em blocos do extract_roi_series).
+    Para fontes em memmap prefira ler a coluna direto (FrameSource.read_pixels).
+
+    Retorna uma tabela em colunas "frame", "time" e uma coluna "x<X>_y<Y>" por pixel,
+    ou None se `cancel` for acionado.
+    """
+    frames = np.asarray(frames, dtype=np.int64)
+    total = len(frames)
+    xs = np.array([x for x, _ in pixels], dtype=np.intp)
+    ys = np.array([y for _, y in pixels], dtype=np.intp)
+    values = np.full((total, len(pixels)), np.nan)
+    local = threading.local()
+
+    def run_chunk(lo, hi):
+        if not hasattr(local, "read"):
+            local.read = reader_factory()
+        for i in range(lo, hi):
+            if cancel is not None and cancel.is_set():
+                return 0
+            values[i] = local.read(int(frames[i]), context)[ys, xs]
+        return hi - lo
+
+    if total and len(pixels) and not run_chunks(run_chunk, total, workers, chunk_size, progress, cancel, "extract"):
+        return None
+    return pixel_series_table(pixels, frames, values, times)
+
+
+def pixel_series_table(pixels, frames, values, times=None):
+    """Monta a tabela de séries de pixels a partir da matriz `values` (frames x pixels)."""
+    frames = np.asarray(frames, dtype=np.int64)
+    table = _time_columns(frames, times)
+    for k, (x, y) in enumerate(pixels):
+        table[pixel_column(x, y)] = values[:, k]
+    return table
+
+
+def _time_columns(frames, times):
+    table = {"frame": frames}
+    if times is not None and len(times):
+        table["time"] = np.asarray(times, dtype=np.float64)[frames]
+    else:
+        table["time"] = np.full(len(frames), np.nan)
+    return table
+
+
+def _finish_table(table, names, stats, values):
+    for r, name in enumerate(names):
+        for s, stat in enumerate(stats):
+            table[series_column(name, stat)] = values[s, r]
+    return table
+
+
+def write_series_csv(path, table, delimiter=","):
+    """Grava a tabela de séries em CSV: uma linha por frame, uma coluna por série."""
+    header = delimiter.join(table)
+    columns = np.column_stack([np.asarray(col, dtype=np.float64) for col in table.values()])
+    fmt = ["%d"] + ["%.6g"] * (columns.shape[1] - 1)
+    np.savetxt(path, columns, delimiter=delimiter, header=header, comments="", fmt=fmt)
@@ -0,0 +1,122 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class FrameCache:
+    """
+    Cache LRU de frames já decodificados, limitado por um orçamento de memória (MB).
+
+    A chave é (frame_index, unidade do SDK, assinatura da calibração do usuário,
+    precisão), então trocar de unidade, de coeficientes ou de precisão nunca devolve
+    um frame errado. Em float32 o mesmo orçamento guarda o dobro de frames calibrados.
+    Os arrays guardados ficam somente-leitura para que ninguém altere o cache por engano.
+    """
+
+    def __init__(self, budget_mb=256):
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            frame = self._items.get(key)
+            if frame is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)  # Marca como usado recentemente
+            self.hits += 1
+            return frame
+
+    def put(self, key, frame):
+        if frame.nbytes > self.budget_bytes:
+            return  # Frame maior que o orçamento inteiro: não vale a pena guardar
+        frame.flags.writeable = False
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.used_bytes -= old.nbytes
+            self._items[key] = frame
+            self.used_bytes += frame.nbytes
+            self._evict_locked()
+
+    def set_budget(self, budget_mb):
+        with self._lock:
+            self.budget_bytes = int(budget_mb * 1024 * 1024)
+            self._evict_locked()
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.used_bytes = 0
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "frames": len(self._items),
+            "used_mb": self.used_bytes / (1024 * 1024),
+            "budget_mb": self.budget_bytes / (1024 * 1024),
+        }
+
+    def __contains__(self, key):
+        # Consulta sem contar como acerto/falha nem alterar a ordem do LRU
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def _evict_locked(self):
+        # Remove os menos usados recentemente até caber no orçamento
+        while self._items and self.used_bytes > self.budget_bytes:
+            _, frame = self._items.popitem(last=False)
+            self.used_bytes -= frame.nbytes
+
+
+class FramePool:
+    """
+    Buffers de frame reaproveitáveis, por (shape, dtype). Com o cache desligado nenhum
+    frame decodificado é guardado: depois de copiado para a tela ele volta ao pool e a
+    próxima decodificação escreve nele em vez de alocar outro.
+
+    acquire() aloca quando não há buffer livre; release() ignora arrays que não são
+    buffers próprios e graváveis (views do memmap, frames do cache) e guarda no máximo
+    `capacity` livres por formato.
+    """
+
+    def __init__(self, capacity=16):
+        self.capacity = capacity
+        self._free = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, shape, dtype):
+        key = (tuple(shape), np.dtype(dtype).str)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                return free.pop()
+        return np.empty(shape, dtype=dtype)
+
+    def release(self, frame):
+        if frame.base is not None or not frame.flags.writeable or not frame.flags.c_contiguous:
+            return
+        key = (frame.shape, frame.dtype.str)
+        with self._lock:
+            free = self._free.setdefault(key, [])
+            if len(free) < self.capacity and not any(f is frame for f in free):
+                free.append(frame)
+
+    def clear(self):
+        with self._lock:
+            self._free.clear()
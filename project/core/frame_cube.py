@@ -0,0 +1,174 @@
+import json
+import os
+import numpy as np
+
+from core.sources import FrameSource, UNIT_COUNTS, to_seconds
+
+# Versão do formato do cubo: se mudar, sidecars antigos deixam de ser considerados válidos
+CUBE_VERSION = 1
+
+
+def header_path(path):
+    return path + ".cube.json"
+
+
+def unit_path(path, unit):
+    return f"{path}.{unit}.cube"
+
+
+def _source_signature(path):
+    st = os.stat(path)
+    return {"source_size": st.st_size, "source_mtime": st.st_mtime}
+
+
+def read_header(path):
+    try:
+        with open(header_path(path), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def has_fresh_cube(path):
+    """True se existe um sidecar completo e gerado a partir da versão atual da gravação."""
+    header = read_header(path)
+    if not header or header.get("version") != CUBE_VERSION:
+        return False
+    try:
+        if os.path.exists(path) and _source_signature(path) != {
+                "source_size": header["source_size"], "source_mtime": header["source_mtime"]}:
+            return False
+        frame_size = header["num_frames"] * header["height"] * header["width"]
+        for unit, info in header["units"].items():
+            expected = frame_size * np.dtype(info["dtype"]).itemsize
+            if os.path.getsize(unit_path(path, unit)) != expected:
+                return False
+    except (OSError, KeyError, TypeError):
+        return False
+    return True
+
+
+def convert_to_cube(source, path, units=None, progress=None, cancel=None):
+    """
+    Passa a gravação pelo decodificador e grava um cubo contíguo (frames x H x W)
+    por unidade, mais um cabeçalho JSON com unidades e tempos.
+
+    Por padrão só os counts são convertidos: as unidades do usuário saem deles pela
+    calibração. Radiância e temperatura de fábrica entram só se pedidas em `units`,
+    e cada uma custa mais uma passada pela gravação e outro cubo do mesmo tamanho
+    (float32 ocupa o dobro dos counts). O cubo reaberto oferece só as unidades gravadas.
+
+    `source` deve ser uma instância exclusiva desta conversão (ex: source.open_clone()).
+    progress(done, total) é chamado a cada frame; cancel é um threading.Event opcional.
+    Retorna o caminho do cabeçalho, ou None se a conversão foi cancelada.
+    """
+    if units is None:
+        units = [UNIT_COUNTS] if UNIT_COUNTS in source.supported_units else list(source.supported_units[:1])
+    units = [u for u in units if u in source.supported_units]
+    total = source.num_frames * len(units)
+    header = {
+        "version": CUBE_VERSION,
+        "source": os.path.basename(path),
+        "num_frames": source.num_frames,
+        "width": source.width,
+        "height": source.height,
+        "units": {},
+        "times": None,
+        "metadata": {k: v for k, v in source.metadata.items() if isinstance(v, (int, float, str))},
+    }
+    header.update(_source_signature(path))
+
+    # O cabeçalho antigo sai primeiro: um sidecar sem cabeçalho nunca é considerado válido
+    if os.path.exists(header_path(path)):
+        os.remove(header_path(path))
+
+    done = 0
+    for unit in units:
+        source.set_unit(unit)
+        times = []
+        tmp_path = unit_path(path, unit) + ".tmp"
+        with open(tmp_path, "wb") as f:
+            buf = None
+            for i in range(source.num_frames):
+                if cancel is not None and cancel.is_set():
+                    f.close()
+                    os.remove(tmp_path)
+                    return None
+                frame = source.read_frame(i, out=buf)
+                if buf is None:
+                    buf = np.array(frame)  # Buffer reaproveitado nas próximas leituras
+                f.write(np.ascontiguousarray(frame).data)
+                times.append(to_seconds(getattr(source, "last_frame_time", None)))
+                done += 1
+                if progress:
+                    progress(done, total)
+        os.replace(tmp_path, unit_path(path, unit))
+        header["units"][unit] = {"dtype": buf.dtype.str if buf is not None else "<u2"}
+        if header["times"] is None and all(t is not None for t in times):
+            header["times"] = [t - times[0] for t in times]
+
+    tmp_header = header_path(path) + ".tmp"
+    with open(tmp_header, "w", encoding="utf-8") as f:
+        json.dump(header, f)
+    os.replace(tmp_header, header_path(path))
+    return header_path(path)
+
+
+class CubeFrameSource(FrameSource):
+    """
+    Lê o sidecar gerado por convert_to_cube com np.memmap: cada frame é uma view
+    sem cópia e o SDK não é aberto.
+    """
+
+    has_preview = True
+    zero_copy = True
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.header = read_header(path)
+        if self.header is None:
+            raise ValueError(f"Cubo não encontrado para {path}")
+        self.num_frames = self.header["num_frames"]
+        self.width = self.header["width"]
+        self.height = self.header["height"]
+        self.supported_units = tuple(self.header["units"].keys())
+        self._cubes = {}
+        self.unit = self.supported_units[0]
+
+    @property
+    def cube(self):
+        """Cubo (frames x H x W) da unidade ativa, para leituras em fatias (ex: série de um pixel)."""
+        cube = self._cubes.get(self.unit)
+        if cube is None:
+            dtype = np.dtype(self.header["units"][self.unit]["dtype"])
+            shape = (self.num_frames, self.height, self.width)
+            cube = self._cubes[self.unit] = np.memmap(unit_path(self.path, self.unit), dtype=dtype,
+                                                      mode="r", shape=shape)
+        return cube
+
+    def read_frame(self, index, out=None):
+        return self._deliver(self.cube[index], out)
+
+    def read_pixels(self, ys, xs, frames=slice(None)):
+        # Uma leitura com passo fixo (um frame inteiro) ao longo do cubo: cada pixel é uma coluna
+        return np.asarray(self.cube[frames, ys, xs])
+
+    def read_preview(self, index, step):
+        return np.array(self.cube[index, ::step, ::step])
+
+    def frame_times(self):
+        times = self.header.get("times")
+        return np.asarray(times, dtype=np.float64) if times else None
+
+    def open_clone(self):
+        clone = CubeFrameSource(self.path)
+        clone.set_unit(self.unit)
+        return clone
+
+    @property
+    def metadata(self):
+        return dict(self.header.get("metadata", {}))
+
+    def close(self):
+        self._cubes.clear()
@@ -0,0 +1,90 @@
+import os
+import threading
+
+import cv2
+import numpy as np
+
+from core.parallel import run_chunks
+
+
+def frame_percentiles(data, percentiles):
+    """
+    Percentis de um frame (interpolação linear, igual ao np.percentile) com uma única
+    seleção parcial (np.partition) para todos eles, sem ordenar o frame inteiro.
+    """
+    flat = np.asarray(data).ravel()
+    n = flat.size
+    pos = np.asarray(percentiles, dtype=np.float64) / 100.0 * (n - 1)
+    lo = np.floor(pos).astype(np.intp)
+    hi = np.minimum(lo + 1, n - 1)
+    part = np.partition(flat, np.unique(np.concatenate([lo, hi])))
+    frac = pos - lo
+    return part[lo] * (1 - frac) + part[hi] * frac
+
+
+# Tipos aceitos por cv2.minMaxLoc/cv2.meanStdDev
+_CV_DTYPES = (np.uint8, np.int8, np.uint16, np.int16, np.int32, np.float32, np.float64)
+
+# Colunas da tabela de compute_frame_stats além de "frame" e dos percentis
+SUMMARY_COLUMNS = ("min", "max", "mean", "std", "hot_x", "hot_y")
+
+
+def frame_min_max(data):
+    """Mínimo e máximo exatos numa passada (cv2.minMaxLoc), com np.min/np.max para tipos que o OpenCV não aceita."""
+    if data.dtype in _CV_DTYPES:
+        v_min, v_max, _, _ = cv2.minMaxLoc(data)
+        return v_min, v_max
+    return float(np.min(data)), float(np.max(data))
+
+
+def frame_summary(data):
+    """
+    Resumo de um frame: (mínimo, máximo, média, desvio padrão, x, y do máximo), o
+    ponto quente. Duas passadas do OpenCV (minMaxLoc e meanStdDev), sem cópias.
+    """
+    if data.dtype in _CV_DTYPES:
+        v_min, v_max, _, (hot_x, hot_y) = cv2.minMaxLoc(data)
+        mean, std = cv2.meanStdDev(data)
+        return v_min, v_max, float(mean[0, 0]), float(std[0, 0]), hot_x, hot_y
+    hot_y, hot_x = np.unravel_index(np.argmax(data), data.shape)
+    return (float(np.min(data)), float(np.max(data)), float(np.mean(data)), float(np.std(data)),
+            int(hot_x), int(hot_y))
+
+
+def compute_frame_stats(reader_factory, context, frames, percentiles=(1, 99), workers=None,
+                        chunk_size=32, progress=None, cancel=None):
+    """
+    Resumo de cada frame de `frames` (frame_summary) e seus percentis, numa passada em
+    blocos por todos os núcleos (reader_factory segue o contrato do FramePrefetcher).
+    Retorna uma tabela em colunas {"frame", "min", "max", "mean", "std", "hot_x", "hot_y",
+    "p1", "p99", ...}, ou None se `cancel` for acionado.
+    """
+    frames = np.asarray(frames, dtype=np.int64)
+    total = len(frames)
+    keys = [f"p{p:g}" for p in percentiles]
+    table = {"frame": frames}
+    table.update({key: np.full(total, np.nan) for key in SUMMARY_COLUMNS + tuple(keys)})
+    if total == 0:
+        return table
+
+    workers = workers or os.cpu_count() or 1
+    local = threading.local()
+    summary = [table[key] for key in SUMMARY_COLUMNS]
+
+    def run_chunk(lo, hi):
+        if not hasattr(local, "read"):
+            local.read = reader_factory()
+        for i in range(lo, hi):
+            if cancel is not None and cancel.is_set():
+                return 0
+            data = local.read(int(frames[i]), context)
+            for column, value in zip(summary, frame_summary(data)):
+                column[i] = value
+            if keys:
+                for key, value in zip(keys, frame_percentiles(data, percentiles)):
+                    table[key][i] = value
+        return hi - lo
+
+    if not run_chunks(run_chunk, total, workers, chunk_size, progress, cancel, "frame-stats"):
+        return None
+    return table
@@ -0,0 +1,153 @@
+import threading
+
+import numpy as np
+
+from core.parallel import run_chunks
+
+
+def bin_edges(v_min, v_max, bins):
+    return np.linspace(float(v_min), float(v_max), bins + 1)
+
+
+class HistogramEngine:
+    """
+    Histograma de um frame em `bins` classes iguais de [v_min, v_max]. Valores fora da
+    faixa caem nas classes das pontas, a mesma saturação (isoterma) da colorização.
+
+    Counts inteiros (até 16 bits): um np.bincount no valor cru e uma tabela valor ->
+    classe, guardada enquanto a faixa não muda. Floats (unidades calibradas): classe
+    calculada de forma vetorizada em buffers reaproveitados entre frames.
+    """
+
+    def __init__(self, bins=256):
+        self.bins = bins
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self._scaled = None  # Buffer de trabalho para dados em float
+        self._index = None   # Buffer com a classe de cada pixel
+        self._table = None   # Tabela valor inteiro -> classe para o último (dtype, v_min, v_max)
+        self._table_key = None
+
+    def compute(self, data, v_min, v_max):
+        """Retorna o histograma do frame. O array é reaproveitado na próxima chamada: copie para guardar."""
+        if data.dtype.kind in "ui" and data.dtype.itemsize <= 2:
+            table = self._bin_table(data.dtype, v_min, v_max)
+            if data.dtype.kind == "i":
+                data = data.view(f"u{data.dtype.itemsize}")
+            raw = np.bincount(data.ravel(), minlength=len(table))
+            self.counts[:] = np.bincount(table, weights=raw, minlength=self.bins)
+            return self.counts
+
+        dtype = data.dtype if data.dtype.kind == "f" else np.dtype(np.float32)
+        if self._scaled is None or self._scaled.shape != data.shape or self._scaled.dtype != dtype:
+            self._scaled = np.empty(data.shape, dtype=dtype)
+            self._index = np.empty(data.shape, dtype=np.intp)
+        scaled = self._scaled
+        np.subtract(data, v_min, out=scaled)
+        np.multiply(scaled, self._scale(v_min, v_max), out=scaled)
+        # fmax/fmin em vez de clip: NaN vira 0 em vez de um índice inválido
+        np.fmax(scaled, 0, out=scaled)
+        np.fmin(scaled, self.bins - 1, out=scaled)
+        np.copyto(self._index, scaled, casting="unsafe")
+        self.counts[:] = np.bincount(self._index.ravel(), minlength=self.bins)
+        return self.counts
+
+    def _scale(self, v_min, v_max):
+        return self.bins / (v_max - v_min) if v_max > v_min else 0.0
+
+    def _bin_table(self, dtype, v_min, v_max):
+        key = (dtype.str, float(v_min), float(v_max))
+        if key != self._table_key:
+            x = np.arange(1 << (8 * dtype.itemsize), dtype=f"u{dtype.itemsize}").view(dtype)
+            pos = (x.astype(np.float64) - v_min) * self._scale(v_min, v_max)
+            self._table = np.clip(pos, 0, self.bins - 1).astype(np.intp)
+            self._table_key = key
+        return self._table
+
+
+class HistogramAccumulator:
+    """Soma os histogramas de vários frames numa faixa fixa (histograma da gravação)."""
+
+    def __init__(self, v_min, v_max, bins=256):
+        self.v_min = float(v_min)
+        self.v_max = float(v_max)
+        self.engine = HistogramEngine(bins)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.frames = 0
+
+    @property
+    def bins(self):
+        return len(self.counts)
+
+    @property
+    def edges(self):
+        return bin_edges(self.v_min, self.v_max, self.bins)
+
+    def add(self, data):
+        self.counts += self.engine.compute(data, self.v_min, self.v_max)
+        self.frames += 1
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.frames += other.frames
+
+
+def accumulate_histogram(reader_factory, context, frames, v_min, v_max, bins=256, workers=None,
+                         chunk_size=32, progress=None, cancel=None):
+    """
+    Histograma somado dos frames `frames` em [v_min, v_max], em várias threads
+    (reader_factory segue o contrato do FramePrefetcher). Cada thread acumula no seu
+    próprio HistogramAccumulator e eles são somados no fim.
+    Retorna o acumulador, ou None se `cancel` for acionado.
+    """
+    frames = np.asarray(frames, dtype=np.int64)
+    total = len(frames)
+    result = HistogramAccumulator(v_min, v_max, bins)
+    if total == 0:
+        return result
+
+    local = threading.local()
+    partials = []
+
+    def run_chunk(lo, hi):
+        if not hasattr(local, "read"):
+            local.read = reader_factory()
+            local.acc = HistogramAccumulator(v_min, v_max, bins)
+            partials.append(local.acc)
+        for i in range(lo, hi):
+            if cancel is not None and cancel.is_set():
+                return 0
+            local.acc.add(local.read(int(frames[i]), context))
+        return hi - lo
+
+    if not run_chunks(run_chunk, total, workers, chunk_size, progress, cancel, "histogram"):
+        return None
+    for acc in partials:
+        result.merge(acc)
+    return result
+
+
+def equalization_remap(counts, size):
+    """
+    Tabela (size,) de índices da paleta para a equalização de histograma: a posição
+    linear i (0 = v_min, size-1 = v_max) passa a usar a cor da fração acumulada
+    (CDF) de pixels até ela, espalhando as cores onde há mais pixels.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    total = counts.sum()
+    if total <= 0:
+        return np.arange(size, dtype=np.intp)
+    # CDF no centro de cada classe, interpolada para as posições da paleta
+    cdf = (np.cumsum(counts) - counts / 2) / total
+    centers = (np.arange(len(counts)) + 0.5) / len(counts)
+    cdf = np.interp(np.linspace(0, 1, size), centers, cdf)
+    span = cdf[-1] - cdf[0]
+    cdf = (cdf - cdf[0]) / span if span > 0 else np.linspace(0, 1, size)
+    return np.rint(cdf * (size - 1)).astype(np.intp)
+
+
+def write_histogram_csv(path, acc, delimiter=","):
+    """Grava o histograma acumulado em CSV: início e fim de cada classe e a contagem."""
+    edges = acc.edges
+    columns = np.column_stack([edges[:-1], edges[1:], acc.counts])
+    np.savetxt(path, columns, delimiter=delimiter, header=delimiter.join(["bin_start", "bin_end", "count"]),
+               comments="", fmt=["%.6g", "%.6g", "%d"])
@@ -0,0 +1,29 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+def run_chunks(run_chunk, total, workers, chunk_size, progress=None, cancel=None, name="chunks"):
+    """
+    Executa run_chunk(lo, hi) em blocos de `chunk_size` de range(total) numa pool de
+    threads (uma por núcleo, até 4, sem `workers`). run_chunk devolve quantos itens
+    processou; `progress(feitos, total)` é chamado a cada bloco concluído.
+    Retorna False se `cancel` for acionado.
+    """
+    workers = workers or min(4, os.cpu_count() or 1)
+    chunks = [(lo, min(lo + chunk_size, total)) for lo in range(0, total, chunk_size)]
+    done = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name) as executor:
+        pending = {executor.submit(run_chunk, lo, hi) for lo, hi in chunks}
+        try:
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    done += future.result()
+                if cancel is not None and cancel.is_set():
+                    return False
+                if progress:
+                    progress(done, total)
+        finally:
+            for future in pending:
+                future.cancel()
+    return True
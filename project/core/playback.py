@@ -0,0 +1,130 @@
+import collections
+import time
+
+import numpy as np
+
+# Velocidades oferecidas no player (multiplicam o tempo real da gravação)
+PLAYBACK_SPEEDS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0)
+
+
+class PlaybackScheduler:
+    """
+    Decide qual frame mostrar pelo relógio, não por ticks fixos.
+
+    O tempo da gravação avança com o relógio de parede (vezes a velocidade) a partir
+    de uma âncora. Em cada tick o frame exibido é o último cujo tempo já passou:
+    se a decodificação/desenho atrasar, os frames intermediários são pulados em vez
+    de acumular atraso. Usa os tempos reais de cada frame quando a fonte os informa,
+    senão uma taxa fixa. Ao chegar ao fim, volta ao início (loop).
+    """
+
+    STATS_WINDOW = 1.0 # Segundos considerados no fps alcançado
+
+    def __init__(self, num_frames=0, frame_times=None, fps=30.0, speed=1.0):
+        self.speed = _clamp_speed(speed)
+        self.anchor_wall = None
+        self._displayed = collections.deque() # Instantes em que frames novos foram exibidos
+        self.reset(num_frames, frame_times, fps)
+
+    def reset(self, num_frames, frame_times=None, fps=30.0):
+        self.num_frames = num_frames
+        fps = fps if fps and fps > 0 else 30.0
+        if frame_times is not None and len(frame_times) == num_frames and num_frames > 1:
+            times = np.asarray(frame_times, dtype=np.float64)
+            times = times - times[0]
+            period = float(np.median(np.diff(times)))
+            # Tempos fora de ordem (relógio da câmera reiniciado) não servem para agendar
+            if period <= 0 or np.any(np.diff(times) < 0):
+                times = None
+        else:
+            times = None
+        if times is None:
+            period = 1.0 / fps
+            times = np.arange(num_frames, dtype=np.float64) * period
+        self.times = times
+        self.period = period
+        self.duration = (times[-1] + period) if num_frames else 0.0
+        self.anchor_wall = None
+        self.anchor_media = 0.0
+        self.current = 0
+        self.reset_stats()
+
+    @property
+    def source_fps(self):
+        return 1.0 / self.period if self.period > 0 else 0.0
+
+    @property
+    def target_fps(self):
+        return self.source_fps * self.speed
+
+    def set_speed(self, speed, now=None):
+        # Reancora no instante atual para que a troca de velocidade não cause salto no tempo da gravação
+        if self.running:
+            now = time.perf_counter() if now is None else now
+            self.anchor_media, self.anchor_wall = self._media_time(now), now
+            self._displayed.clear()
+        self.speed = _clamp_speed(speed)
+
+    def start(self, frame_index, now=None):
+        """Começa (ou retoma) a reprodução a partir de `frame_index`."""
+        now = time.perf_counter() if now is None else now
+        if self.num_frames == 0: return
+        self.current = int(frame_index) % self.num_frames
+        self.anchor_media = self.times[self.current]
+        self.anchor_wall = now
+        self._displayed.clear()
+
+    def stop(self):
+        self.anchor_wall = None
+
+    @property
+    def running(self):
+        return self.anchor_wall is not None
+
+    def tick(self, now=None):
+        """
+        Retorna (frame, espera): o frame que deve estar na tela agora e quantos segundos
+        faltam até o próximo. Frames pulados desde o último tick entram em `dropped`.
+        """
+        now = time.perf_counter() if now is None else now
+        if not self.running or self.num_frames == 0:
+            return self.current, self.period
+
+        media = self._media_time(now)
+        if media >= self.duration:
+            # Loop: reancora no início para não acumular erro de ponto flutuante
+            media %= self.duration
+            self.anchor_media, self.anchor_wall = media, now
+
+        index = int(np.searchsorted(self.times, media, side="right")) - 1
+        index = min(max(index, 0), self.num_frames - 1)
+        if index != self.current:
+            self.dropped += (index - self.current - 1) % self.num_frames
+            self.current = index
+            self.shown += 1
+            self._displayed.append(now)
+            while now - self._displayed[0] > self.STATS_WINDOW:
+                self._displayed.popleft()
+
+        next_media = self.times[index + 1] if index + 1 < self.num_frames else self.duration
+        return index, max(next_media - media, 0.0) / self.speed
+
+    @property
+    def achieved_fps(self):
+        """Frames realmente exibidos por segundo na última janela de ~1 s."""
+        shown = self._displayed
+        if len(shown) < 2: return 0.0
+        span = shown[-1] - shown[0]
+        return (len(shown) - 1) / span if span > 0 else 0.0
+
+    def reset_stats(self):
+        self.dropped = 0
+        self.shown = 0
+        self._displayed.clear()
+
+    def _media_time(self, now):
+        return self.anchor_media + (now - self.anchor_wall) * self.speed
+
+
+def _clamp_speed(speed):
+    return min(max(float(speed), PLAYBACK_SPEEDS[0]), PLAYBACK_SPEEDS[-1])
@@ -0,0 +1,115 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class FramePrefetcher:
+    """
+    Decodifica antecipadamente os próximos N frames em threads de trabalho.
+
+    reader_factory() é chamado uma vez por thread e deve devolver uma função
+    read(frame_index, context) -> np.ndarray que use um handle de arquivo próprio,
+    pois o SDK não permite decodificar em paralelo com o mesmo ImagerFile.
+    O `context` identifica unidade e calibração: se ele mudar, tudo é descartado.
+    """
+
+    def __init__(self, reader_factory, num_frames, depth=8, workers=2, is_cached=None, on_discard=None):
+        self.reader_factory = reader_factory
+        self.is_cached = is_cached  # is_cached(frame_index, context): frames já em cache não são agendados
+        self.on_discard = on_discard  # on_discard(frame): frame decodificado que ninguém vai usar (devolve o buffer)
+        self.num_frames = num_frames
+        self.depth = max(0, int(depth))
+        self.direction = 1
+        self._context = None
+        self._pending = {}  # Anel limitado: frame_index -> Future (no máximo `depth` entradas)
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="prefetch")
+
+    def get(self, frame_index, context, direction=1):
+        """
+        Retorna o frame pré-decodificado (ou None se ele não estava no buffer) e
+        agenda a decodificação dos próximos `depth` frames na direção indicada.
+        """
+        with self._lock:
+            self._sync_locked(context, direction)
+            future = self._pending.pop(frame_index, None)
+            self._refill_locked(frame_index)
+
+        if future is None:
+            return None
+        try:
+            # Se a decodificação ainda está em andamento, esperar é mais barato que recomeçar
+            return future.result()
+        except Exception:
+            return None  # Cancelado ou falhou: o modelo decodifica de forma síncrona
+
+    def advance(self, frame_index, context, direction=1):
+        """Move a janela sem consumir nada (o frame atual veio de outro lugar, ex: cache)."""
+        with self._lock:
+            self._sync_locked(context, direction)
+            self._refill_locked(frame_index)
+
+    def set_depth(self, depth):
+        with self._lock:
+            self.depth = max(0, int(depth))
+            self._invalidate_locked()
+
+    def invalidate(self):
+        """Descarta todos os frames pendentes (troca de unidade, calibração ou seek)."""
+        with self._lock:
+            self._invalidate_locked()
+
+    def stop(self):
+        self.invalidate()
+        self._executor.shutdown(wait=False)
+
+    # --- INTERNOS ---
+
+    def _sync_locked(self, context, direction):
+        if context != self._context or direction != self.direction:
+            self._invalidate_locked()
+            self._context = context
+            self.direction = direction
+
+    def _window(self, frame_index):
+        n = self.num_frames
+        return [(frame_index + self.direction * k) % n for k in range(1, min(self.depth, n - 1) + 1)]
+
+    def _refill_locked(self, frame_index):
+        if self.num_frames <= 1 or self.depth == 0:
+            return
+        window = self._window(frame_index)
+
+        # Frames fora da janela (ficaram para trás ou foram pulados num seek) são cancelados
+        wanted = set(window)
+        for idx in [i for i in self._pending if i not in wanted]:
+            self._drop(self._pending.pop(idx))
+
+        for idx in window:
+            if idx in self._pending or (self.is_cached and self.is_cached(idx, self._context)):
+                continue
+            self._pending[idx] = self._executor.submit(self._decode, idx, self._context, self._generation)
+
+    def _invalidate_locked(self):
+        for future in self._pending.values():
+            self._drop(future)
+        self._pending.clear()
+        self._generation += 1
+
+    def _drop(self, future):
+        # Já em decodificação não dá para cancelar: o frame pronto vai para on_discard
+        if not future.cancel() and self.on_discard is not None:
+            future.add_done_callback(self._discard_result)
+
+    def _discard_result(self, future):
+        if future.exception() is None and future.result() is not None:
+            self.on_discard(future.result())
+
+    def _decode(self, frame_index, context, generation):
+        if generation != self._generation:
+            return None  # Pedido obsoleto: não gasta tempo decodificando
+        read = getattr(self._local, "read", None)
+        if read is None:
+            read = self._local.read = self.reader_factory()
+        return read(frame_index, context)
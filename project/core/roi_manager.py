@@ -0,0 +1,164 @@
+import cv2
+import numpy as np
+
+from core.roi_stats import ellipse_mask
+
+# Percentis calculados por padrão para cada ROI
+DEFAULT_PERCENTILES = (5, 50, 95)
+
+
+class Roi:
+    """
+    ROI nomeado. Para "Rect" e "Circle" a geometria é (x1, y1, x2, y2) do retângulo
+    envolvente; para "Polygon" é a lista de vértices [(x, y), ...].
+    """
+    def __init__(self, name, kind, geometry):
+        self.name = name
+        self.kind = kind
+        self.geometry = geometry
+
+    def pixel_indices(self, shape):
+        """Índices lineares (frame.ravel()) dos pixels cobertos pelo ROI dentro do frame."""
+        h, w = shape
+        if self.kind == "Polygon":
+            pts = np.round(np.asarray(self.geometry, dtype=np.float64)).astype(np.int32)
+            if len(pts) < 3: return np.empty(0, dtype=np.intp)
+            x1, y1 = max(0, pts[:, 0].min()), max(0, pts[:, 1].min())
+            x2, y2 = min(w, pts[:, 0].max() + 1), min(h, pts[:, 1].max() + 1)
+            if x1 >= x2 or y1 >= y2: return np.empty(0, dtype=np.intp)
+            # Rasteriza só na caixa envolvente
+            mask = np.zeros((y2 - y1, x2 - x1), dtype=np.uint8)
+            cv2.fillPoly(mask, [pts - (x1, y1)], 1)
+            ys, xs = np.nonzero(mask)
+        else:
+            x1, y1, x2, y2 = self.geometry
+            x1, y1 = int(max(0, x1)), int(max(0, y1))
+            x2, y2 = int(min(w, x2)), int(min(h, y2))
+            if x1 >= x2 or y1 >= y2: return np.empty(0, dtype=np.intp)
+            if self.kind == "Circle":
+                ys, xs = np.nonzero(ellipse_mask(y2 - y1, x2 - x1))
+            else:
+                ys, xs = np.divmod(np.arange((y2 - y1) * (x2 - x1)), x2 - x1)
+        return ((ys + y1) * w + (xs + x1)).astype(np.intp)
+
+
+class RoiManager:
+    """
+    Conjunto de ROIs nomeados com estatísticas de todos eles numa passada vetorizada.
+
+    Os ROIs são rasterizados uma vez (por tamanho de frame) em dois arrays
+    concatenados: índices dos pixels e rótulo do ROI de cada pixel. Ao contrário de
+    uma imagem de rótulos, isso permite ROIs sobrepostos. Por frame, soma, média e
+    desvio saem de np.bincount; mínimo, máximo e percentis da ordenação in-place
+    do trecho de cada ROI.
+
+    Os desvios em relação à média ficam em `dtype` (precisão dos frames); as somas
+    do np.bincount são sempre float64.
+    """
+
+    def __init__(self, percentiles=DEFAULT_PERCENTILES, dtype=np.float64):
+        self.dtype = np.dtype(dtype)
+        self.rois = {}
+        self.percentiles = tuple(percentiles)
+        self._counter = 0
+        self._shape = None
+        self._index = None    # Índices lineares dos pixels de todos os ROIs
+        self._labels = None   # Rótulo (posição em self.rois) de cada índice
+        self._counts = None
+        self._starts = None
+
+    def add(self, kind, geometry, name=None):
+        if name is None:
+            self._counter += 1
+            name = f"ROI {self._counter}"
+        self.rois[name] = Roi(name, kind, geometry)
+        self._invalidate()
+        return name
+
+    def update(self, name, geometry):
+        self.rois[name].geometry = geometry
+        self._invalidate()
+
+    def remove(self, name):
+        if self.rois.pop(name, None) is not None:
+            self._invalidate()
+
+    def clear(self):
+        self.rois.clear()
+        self._counter = 0
+        self._invalidate()
+
+    def __len__(self):
+        return len(self.rois)
+
+    def compute(self, data):
+        """
+        Estatísticas de todos os ROIs sobre o frame `data`, em colunas:
+        {"name": [...], "count", "min", "max", "mean", "std", "p5", "p50", ...}.
+        ROIs totalmente fora do frame recebem NaN.
+        """
+        names = list(self.rois)
+        n = len(names)
+        table = {"name": names}
+        if n == 0:
+            return table
+        self._rasterize(data.shape)
+
+        values = np.take(data.ravel(), self._index)
+        labels, counts, starts = self._labels, self._counts, self._starts
+        valid = counts > 0
+        safe_counts = np.where(valid, counts, 1)
+
+        mean = np.bincount(labels, weights=values, minlength=n) / safe_counts
+        # Variância em duas passadas (desvios em relação à média): estável mesmo com counts altos
+        dev = values - mean.astype(self.dtype)[labels]
+        np.multiply(dev, dev, out=dev)
+        std = np.sqrt(np.bincount(labels, weights=dev, minlength=n) / safe_counts)
+
+        stats = {"count": counts, "mean": mean, "std": std}
+        if values.size and self.percentiles:
+            # Cada ROI ocupa um trecho contíguo: ordenar os trechos no lugar é bem mais
+            # rápido que uma ordenação global por (rótulo, valor)
+            sorted_vals = values.copy()
+            for start, count in zip(starts, counts):
+                sorted_vals[start:start + count].sort()
+            first = np.minimum(starts, values.size - 1)
+            last = np.minimum(starts + safe_counts - 1, values.size - 1)
+            stats["min"] = sorted_vals[first]
+            stats["max"] = sorted_vals[last]
+            for p in self.percentiles:
+                # Interpolação linear, igual ao padrão do np.percentile
+                pos = first + (p / 100.0) * (last - first)
+                lo = np.floor(pos).astype(np.intp)
+                hi = np.minimum(lo + 1, last)
+                frac = pos - lo
+                stats[f"p{p:g}"] = sorted_vals[lo] * (1 - frac) + sorted_vals[hi] * frac
+        elif values.size:
+            stats["min"] = np.full(n, np.nan)
+            stats["max"] = np.full(n, np.nan)
+            stats["min"][valid] = np.minimum.reduceat(values, starts[valid])
+            stats["max"][valid] = np.maximum.reduceat(values, starts[valid])
+
+        for key in ("min", "max") + tuple(f"p{p:g}" for p in self.percentiles):
+            table[key] = np.full(n, np.nan)
+        for key, col in stats.items():
+            col = np.asarray(col, dtype=np.float64)
+            if key != "count":
+                col[~valid] = np.nan
+            table[key] = col
+        return table
+
+    # --- INTERNOS ---
+
+    def _invalidate(self):
+        self._shape = None
+
+    def _rasterize(self, shape):
+        if self._shape == shape: return
+        parts = [roi.pixel_indices(shape) for roi in self.rois.values()]
+        counts = np.array([len(p) for p in parts], dtype=np.intp)
+        self._index = np.concatenate(parts) if parts else np.empty(0, dtype=np.intp)
+        self._labels = np.repeat(np.arange(len(parts)), counts)
+        self._counts = counts
+        self._starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.intp)
+        self._shape = shape
@@ -0,0 +1,121 @@
+from collections import OrderedDict
+import cv2
+import numpy as np
+
+
+def ellipse_mask(h, w):
+    """Máscara booleana (h, w) da elipse inscrita no retângulo do ROI."""
+    cx, cy = w / 2, h / 2
+    a, b = w / 2, h / 2 # Raios da elipse
+    Y, X = np.ogrid[:h, :w]
+    return ((X - cx)**2 / (a**2 + 1e-6) + (Y - cy)**2 / (b**2 + 1e-6)) <= 1
+
+
+class RoiStatsEngine:
+    """
+    Média e desvio padrão de ROIs retangulares e elípticos sobre o frame atual.
+
+    Com várias consultas no mesmo frame (ex: arrastando um ROI), as tabelas de área
+    somada (soma e soma dos quadrados) são calculadas uma vez e cada retângulo custa
+    O(1); uma elipse custa O(altura), somando um intervalo por linha. A primeira
+    consulta de cada frame é feita diretamente sobre o recorte, que sai mais barato
+    que montar as tabelas quando só um ROI parado é atualizado na reprodução.
+    As máscaras das elipses ficam em cache por (h, w).
+
+    `dtype` é a precisão do frame deslocado usado nas tabelas; as somas em si são
+    sempre acumuladas em float64.
+    """
+
+    MAX_MASKS = 32
+
+    def __init__(self, dtype=np.float64):
+        self.dtype = np.dtype(dtype)
+        self.data = None
+        self._queries = 0
+        self._sum = None
+        self._sum_sq = None
+        self._offset = 0.0
+        self._work = None
+        self._masks = OrderedDict()
+
+    def set_frame(self, data):
+        self.data = data
+        self._queries = 0
+        self._sum = None  # Tabelas do frame anterior deixam de valer
+
+    def stats(self, kind, x1, y1, x2, y2):
+        """Retorna (média, desvio padrão) do ROI "Rect" ou "Circle", ou None se ele estiver vazio."""
+        if self.data is None: return None
+        h, w = self.data.shape
+        x1, y1 = int(max(0, x1)), int(max(0, y1))
+        x2, y2 = int(min(w, x2)), int(min(h, y2))
+        if x1 >= x2 or y1 >= y2: return None # Seleção vazia
+
+        self._queries += 1
+        if self._sum is None and self._queries < 2:
+            return self._direct_stats(kind, x1, y1, x2, y2)
+
+        self._build_tables()
+        if kind == "Circle":
+            rows, xs, xe = self._ellipse(y2 - y1, x2 - x1)[1:]
+            return self._from_sums(*self._span_sums(y1 + rows, x1 + xs, x1 + xe))
+        # Retângulo: quatro cantos de cada tabela
+        S, Q = self._sum, self._sum_sq
+        s = S[y2, x2] - S[y1, x2] - S[y2, x1] + S[y1, x1]
+        q = Q[y2, x2] - Q[y1, x2] - Q[y2, x1] + Q[y1, x1]
+        return self._from_sums(float(s), float(q), (y2 - y1) * (x2 - x1))
+
+    # --- INTERNOS ---
+
+    def _direct_stats(self, kind, x1, y1, x2, y2):
+        roi_data = self.data[y1:y2, x1:x2]
+        if kind == "Circle":
+            roi_data = roi_data[self._ellipse(*roi_data.shape)[0]]
+        if roi_data.size == 0: return None
+        # Acumula em float64 mesmo com frames float32
+        return float(np.mean(roi_data, dtype=np.float64)), float(np.std(roi_data, dtype=np.float64))
+
+    def _build_tables(self):
+        if self._sum is not None: return
+        data = self.data
+        # Desloca os dados pela média de uma amostra: somas menores, sem cancelamento catastrófico na variância
+        self._offset = float(np.mean(data[::8, ::8]))
+        if self._work is None or self._work.shape != data.shape or self._work.dtype != self.dtype:
+            self._work = np.empty(data.shape, dtype=self.dtype)
+        np.subtract(data, self._offset, out=self._work)
+        self._sum, self._sum_sq = cv2.integral2(self._work, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F)
+
+    def _span_sums(self, rows, x_start, x_end):
+        # Soma de cada intervalo [x_start, x_end) da linha `row` usando as tabelas de área somada
+        S, Q = self._sum, self._sum_sq
+        r0, r1 = rows, rows + 1
+        s = S[r1, x_end] - S[r0, x_end] - S[r1, x_start] + S[r0, x_start]
+        q = Q[r1, x_end] - Q[r0, x_end] - Q[r1, x_start] + Q[r0, x_start]
+        return s.sum(), q.sum(), int((x_end - x_start).sum())
+
+    def _from_sums(self, s, q, n):
+        if n == 0: return None
+        mean = s / n
+        var = max(q / n - mean * mean, 0.0)
+        return self._offset + mean, float(np.sqrt(var))
+
+    def _ellipse(self, h, w):
+        """Máscara da elipse inscrita em (h, w) e seus intervalos por linha, com cache LRU."""
+        key = (h, w)
+        entry = self._masks.get(key)
+        if entry is not None:
+            self._masks.move_to_end(key)
+            return entry
+
+        mask = ellipse_mask(h, w)
+
+        # A elipse é convexa: em cada linha os pixels válidos formam um único intervalo
+        rows = np.flatnonzero(mask.any(axis=1))
+        x_start = mask[rows].argmax(axis=1)
+        x_end = w - mask[rows, ::-1].argmax(axis=1)
+
+        entry = (mask, rows, x_start, x_end)
+        self._masks[key] = entry
+        if len(self._masks) > self.MAX_MASKS:
+            self._masks.popitem(last=False)
+        return entry
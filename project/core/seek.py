@@ -0,0 +1,87 @@
+import threading
+
+
+class SeekService:
+    """
+    Decodifica frames pedidos fora de ordem (arrastar a barra de tempo) numa thread
+    própria, sem travar a interface. O pedido mais recente vence: enquanto um frame
+    é decodificado, novos pedidos só substituem o alvo pendente, então há no máximo
+    uma decodificação em andamento e nenhuma fila de pedidos velhos. Um frame que
+    terminou depois de superado ainda é entregue (é mais novo que o da tela e serve de
+    retorno visual no arraste); cancel() descarta até ele.
+
+    reader_factory() segue o contrato do FramePrefetcher (read(frame_index, context)).
+    preview_factory(), opcional, devolve preview(frame_index, context) -> frame
+    aproximado e barato (ou None), entregue antes da decodificação completa.
+    O callback do pedido, callback(frame_index, context, data, is_preview), é chamado
+    na thread de seek; data é None se a decodificação falhou.
+    """
+
+    def __init__(self, reader_factory, preview_factory=None):
+        self.reader_factory = reader_factory
+        self.preview_factory = preview_factory
+        self._cond = threading.Condition()
+        self._pending = None  # (geração, frame_index, context, callback): só o último pedido
+        self._generation = 0
+        self._cancelled = 0  # Gerações até esta não são mais entregues
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="seek", daemon=True)
+        self._thread.start()
+
+    def request(self, frame_index, context, callback):
+        with self._cond:
+            self._generation += 1
+            self._pending = (self._generation, frame_index, context, callback)
+            self._cond.notify()
+
+    def cancel(self):
+        """Descarta o pedido pendente e ignora o que estiver sendo decodificado."""
+        with self._cond:
+            self._generation += 1
+            self._cancelled = self._generation
+            self._pending = None
+
+    def close(self):
+        # Não espera a thread: uma decodificação do SDK em andamento não pode ser interrompida
+        with self._cond:
+            self._closed = True
+            self._generation += 1
+            self._cancelled = self._generation
+            self._pending = None
+            self._cond.notify()
+
+    # --- INTERNOS ---
+
+    def _is_current(self, generation):
+        return generation == self._generation
+
+    def _run(self):
+        read = preview = None
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                generation, frame_index, context, callback = self._pending
+                self._pending = None
+
+            if self.preview_factory is not None:
+                try:
+                    preview = preview or self.preview_factory()
+                    data = preview(frame_index, context)
+                except Exception:
+                    data = None # Sem prévia: segue para a decodificação completa
+                if data is not None and self._is_current(generation):
+                    callback(frame_index, context, data, True)
+
+            # Um pedido mais novo chegou durante a prévia: nem começa esta decodificação
+            if not self._is_current(generation):
+                continue
+            try:
+                read = read or self.reader_factory()
+                data = read(frame_index, context)
+            except Exception:
+                data = None
+            if generation > self._cancelled:
+                callback(frame_index, context, data, False)
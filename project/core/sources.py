@@ -0,0 +1,364 @@
+import json
+import os
+import numpy as np
+
+_fnv = None # Módulo do SDK, importado só quando um arquivo da câmera é aberto
+
+
+def load_fnv():
+    """
+    Importa o FLIR Science File SDK na primeira vez que é preciso (demora e é dispensável
+    para cubos .npy/.raw e a fonte sintética). Retorna None se o SDK não estiver instalado.
+    """
+    global _fnv
+    if _fnv is None:
+        try:
+            import fnv
+            import fnv.file
+        except ImportError:  # SDK da FLIR ausente: só as fontes NumPy e sintética ficam disponíveis
+            return None
+        _fnv = fnv
+    return _fnv
+
+
+def to_seconds(t):
+    """Tempo de frame do SDK (datetime ou número) em segundos, ou None se não der para converter."""
+    if t is None:
+        return None
+    if hasattr(t, "timestamp"):
+        return float(t.timestamp())
+    try:
+        return float(t)
+    except (TypeError, ValueError):
+        return None
+
+
+# Unidades neutras, independentes do SDK
+UNIT_COUNTS = "counts"
+UNIT_RADIANCE = "radiance"
+UNIT_TEMPERATURE = "temperature"
+
+
+class FrameSource:
+    """
+    Interface comum a todas as fontes de frames.
+
+    Uma fonte informa num_frames, width/height, as unidades suportadas e devolve
+    cada frame com read_frame(index, out=None). Sem `out`, o array devolvido
+    pertence ao chamador ou é uma view somente-leitura: nunca é um buffer que a
+    fonte vá sobrescrever na próxima leitura.
+    """
+
+    num_frames = 0
+    width = 0
+    height = 0
+    supported_units = (UNIT_COUNTS,)
+    last_frame_time = None  # Tempo do último frame lido, quando a fonte o conhece
+    has_preview = False     # read_preview implementado (prévia barata no seek)
+    zero_copy = False       # read_frame sem `out` devolve uma view, sem copiar o frame
+
+    def __init__(self):
+        self.unit = UNIT_COUNTS
+
+    @property
+    def shape(self):
+        return (self.height, self.width)
+
+    def set_unit(self, unit):
+        if unit not in self.supported_units:
+            raise ValueError(f"Unidade não suportada por esta fonte: {unit}")
+        self.unit = unit
+
+    def read_frame(self, index, out=None):
+        raise NotImplementedError
+
+    def read_frame_view(self, index):
+        """
+        Frame `index` para uso imediato, sem cópia quando a fonte permite: pode ser um
+        buffer interno que a próxima leitura sobrescreve (ex: o im.final do SDK). Serve a
+        quem só lê o frame e grava o resultado em outro lugar (calibração do usuário).
+        """
+        return self.read_frame(index)
+
+    def frame_times(self):
+        """Tempos de cada frame em segundos desde o primeiro, ou None se desconhecidos."""
+        return None
+
+    def scan_frame_times(self, progress=None, cancel=None):
+        """
+        Tempos que só saem lendo a gravação inteira. Fontes que guardam os tempos no
+        cabeçalho não precisam disso e devolvem frame_times(). None se cancelado.
+        """
+        return self.frame_times()
+
+    def read_pixels(self, ys, xs, frames=slice(None)):
+        """
+        Valores dos pixels (ys[k], xs[k]) nos frames `frames` (slice) como array
+        (frames x pixels), sem decodificar frames inteiros. Só fontes com acesso
+        aleatório ao cubo (memmap) implementam; as demais devolvem None e o chamador
+        lê frame a frame.
+        """
+        return None
+
+    def read_preview(self, index, step):
+        """
+        Frame `index` reduzido (um pixel a cada `step` em cada eixo), lido sem decodificar
+        o frame inteiro. Só fontes com acesso aleatório (memmap) implementam; as demais
+        devolvem None.
+        """
+        return None
+
+    def open_clone(self):
+        """Abre uma instância independente da mesma fonte (uma por thread de trabalho)."""
+        raise NotImplementedError
+
+    @property
+    def metadata(self):
+        """Parâmetros do objeto/arquivo como dicionário {nome: valor}."""
+        return {}
+
+    @property
+    def source_info(self):
+        return None
+
+    def close(self):
+        pass
+
+    def _deliver(self, data, out):
+        # Copia para o buffer do chamador ou devolve um array que não será reaproveitado
+        if out is not None:
+            np.copyto(out, data, casting="unsafe")
+            return out
+        return data
+
+
+class FnvFrameSource(FrameSource):
+    """Arquivos da câmera (.ats, .jpg radiométrico...) lidos pelo FLIR Science File SDK."""
+
+    def __init__(self, path, times=None):
+        super().__init__()
+        fnv = load_fnv()
+        if fnv is None:
+            raise RuntimeError("O FLIR Science File SDK (módulo fnv) não está instalado.")
+        self.path = path
+        self.im = fnv.file.ImagerFile(path)
+        self.num_frames = self.im.num_frames
+        self.width = self.im.width
+        self.height = self.im.height
+        self._unit_map = {
+            UNIT_COUNTS: fnv.Unit.COUNTS,
+            UNIT_RADIANCE: fnv.Unit.RADIANCE_FACTORY,
+            UNIT_TEMPERATURE: fnv.Unit.TEMPERATURE_FACTORY,
+        }
+        self.supported_units = tuple(u for u, sdk_unit in self._unit_map.items()
+                                     if sdk_unit in self.im.supported_units)
+        self.set_unit(UNIT_COUNTS)
+        # Pela taxa de quadros do arquivo (os clones recebem os do original); sem ela, até
+        # scan_frame_times rodar, frame_times() fica None e a reprodução usa a taxa padrão
+        self._times = times if times is not None else self._header_times()
+
+    def set_unit(self, unit):
+        super().set_unit(unit)
+        self.im.unit = self._unit_map[unit]
+
+    def frame_times(self):
+        return self._times
+
+    def read_frame(self, index, out=None):
+        data = self.read_frame_view(index)
+        # O SDK reaproveita im.final a cada get_frame, então sem `out` é preciso copiar
+        return self._deliver(data, out) if out is not None else data.copy()
+
+    def read_frame_view(self, index):
+        self.im.get_frame(index)
+        self.last_frame_time = getattr(getattr(self.im, "frame_info", None), "time", None)
+        return np.asarray(self.im.final).reshape((self.height, self.width))
+
+    def open_clone(self):
+        clone = FnvFrameSource(self.path, times=self._times)
+        clone.set_unit(self.unit)
+        return clone
+
+    @property
+    def metadata(self):
+        obj_params = self.im.object_parameters
+        props = {}
+        for x in dir(obj_params):
+            if x.startswith("__"):
+                continue
+            val = getattr(obj_params, x)
+            if isinstance(val, (int, float, str)) and not callable(val):
+                props[x] = val
+        return props
+
+    @property
+    def source_info(self):
+        return self.im.source_info
+
+    def scan_frame_times(self, progress=None, cancel=None):
+        """
+        Lê o tempo de cada frame numa instância própria do arquivo (pode rodar numa thread
+        enquanto a reprodução usa esta). Só é preciso quando o arquivo não informa a taxa.
+        """
+        if self._times is not None:
+            return self._times
+        im = load_fnv().file.ImagerFile(self.path)
+        total = self.num_frames
+        times = np.empty(total, dtype=np.float64)
+        for index in range(total):
+            if cancel is not None and cancel.is_set():
+                return None
+            im.get_frame(index)
+            t = to_seconds(getattr(getattr(im, "frame_info", None), "time", None))
+            if t is None:
+                return None
+            times[index] = t
+            if progress and ((index + 1) % 64 == 0 or index + 1 == total):
+                progress(index + 1, total)
+        if total:
+            self._times = times - times[0]
+        return self._times
+
+    def _header_times(self):
+        # Só o que sai do cabeçalho: ler o tempo de cada frame decodifica a gravação inteira
+        rate = to_seconds(getattr(self.im, "frame_rate", None))
+        if rate and rate > 0:
+            return np.arange(self.num_frames, dtype=np.float64) / rate
+        return None
+
+class SyntheticFrameSource(FrameSource):
+    """
+    Gera frames sintéticos determinísticos (fundo em gradiente + ponto quente que se
+    move + ruído) para medir desempenho e testar sem arquivos nem SDK.
+    """
+
+    supported_units = (UNIT_COUNTS, UNIT_TEMPERATURE)
+
+    def __init__(self, width=640, height=512, num_frames=1000, dtype=np.uint16, seed=0):
+        super().__init__()
+        self.width = width
+        self.height = height
+        self.num_frames = num_frames
+        self.dtype = np.dtype(dtype)
+        self.seed = seed
+
+        rng = np.random.default_rng(seed)
+        y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+        self._base = 7000 + 1500 * (x / max(width - 1, 1)) + 500 * (y / max(height - 1, 1))
+        r = max(4, min(width, height) // 10)
+        yy, xx = np.mgrid[-r:r + 1, -r:r + 1].astype(np.float32)
+        self._blob = (3000 * np.exp(-(xx ** 2 + yy ** 2) / (0.3 * r * r))).astype(np.float32)
+        # Banco pequeno de ruído reaproveitado ciclicamente (gerar ruído por frame custaria caro)
+        self._noise = rng.normal(0, 20, size=(8, height, width)).astype(np.float32)
+        self._work = np.empty((height, width), dtype=np.float32)
+        self._view = None  # Buffer de read_frame_view, sobrescrito a cada leitura
+
+    def read_frame(self, index, out=None):
+        work = self._work
+        np.add(self._base, self._noise[index % len(self._noise)], out=work)
+
+        # Ponto quente percorre a imagem em círculo
+        r = self._blob.shape[0] // 2
+        t = 2 * np.pi * index / max(self.num_frames, 1)
+        cx = int(self.width / 2 + (self.width / 2 - r - 1) * np.cos(t) * 0.8)
+        cy = int(self.height / 2 + (self.height / 2 - r - 1) * np.sin(t) * 0.8)
+        y0, x0 = max(cy - r, 0), max(cx - r, 0)
+        y1, x1 = min(cy + r + 1, self.height), min(cx + r + 1, self.width)
+        work[y0:y1, x0:x1] += self._blob[y0 - (cy - r):y1 - (cy - r), x0 - (cx - r):x1 - (cx - r)]
+
+        if self.unit == UNIT_TEMPERATURE:
+            # Conversão linear arbitrária, só para exercitar o caminho de unidades em float
+            np.multiply(work, 0.01, out=work)
+            np.subtract(work, 50.0, out=work)
+            dtype = np.float32
+        else:
+            dtype = self.dtype
+
+        if out is None:
+            out = np.empty((self.height, self.width), dtype=dtype)
+        np.copyto(out, work, casting="unsafe")
+        return out
+
+    def read_frame_view(self, index):
+        dtype = np.dtype(np.float32) if self.unit == UNIT_TEMPERATURE else self.dtype
+        if self._view is None or self._view.dtype != dtype:
+            self._view = np.empty((self.height, self.width), dtype=dtype)
+        return self.read_frame(index, out=self._view)
+
+    def open_clone(self):
+        clone = SyntheticFrameSource(self.width, self.height, self.num_frames, self.dtype, self.seed)
+        clone.set_unit(self.unit)
+        return clone
+
+    @property
+    def metadata(self):
+        return {"source": "synthetic", "width": self.width, "height": self.height,
+                "num_frames": self.num_frames, "dtype": self.dtype.name, "seed": self.seed}
+
+
+class NumpyFrameSource(FrameSource):
+    """
+    Cubo de frames (frames x H x W) em .npy ou binário cru, aberto com memmap.
+
+    Para arquivos crus, shape/dtype vêm dos argumentos ou de um cabeçalho JSON
+    ao lado do arquivo (<arquivo>.json com "shape", "dtype" e opcionalmente "offset" e "unit").
+    """
+
+    has_preview = True
+    zero_copy = True
+
+    def __init__(self, path, shape=None, dtype=None, offset=0):
+        super().__init__()
+        self.path = path
+        self._args = (shape, dtype, offset)
+        unit = UNIT_COUNTS
+
+        if path.lower().endswith(".npy"):
+            frames = np.load(path, mmap_mode="r")
+        else:
+            header_path = path + ".json"
+            if shape is None and os.path.exists(header_path):
+                with open(header_path, "r", encoding="utf-8") as f:
+                    header = json.load(f)
+                shape = header["shape"]
+                dtype = header.get("dtype", dtype)
+                offset = header.get("offset", offset)
+                unit = header.get("unit", unit)
+            if shape is None or dtype is None:
+                raise ValueError("Arquivo cru sem cabeçalho: informe shape e dtype.")
+            frames = np.memmap(path, dtype=np.dtype(dtype), mode="r", offset=offset, shape=tuple(shape))
+
+        if frames.ndim == 2:
+            frames = frames[np.newaxis]  # Um único frame
+        self.frames = frames
+        self.num_frames, self.height, self.width = frames.shape
+        self.dtype = frames.dtype
+        self.supported_units = (unit,)
+        self.unit = unit
+
+    def read_frame(self, index, out=None):
+        # View do memmap: sem cópia, o cache de páginas do sistema cuida do resto
+        return self._deliver(self.frames[index], out)
+
+    def read_pixels(self, ys, xs, frames=slice(None)):
+        # Indexação avançada no memmap: só as páginas com os pixels pedidos são lidas
+        return np.asarray(self.frames[frames, ys, xs])
+
+    def read_preview(self, index, step):
+        return np.array(self.frames[index, ::step, ::step])
+
+    def open_clone(self):
+        return NumpyFrameSource(self.path, *self._args)
+
+    @property
+    def metadata(self):
+        return {"source": os.path.basename(self.path), "width": self.width, "height": self.height,
+                "num_frames": self.num_frames, "dtype": self.dtype.name}
+
+
+def open_source(path):
+    """Escolhe a fonte adequada pela extensão do arquivo."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".npy", ".raw", ".bin"):
+        return NumpyFrameSource(path)
+    return FnvFrameSource(path)
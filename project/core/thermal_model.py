@@ -1,53 +1,455 @@
-import fnv
-import fnv.file
-import fnv.reduce
+import cv2
 import numpy as np
-import pandas as pd
 import os
 
 from core.calibration import UserCalibration
+from core import export, extraction, frame_cube, frame_stats, histogram, thumbnails, video_export
+from core.frame_cache import FrameCache, FramePool
+from core.prefetch import FramePrefetcher
+from core.seek import SeekService
+from core.sources import UNIT_COUNTS, UNIT_RADIANCE, UNIT_TEMPERATURE, open_source
+from utils.config import COMPUTE_PRECISION, THUMBNAIL_COUNT, THUMBNAIL_WIDTH
+from utils.profiling import TRACER
+
+# Nomes exibidos no menu de unidades e rótulos curtos de cada unidade da fonte
+UNIT_NAMES = {
+    UNIT_COUNTS: "Counts (Raw)",
+    UNIT_RADIANCE: "Radiance (Factory)",
+    UNIT_TEMPERATURE: "Temperature (Factory)",
+}
+UNIT_LABELS = {UNIT_COUNTS: "Counts", UNIT_RADIANCE: "Rad", UNIT_TEMPERATURE: "°C"}
 
 class ThermalModel:
-    def __init__(self):
-        self.im = None
+    PREVIEW_STEP = 4 # Prévia do seek com 1 pixel a cada 4 em cada eixo (16x menos dados)
+
+    def __init__(self, prefetch_depth=8, prefetch_workers=2, cache_mb=256, precision=COMPUTE_PRECISION):
+        self.source = None
+        self.path = ""
         self.file_name = ""
         self.raw_data = None
         self.num_frames = 0
+        # Precisão dos frames em float (calibrados ou floats da fonte): float32 ou float64
+        self.precision = np.dtype(precision)
         # Instancia a classe de calibração do usuário
-        self.user_cal = UserCalibration()
+        self.user_cal = UserCalibration(self.precision)
         self.active_user_unit = None
 
-    def load_file(self, path):
-        self.file_name = os.path.splitext(os.path.basename(path))[0]
-        self.im = fnv.file.ImagerFile(path)
-        self.im.unit = fnv.Unit.COUNTS
-        self.num_frames = self.im.num_frames
-        self.active_user_unit = None
+        # Pré-decodificação em segundo plano para a reprodução sequencial
+        self.prefetch_depth = prefetch_depth
+        self.prefetch_workers = prefetch_workers
+        self.prefetcher = None
+        self.seeker = None # Seek assíncrono da barra de tempo
+        self.current_index = None
+        self.direction = 1
+
+        # Cache LRU dos frames já decodificados (0 MB desativa)
+        self.cache = FrameCache(cache_mb) if cache_mb > 0 else None
+        # Sem cache, frames já exibidos voltam para o pool e são reaproveitados pelas leituras seguintes
+        self.pool = FramePool()
+        self._frame_dtypes = {}  # Tipo do frame por contexto, aprendido na primeira leitura
+
+        # Estatísticas por frame da gravação inteira, por contexto (unidade + calibração)
+        self.stats_percentiles = (1, 99)
+        self._frame_stats = {}
+
+        # Miniaturas da gravação (barra de tempo, filmstrip e prévia do seek sem leitura reduzida)
+        self.thumbnails = None
+
+    def load_file(self, path, use_sidecar=True):
+        # Um cubo memmap atualizado ao lado da gravação dispensa o SDK por completo
+        if use_sidecar and frame_cube.has_fresh_cube(path):
+            source = frame_cube.CubeFrameSource(path)
+        else:
+            source = open_source(path)
+        self.load_source(source, path)
         return True
 
-    def get_frame_data(self, frame_index):
-        if not self.im: return None
-        self.im.get_frame(frame_index)
+    @property
+    def is_indexed(self):
+        return isinstance(self.source, frame_cube.CubeFrameSource)
+
+    def convert_to_cube(self, progress=None, cancel=None, units=None):
+        """
+        Modo indexar/converter: grava a gravação inteira num cubo memmap ao lado do arquivo
+        e reabre a partir dele. Usa uma instância própria da fonte, então pode rodar numa
+        thread enquanto a interface continua lendo frames. Só os counts são convertidos,
+        a não ser que `units` peça também as unidades de fábrica. Retorna False se cancelado.
+        """
+        if not self.source or not self.path: return False
+        if frame_cube.convert_to_cube(self.source.open_clone(), self.path, units=units,
+                                      progress=progress, cancel=cancel) is None:
+            return False
+        return True
+
+    def reopen_indexed(self):
+        """
+        Troca a fonte atual pelo cubo recém-gerado, mantendo a unidade selecionada se o
+        cubo a tiver (senão volta aos counts). Retorna True se a unidade foi mantida.
+        """
+        unit, user_unit, strip = self.source.unit, self.active_user_unit, self.thumbnails
+        self.load_source(frame_cube.CubeFrameSource(self.path), self.path)
+        self.thumbnails = strip # Mesma gravação: as miniaturas continuam valendo
+        if unit in self.source.supported_units:
+            self.source.set_unit(unit)
+            self.active_user_unit = user_unit
+            return True
+        return False
+
+    def load_source(self, source, path=""):
+        """Usa qualquer FrameSource (arquivo do SDK, NumPy/memmap ou sintética)."""
+        self.close()
+        self.path = path
+        self.file_name = os.path.splitext(os.path.basename(path))[0] if path else type(source).__name__
+        self.source = source
+        if UNIT_COUNTS in source.supported_units:
+            self.source.set_unit(UNIT_COUNTS)
+        self.num_frames = source.num_frames
+        self.raw_data = None
+        self.active_user_unit = None
+        self.current_index = None
+        self.direction = 1
+        self._frame_stats.clear()
+        self._frame_dtypes.clear()
+        self.pool.clear()
+        self.thumbnails = None
+        if self.cache is not None:
+            self.cache.clear()
+            self.cache.reset_stats()
+        if self.prefetch_depth > 0:
+            self._start_prefetcher()
+        self.seeker = SeekService(self._open_reader, self._open_previewer)
+
+    def close(self):
+        """Encerra as threads de pré-decodificação e de seek e libera a fonte atual."""
+        if self.prefetcher:
+            self.prefetcher.stop()
+            self.prefetcher = None
+        if self.seeker:
+            self.seeker.close()
+            self.seeker = None
+        if self.source:
+            self.source.close()
+            self.source = None
 
-        base_data = np.array(self.im.final, copy=False).reshape((self.im.height, self.im.width))
+    def set_prefetch_depth(self, depth):
+        """Define quantos frames à frente são decodificados (0 desativa)."""
+        self.prefetch_depth = max(0, int(depth))
+        if self.prefetcher:
+            self.prefetcher.set_depth(self.prefetch_depth)
+        elif self.source and self.prefetch_depth > 0:
+            self._start_prefetcher()
+
+    def set_cache_budget(self, budget_mb):
+        """Define o orçamento de memória do cache de frames em MB (0 desativa)."""
+        if budget_mb <= 0:
+            self.cache = None
+        elif self.cache is not None:
+            self.cache.set_budget(budget_mb)
+        else:
+            self.cache = FrameCache(budget_mb)
+
+    def set_precision(self, precision):
+        """
+        Troca a precisão dos frames em float (float32 ou float64). Ela faz parte do
+        contexto: o cache e a pré-decodificação nunca misturam frames das duas.
+        """
+        self.precision = np.dtype(precision)
+        self.user_cal.dtype = self.precision
+        if self.prefetcher:
+            self.prefetcher.invalidate()
+
+    @property
+    def cache_stats(self):
+        return self.cache.stats if self.cache is not None else {}
+
+    def _start_prefetcher(self):
+        self.prefetcher = FramePrefetcher(self._open_reader, self.num_frames,
+                                          self.prefetch_depth, self.prefetch_workers,
+                                          is_cached=self._is_cached, on_discard=self._recycle)
+
+    def _recycle(self, frame):
+        # Só sem cache: com ele, o frame pode estar guardado (e é somente-leitura)
+        if self.cache is None:
+            self.pool.release(frame)
+
+    def _is_cached(self, frame_index, context):
+        return self.cache is not None and ((frame_index,) + context) in self.cache
+
+    def get_frame_data(self, frame_index, decoded=None):
+        """
+        Frame `frame_index` na unidade/calibração ativas. `decoded` é o par (context, data)
+        entregue por request_frame: se o contexto ainda vale, o frame não é lido de novo.
+        """
+        if not self.source: return None
+        with TRACER.span("get_frame_data"):
+            return self._get_frame_data(frame_index, decoded)
+
+    def get_frame_into(self, frame_index, out, decoded=None):
+        """
+        Como get_frame_data, mas escreve o frame em `out`, um buffer do chamador
+        reaproveitado entre frames: na reprodução nada é alocado por frame. Retorna `out`,
+        ou um array novo quando `out` é None ou não serve (outro tamanho, unidade ou
+        calibração): guarde o retorno e passe-o de novo na próxima chamada.
+        """
+        if not self.source: return None
+        with TRACER.span("get_frame_data"):
+            return self._get_frame_data(frame_index, decoded, into=True, out=out)
+
+    def request_frame(self, frame_index, callback):
+        """
+        Seek assíncrono: decodifica `frame_index` na thread de seek e chama lá
+        callback(frame_index, context, data, is_preview), primeiro com uma prévia em
+        baixa resolução (se a fonte oferece) e depois com o frame completo. Pedidos
+        novos substituem os anteriores. Frames em cache são entregues na hora.
+        """
+        if not self.source: return
+        context = self._frame_context()
+        data = self.cache.get((frame_index,) + context) if self.cache is not None else None
+        if data is not None:
+            self.seeker.cancel()
+            callback(frame_index, context, data, False)
+        else:
+            self.seeker.request(frame_index, context, callback)
+
+    def _get_frame_data(self, frame_index, decoded=None, into=False, out=None):
+        context = self._frame_context()
+        direction = self._playback_direction(frame_index)
+        key = (frame_index,) + context
+        # `out` só serve com o tipo já visto neste contexto (dtype == None é True para float64: testa antes)
+        dtype = self._frame_dtypes.get(context)
+        if out is not None and (dtype is None or out.shape != self.source.shape or out.dtype != dtype):
+            out = None
+
+        if decoded is not None and decoded[0] == context and decoded[1] is not None:
+            data = decoded[1] # Já decodificado pela thread de seek
+        else:
+            data = self.cache.get(key) if self.cache is not None else None
+        if data is not None:
+            # Revisitar um frame custa só a busca no dicionário
+            if self.prefetcher:
+                self.prefetcher.advance(frame_index, context, direction)
+            if decoded is not None and self.cache is not None and key not in self.cache:
+                self.cache.put(key, data)
+        else:
+            if self.prefetcher:
+                with TRACER.span("prefetch_wait"):
+                    data = self.prefetcher.get(frame_index, context, direction)
+            if data is None:
+                # Frame fora do buffer (primeiro frame, seek ou unidade nova): decodifica aqui mesmo.
+                # Sem cache para guardar uma cópia, direto no buffer do chamador
+                data = self._read_frame(self.source, frame_index, context, out if self.cache is None else None)
+            if self.cache is not None:
+                self.cache.put(key, data)
+        self._frame_dtypes[context] = data.dtype
+
+        if into and data is not out:
+            if out is None:
+                out = np.empty(data.shape, dtype=data.dtype)
+            np.copyto(out, data)
+            self._recycle(data) # Já copiado: a próxima leitura reaproveita o buffer
+            data = out
+
+        self.raw_data = data
+        self.current_index = frame_index
+        return self.raw_data
+
+    def _frame_context(self):
+        """Identifica a unidade, a calibração e a precisão ativas (muda => frames pré-decodificados são inválidos)."""
+        coeffs = ()
         if self.active_user_unit == "User_Temp":
-            self.raw_data = self.user_cal.apply(base_data, self.user_cal.temp_coeffs)
+            coeffs = tuple(self.user_cal.temp_coeffs)
         elif self.active_user_unit == "User_Rad":
-            self.raw_data = self.user_cal.apply(base_data, self.user_cal.rad_coeffs)
+            coeffs = tuple(self.user_cal.rad_coeffs)
+        return (self.source.unit, self.active_user_unit, coeffs, self.precision.str)
+
+    def _playback_direction(self, frame_index):
+        # Passo de +1/-1 (com a volta do loop) define a direção; qualquer outro salto é um seek
+        if self.current_index is not None and self.num_frames > 0:
+            if frame_index == (self.current_index + 1) % self.num_frames:
+                self.direction = 1
+            elif frame_index == (self.current_index - 1) % self.num_frames:
+                self.direction = -1
+        return self.direction
+
+    def _read_frame(self, source, frame_index, context, out=None):
+        """Decodifica e calibra o frame; com `out` (tipo certo para o contexto), escreve nele."""
+        unit, user_unit, coeffs, precision = context
+        if source.unit != unit:
+            source.set_unit(unit)
+
+        with TRACER.span("decode"):
+            # Com calibração o frame cru só é lido: dispensa a cópia (o buffer do SDK serve)
+            base_data = source.read_frame_view(frame_index) if coeffs else source.read_frame(frame_index, out)
+        if coeffs:
+            with TRACER.span("calibration"):
+                return self.user_cal.apply(base_data, list(coeffs), out=out, dtype=precision)
+        if base_data.dtype.kind == "f" and base_data.dtype.itemsize > np.dtype(precision).itemsize:
+            base_data = base_data.astype(precision) # Float da fonte mais largo que a precisão escolhida
+        return base_data
+
+    def _open_reader(self):
+        # Cada thread de trabalho abre a própria instância da fonte (handle próprio do arquivo)
+        source = self.source.open_clone()
+        shape = self.source.shape
+
+        def read(frame_index, context):
+            # Sem cache, o frame sai de um buffer do pool (devolvido depois de exibido)
+            # (memmap sem calibração devolve uma view: copiar para o pool só custaria)
+            dtype = self._frame_dtypes.get(context)
+            pooled = self.cache is None and dtype is not None and (context[2] or not source.zero_copy)
+            out = self.pool.acquire(shape, dtype) if pooled else None
+            return self._read_frame(source, frame_index, context, out)
+        return read
+
+    def _read_preview(self, source, size, frame_index, context):
+        unit, user_unit, coeffs, precision = context
+        if source is not None:
+            if source.unit != unit:
+                source.set_unit(unit)
+            small = source.read_preview(frame_index, self.PREVIEW_STEP)
         else:
-            self.raw_data = base_data
+            # Sem leitura reduzida (SDK): a miniatura mais próxima serve de prévia, se for da mesma unidade
+            strip = self.thumbnails
+            small = strip.data[strip.nearest(frame_index)] if strip is not None and strip.unit == unit else None
+        if small is None: return None
+        if user_unit:
+            small = self.user_cal.apply(small, list(coeffs), dtype=precision)
+        # Volta ao tamanho do frame (vizinho mais próximo) para a exibição não mudar de escala
+        return cv2.resize(small, size, interpolation=cv2.INTER_NEAREST)
 
-        return self.raw_data
+    def _open_previewer(self):
+        source = self.source.open_clone() if self.source.has_preview else None
+        size = (self.source.width, self.source.height)
+        return lambda frame_index, context: self._read_preview(source, size, frame_index, context)
+
+    def compute_frame_stats(self, progress=None, cancel=None, workers=None):
+        """
+        Passada em blocos, por todos os núcleos, que resume cada frame da gravação na
+        unidade e calibração ativas (mesma leitura do get_frame_data): mínimo, máximo,
+        média, desvio padrão, posição do ponto quente e percentis. O resultado fica
+        guardado por (arquivo, unidade, calibração): chamadas seguintes devolvem a tabela
+        pronta. Retorna None se cancelado.
+        """
+        if not self.source: return None
+        source, context = self.source, self._frame_context()
+        table = self._frame_stats.get(context)
+        if table is None:
+            table = frame_stats.compute_frame_stats(self._open_reader, context, range(self.num_frames),
+                                                    self.stats_percentiles, workers=workers,
+                                                    progress=progress, cancel=cancel)
+            if table is not None and self.source is source: # Outro arquivo aberto no meio: não guarda
+                self._frame_stats[context] = table
+        return table
+
+    def export_frame_stats(self, file_path, progress=None, cancel=None):
+        """Grava em CSV o resumo por frame (calculado antes, se preciso), com o tempo de cada frame."""
+        table = self.compute_frame_stats(progress=progress, cancel=cancel)
+        if table is None: return None
+        frames = table["frame"]
+        times = self.source.frame_times()
+        columns = {"frame": frames,
+                   "time": np.asarray(times, dtype=np.float64)[frames] if times is not None else np.full(len(frames), np.nan)}
+        columns.update((key, values) for key, values in table.items() if key != "frame")
+        extraction.write_series_csv(file_path, columns)
+        return file_path
+
+    def load_thumbnails(self):
+        """Reaproveita as miniaturas salvas ao lado da gravação. Retorna o ThumbnailStrip ou None."""
+        if self.source and self.path and self.thumbnails is None:
+            self.thumbnails = thumbnails.load_thumbnails(self.path, self.num_frames)
+        return self.thumbnails
+
+    def build_thumbnails(self, count=THUMBNAIL_COUNT, width=THUMBNAIL_WIDTH, workers=None, progress=None, cancel=None):
+        """
+        Gera (em várias threads) uma miniatura de `width` pixels de largura a cada N frames,
+        com no máximo `count` na gravação, na unidade da fonte e sem calibração do usuário.
+        Salva ao lado da gravação quando possível. Retorna None se cancelado.
+        """
+        if not self.source: return None
+        source = self.source
+        step = thumbnails.thumbnail_step(self.num_frames, count)
+        shape = thumbnails.thumbnail_shape(source.height, source.width, width)
+        strip = thumbnails.build_thumbnails(self._open_reader, (source.unit, None, (), self.precision.str), range(0, self.num_frames, step),
+                                            shape, workers=workers, progress=progress, cancel=cancel)
+        if strip is None or self.source is not source: return None # Cancelado ou outro arquivo aberto
+        self.thumbnails = strip
+        if self.path:
+            try:
+                thumbnails.save_thumbnails(self.path, strip)
+            except OSError:
+                pass # Pasta sem permissão de escrita: as miniaturas valem só nesta sessão
+        return strip
+
+    def get_frame_stats(self):
+        """Tabela de estatísticas por frame do contexto atual, se a passada já terminou."""
+        if not self.source: return None
+        return self._frame_stats.get(self._frame_context())
+
+    def compute_histogram(self, start=0, stop=None, step=1, v_range=None, bins=256, workers=None,
+                          progress=None, cancel=None):
+        """
+        Histograma somado dos frames range(start, stop, step) na unidade ativa
+        (HistogramAccumulator). Sem `v_range`, usa a faixa global da gravação, calculada
+        pela passada de estatísticas (ou tirada do cache). Retorna None se cancelado.
+        """
+        if not self.source: return None
+        stop = self.num_frames if stop is None else min(stop, self.num_frames)
+        if v_range is None:
+            stats = self.compute_frame_stats(cancel=cancel, workers=workers)
+            if stats is None: return None
+            v_range = (float(np.nanmin(stats["min"])), float(np.nanmax(stats["max"])))
+        return histogram.accumulate_histogram(self._open_reader, self._frame_context(), range(start, stop, step),
+                                              v_range[0], v_range[1], bins, workers=workers,
+                                              progress=progress, cancel=cancel)
+
+    def extract_roi_series(self, rois, start=0, stop=None, step=1, workers=None, progress=None, cancel=None):
+        """
+        Séries temporais das estatísticas de cada ROI (RoiManager) nos frames
+        range(start, stop, step), na unidade e calibração ativas. Roda em várias
+        threads, cada uma com a própria instância da fonte. Retorna None se cancelado.
+        """
+        if not self.source: return None
+        stop = self.num_frames if stop is None else min(stop, self.num_frames)
+        return extraction.extract_roi_series(self._open_reader, self._frame_context(), rois,
+                                             range(start, stop, step), times=self.source.frame_times(),
+                                             workers=workers, progress=progress, cancel=cancel)
+
+    def extract_pixel_series(self, pixels, start=0, stop=None, step=1, workers=None, progress=None, cancel=None):
+        """
+        Série temporal dos pixels (x, y) de `pixels` nos frames range(start, stop, step),
+        na unidade e calibração ativas. Fontes em memmap (cubo indexado, .npy/.raw) leem
+        só esses pixels numa fatia com passo; as demais passam pela gravação em várias
+        threads. Retorna None se cancelado.
+        """
+        if not self.source: return None
+        stop = self.num_frames if stop is None else min(stop, self.num_frames)
+        context = self._frame_context()
+        unit, user_unit, coeffs, precision = context
+        times = self.source.frame_times()
+
+        # Instância própria: a troca de unidade na interface não afeta a leitura em andamento
+        source = self.source.open_clone()
+        try:
+            if source.unit != unit:
+                source.set_unit(unit)
+            xs = np.array([x for x, _ in pixels], dtype=np.intp)
+            ys = np.array([y for _, y in pixels], dtype=np.intp)
+            values = source.read_pixels(ys, xs, slice(start, stop, step))
+        finally:
+            source.close()
+
+        if values is None:
+            return extraction.extract_pixel_series(self._open_reader, context, pixels, range(start, stop, step),
+                                                   times=times, workers=workers, progress=progress, cancel=cancel)
+        if user_unit:
+            values = self.user_cal.apply(values, list(coeffs), dtype=precision)
+        if progress:
+            progress(1, 1)
+        return extraction.pixel_series_table(pixels, range(start, stop, step), values, times)
 
     def get_supported_units(self):
-        if not self.im: return []
-        unit_map = {
-            fnv.Unit.COUNTS: "Counts (Raw)",
-            fnv.Unit.RADIANCE_FACTORY: "Radiance (Factory)",
-            fnv.Unit.TEMPERATURE_FACTORY: "Temperature (Factory)",
-        }
-        
-        units = [unit_map[u] for u in self.im.supported_units if u in unit_map]
+        if not self.source: return []
+        units = [UNIT_NAMES[u] for u in self.source.supported_units if u in UNIT_NAMES]
         
         # Adiciona as opções de usuário caso os coeficientes tenham sido configurados
         if self.user_cal.has_temp_cal():
@@ -59,45 +461,96 @@ class ThermalModel:
 
     def set_unit(self, unit_name):
         self.active_user_unit = None
-        if not self.im: return
+        if not self.source: return
+        if self.prefetcher:
+            self.prefetcher.invalidate()
         if unit_name == "Counts (Raw)":
-            self.im.unit = fnv.Unit.COUNTS
+            self.source.set_unit(UNIT_COUNTS)
         elif unit_name == "Temperature (Factory)":
-            self.im.unit = fnv.Unit.TEMPERATURE_FACTORY
+            self.source.set_unit(UNIT_TEMPERATURE)
         elif unit_name == "Radiance (Factory)":
-            self.im.unit = fnv.Unit.RADIANCE_FACTORY
+            self.source.set_unit(UNIT_RADIANCE)
         elif unit_name == "Temperature (User)":
-            self.im.unit = fnv.Unit.COUNTS  # Força os Counts como base para a conta
+            self.source.set_unit(UNIT_COUNTS)  # Força os Counts como base para a conta
             self.active_user_unit = "User_Temp"
         elif unit_name == "Radiance (User)":
-            self.im.unit = fnv.Unit.COUNTS
+            self.source.set_unit(UNIT_COUNTS)
             self.active_user_unit = "User_Rad"
 
     def get_source_info(self):
-        if not self.im: return None
-        return self.im.source_info
+        if not self.source: return None
+        return self.source.source_info
 
     def get_object_parameters_df(self):
-        if not self.im: return pd.DataFrame()
-        
-        obj_params = self.im.object_parameters
-        propriedades = [x for x in dir(obj_params) if not x.startswith("__")]
-        
-        valores, props_validas = [], []
-        for x in propriedades:
-            val = getattr(obj_params, x)
-            if isinstance(val, (int, float, str)) and not callable(val):
-                valores.append(val)
-                props_validas.append(x)
-                
-        df = pd.DataFrame({"Propriedade": props_validas, "Valor": valores})
+        import pandas as pd # Só aqui: importar o pandas na inicialização custa ~0.4 s
+        if not self.source: return pd.DataFrame()
+
+        params = self.source.metadata
+        df = pd.DataFrame({"Propriedade": list(params.keys()), "Valor": list(params.values())})
         df['Propriedade'] = df['Propriedade'].str.replace('_', ' ', regex=False).str.title()
         df['Valor'] = df['Valor'].apply(lambda x: f"{x:.4f}" if isinstance(x, float) else x)
         return df
 
     def export_csv(self, file_path):
         if self.raw_data is not None:
-            pd.DataFrame(self.raw_data).to_csv(file_path, index=False, header=False)
+            export.write_frame_csv(file_path, self.raw_data)
+
+    def export_frames(self, file_path, start=0, stop=None, step=1, fmt=None, progress=None, cancel=None):
+        """
+        Exporta os frames range(start, stop, step) na unidade e calibração ativas para
+        .npy/.npz/.raw (+ .json)/.h5/.parquet, em blocos e sem carregar a gravação.
+        Retorna None se cancelado.
+        """
+        if not self.source: return None
+        stop = self.num_frames if stop is None else min(stop, self.num_frames)
+        frames = range(start, stop, step)
+        context = self._frame_context()
+        unit, user_unit, coeffs, _ = context
+        # Unidades do usuário são gravadas como a unidade física correspondente (+ os coeficientes)
+        if user_unit == "User_Temp":
+            unit = UNIT_TEMPERATURE
+        elif user_unit == "User_Rad":
+            unit = UNIT_RADIANCE
+        header = {"source": self.file_name, "unit": unit, "calibration": list(coeffs)}
+        times = self.source.frame_times()
+        if times is not None:
+            header["times"] = [float(times[i]) for i in frames]
+        return export.export_frames(self._open_reader, context, frames, file_path, fmt, header,
+                                    progress=progress, cancel=cancel)
+
+    def export_video(self, file_path, colormap, start=0, stop=None, step=1, v_range=None, fps=None,
+                     colorbar=False, rois=None, roi_colors=None, progress=None, cancel=None):
+        """
+        Renderiza os frames range(start, stop, step) num vídeo MP4/AVI com a paleta
+        `colormap`, limites fixos `v_range` (ou automáticos por frame) e, opcionalmente,
+        barra de cores e contornos dos ROIs. Sem `fps`, usa a taxa real da gravação
+        (dividida pelo passo), ou 30. Retorna None se cancelado.
+        """
+        if not self.source: return None
+        stop = self.num_frames if stop is None else min(stop, self.num_frames)
+        if fps is None:
+            fps = (self.frame_rate or 30.0) / step
+        return video_export.export_video(self._open_reader, self._frame_context(), range(start, stop, step),
+                                         file_path, colormap, v_range, fps, colorbar, rois, roi_colors,
+                                         progress=progress, cancel=cancel)
+
+    def load_frame_times(self, progress=None, cancel=None):
+        """
+        Lê os tempos dos frames que a fonte não informou na abertura (pode rodar numa
+        thread). Retorna os tempos, ou None se cancelado ou se outro arquivo foi aberto.
+        """
+        source = self.source
+        if source is None: return None
+        times = source.scan_frame_times(progress, cancel)
+        return times if self.source is source else None
+
+    @property
+    def frame_rate(self):
+        """Taxa de frames da gravação pelos tempos dos frames, ou None se a fonte não os informa."""
+        times = self.source.frame_times() if self.source else None
+        if times is None or len(times) < 2: return None
+        dt = float(np.median(np.diff(times)))
+        return 1.0 / dt if dt > 0 else None
 
     def get_value_at(self, x, y):
         """Retorna o valor térmico exato na coordenada x, y da imagem atual"""
@@ -118,10 +571,5 @@ class ThermalModel:
             return "°C (User)"
         if self.active_user_unit == "User_Rad":
             return "Rad (User)"
-        if not self.im: return ""
-        unit_map = {
-            fnv.Unit.COUNTS: "Counts",
-            fnv.Unit.RADIANCE_FACTORY: "Rad",
-            fnv.Unit.TEMPERATURE_FACTORY: "°C"
-        }
-        return unit_map.get(self.im.unit, "")
\ No newline at end of file
+        if not self.source: return ""
+        return UNIT_LABELS.get(self.source.unit, "")
\ No newline at end of file
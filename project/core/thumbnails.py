@@ -0,0 +1,111 @@
+import os
+import threading
+
+import cv2
+import numpy as np
+
+from core.parallel import run_chunks
+
+# Versão do arquivo de miniaturas: se mudar, caches antigos são refeitos
+THUMBNAILS_VERSION = 1
+
+
+def thumbnails_path(path):
+    return path + ".thumbs.npz"
+
+
+def thumbnail_step(num_frames, count):
+    """Passo entre miniaturas para ter no máximo `count` na gravação."""
+    return max(1, -(-num_frames // max(count, 1)))
+
+
+def thumbnail_shape(height, width, thumb_width):
+    thumb_width = min(thumb_width, width)
+    return max(1, round(height * thumb_width / width)), thumb_width
+
+
+class ThumbnailStrip:
+    """
+    Miniaturas de um a cada `step` frames: valores reduzidos (não cores), na unidade
+    `unit` da fonte e sem calibração do usuário, para serem coloridos com a paleta e
+    a faixa do momento.
+    """
+
+    def __init__(self, frames, data, unit):
+        self.frames = np.asarray(frames, dtype=np.int64)
+        self.data = data  # (miniaturas, h, w)
+        self.unit = unit
+
+    def __len__(self):
+        return len(self.frames)
+
+    def nearest(self, frame_index):
+        """Posição da miniatura mais próxima de `frame_index`."""
+        pos = int(np.searchsorted(self.frames, frame_index))
+        if pos == len(self.frames) or (pos > 0 and frame_index - self.frames[pos - 1] < self.frames[pos] - frame_index):
+            pos -= 1
+        return pos
+
+
+def build_thumbnails(reader_factory, context, frames, shape, workers=None, chunk_size=8,
+                     progress=None, cancel=None):
+    """
+    Reduz os frames `frames` ao tamanho `shape` (h, w) com média por área, em várias
+    threads (reader_factory segue o contrato do FramePrefetcher). Retorna um
+    ThumbnailStrip, ou None se `cancel` for acionado.
+    """
+    frames = np.asarray(frames, dtype=np.int64)
+    total = len(frames)
+    data = None
+    lock = threading.Lock()
+    local = threading.local()
+
+    def run_chunk(lo, hi):
+        nonlocal data
+        if not hasattr(local, "read"):
+            local.read = reader_factory()
+        for i in range(lo, hi):
+            if cancel is not None and cancel.is_set():
+                return 0
+            frame = local.read(int(frames[i]), context)
+            with lock:
+                if data is None:
+                    # O tipo sai do primeiro frame lido: counts continuam uint16 (arquivo menor)
+                    data = np.zeros((total,) + tuple(shape), dtype=frame.dtype)
+            cv2.resize(frame, (shape[1], shape[0]), dst=data[i], interpolation=cv2.INTER_AREA)
+        return hi - lo
+
+    # Poucas threads: a montagem divide a CPU com a reprodução
+    workers = workers or min(2, os.cpu_count() or 1)
+    if not run_chunks(run_chunk, total, workers, chunk_size, progress, cancel, "thumbnails"):
+        return None
+    if data is None:
+        data = np.zeros((0,) + tuple(shape), dtype=np.float32)
+    return ThumbnailStrip(frames, data, context[0])
+
+
+def _source_signature(path):
+    st = os.stat(path)
+    return np.array([st.st_size, st.st_mtime], dtype=np.float64)
+
+
+def save_thumbnails(path, strip):
+    """Grava as miniaturas ao lado da gravação (npz comprimido, alguns MB)."""
+    tmp = thumbnails_path(path) + ".tmp.npz"
+    np.savez_compressed(tmp, version=THUMBNAILS_VERSION, signature=_source_signature(path),
+                        frames=strip.frames, data=strip.data, unit=strip.unit)
+    os.replace(tmp, thumbnails_path(path))
+
+
+def load_thumbnails(path, num_frames):
+    """Miniaturas salvas de `path`, ou None se não existem ou a gravação mudou desde então."""
+    try:
+        with np.load(thumbnails_path(path)) as f:
+            if int(f["version"]) != THUMBNAILS_VERSION or not np.array_equal(f["signature"], _source_signature(path)):
+                return None
+            frames = f["frames"]
+            if len(frames) and frames[-1] >= num_frames:
+                return None
+            return ThumbnailStrip(frames, f["data"], str(f["unit"]))
+    except (OSError, KeyError, ValueError):
+        return None
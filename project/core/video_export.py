@@ -0,0 +1,222 @@
+import os
+import queue
+import threading
+
+import cv2
+import numpy as np
+
+from core.colorize import Colorizer, packed_to_bgr
+
+# Formato -> (extensão, FourCC do cv2.VideoWriter)
+VIDEO_FORMATS = {
+    "mp4": (".mp4", "mp4v"),
+    "avi": (".avi", "MJPG"),
+}
+
+COLORBAR_WIDTH = 70 # Faixa à direita do vídeo com a barra de cores e os limites
+ROI_COLOR = (0, 255, 0) # BGR
+
+
+class _Stop(Exception):
+    """Encerra os estágios quando outro estágio falhou ou a exportação foi cancelada."""
+
+
+def export_video(reader_factory, context, frames, path, colormap, v_range=None, fps=30.0,
+                 colorbar=False, rois=None, roi_colors=None, queue_size=8, progress=None, cancel=None):
+    """
+    Renderiza os frames `frames` num vídeo (MP4/AVI pela extensão de `path`).
+
+    Três estágios em threads ligadas por filas limitadas: decodificação (reader_factory,
+    mesmo contrato do FramePrefetcher) -> colorização (paleta `colormap`, limites fixos
+    `v_range` ou automáticos por frame, barra de cores e contornos dos ROIs) -> codificação
+    (cv2.VideoWriter). Cada estágio trabalha em paralelo com os outros, e as imagens BGR
+    circulam por um conjunto fixo de buffers reaproveitados.
+
+    `rois` é um RoiManager opcional e `roi_colors` um dict nome -> (B, G, R).
+    Retorna `path`, ou None se `cancel` for acionado (o arquivo parcial é apagado).
+    """
+    ext = os.path.splitext(path)[1].lower()
+    fourcc = next((cc for e, cc in VIDEO_FORMATS.values() if e == ext), None)
+    if fourcc is None:
+        raise ValueError(f"Extensão de vídeo não suportada: {path}")
+    frames = list(frames)
+    if not frames:
+        raise ValueError("Nenhum frame no intervalo de exportação.")
+
+    decoded = queue.Queue(maxsize=queue_size)
+    rendered = queue.Queue(maxsize=queue_size)
+    free = queue.Queue() # Buffers BGR livres para o estágio de colorização
+    stop = threading.Event()
+    errors = []
+
+    def put(q, item):
+        # put com espera, mas que desiste se outro estágio parou
+        while True:
+            if stop.is_set(): raise _Stop()
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def get(q):
+        while True:
+            if stop.is_set(): raise _Stop()
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+    def stage(fn):
+        def run():
+            try:
+                fn()
+            except _Stop:
+                pass
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+    def decode():
+        read = reader_factory()
+        for frame_index in frames:
+            put(decoded, read(frame_index, context))
+        put(decoded, None)
+
+    renderer = _FrameRenderer(colormap, v_range, colorbar, rois, roi_colors)
+
+    def colorize():
+        while True:
+            data = get(decoded)
+            if data is None: break
+            if renderer.canvas_shape is None:
+                renderer.setup(data.shape)
+                for _ in range(queue_size + 2):
+                    free.put(np.empty(renderer.canvas_shape, dtype=np.uint8))
+            canvas = get(free)
+            renderer.render(data, canvas)
+            put(rendered, canvas)
+        put(rendered, None)
+
+    threads = [stage(decode), stage(colorize)]
+    writer = None
+    tmp = path + ".part" + ext # O VideoWriter escolhe o contêiner pela extensão
+    done = 0
+    try:
+        while True:
+            if cancel is not None and cancel.is_set():
+                stop.set()
+                break
+            try:
+                canvas = get(rendered)
+            except _Stop:
+                break
+            if canvas is None: break
+            if writer is None:
+                h, w = canvas.shape[:2]
+                writer = cv2.VideoWriter(tmp, cv2.VideoWriter_fourcc(*fourcc), float(fps), (w, h))
+                if not writer.isOpened():
+                    raise RuntimeError(f"Não foi possível criar o vídeo {path} (codec {fourcc}).")
+            writer.write(canvas)
+            free.put(canvas)
+            done += 1
+            if progress:
+                progress(done, len(frames))
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        for thread in threads:
+            thread.join()
+        if writer is not None:
+            writer.release()
+
+    if errors:
+        _remove(tmp)
+        raise errors[0]
+    if stop.is_set():
+        _remove(tmp)
+        return None
+    os.replace(tmp, path)
+    return path
+
+
+def _remove(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+class _FrameRenderer:
+    """Colore um frame e desenha barra de cores e ROIs direto no buffer BGR de saída."""
+
+    def __init__(self, colormap, v_range, colorbar, rois, roi_colors):
+        self.colorizer = Colorizer()
+        self.colorizer.set_palette(colormap)
+        self.v_range = v_range
+        self.colorbar = colorbar
+        self.rois = list(rois.rois.values()) if rois is not None else []
+        self.roi_colors = roi_colors or {}
+        self.canvas_shape = None
+        self.packed = None
+        self.bgr = None
+        self.bar = None
+
+    def setup(self, shape):
+        h, w = shape
+        width = w + (COLORBAR_WIDTH if self.colorbar else 0)
+        self.canvas_shape = (h, width, 3)
+        self.packed = np.empty((h, w), dtype=np.uint32)
+        if self.colorbar:
+            self.bgr = np.empty((h, w, 3), dtype=np.uint8)
+            # Gradiente vertical (máximo em cima) desenhado uma vez
+            lut = self.colorizer.palettes[self.colorizer.colormap][::-1, ::-1] # RGB -> BGR
+            rows = np.linspace(0, len(lut) - 1, max(h - 40, 1)).astype(np.intp)
+            self.bar = np.repeat(lut[rows][:, np.newaxis, :], 20, axis=1)
+
+    def render(self, data, canvas):
+        h, w = data.shape
+        if self.v_range is not None:
+            v_min, v_max = self.v_range
+        else:
+            v_min, v_max = float(np.min(data)), float(np.max(data))
+        self.colorizer.colorize(data, v_min, v_max, out=self.packed)
+        if self.colorbar:
+            # A área do frame dentro do canvas não é contígua: o cvtColor grava num buffer à parte
+            canvas[:, :w] = packed_to_bgr(self.packed, out=self.bgr)
+        else:
+            packed_to_bgr(self.packed, out=canvas)
+
+        for roi in self.rois:
+            self._draw_roi(canvas, roi)
+        if self.colorbar:
+            self._draw_colorbar(canvas, w, v_min, v_max)
+
+    def _draw_roi(self, canvas, roi):
+        color = self.roi_colors.get(roi.name, ROI_COLOR)
+        if roi.kind == "Polygon":
+            pts = np.round(np.asarray(roi.geometry)).astype(np.int32)
+            cv2.polylines(canvas, [pts], True, color, 1, cv2.LINE_AA)
+            anchor = pts.min(axis=0)
+        else:
+            x1, y1, x2, y2 = (int(round(v)) for v in roi.geometry)
+            if roi.kind == "Circle":
+                center = ((x1 + x2) // 2, (y1 + y2) // 2)
+                cv2.ellipse(canvas, center, ((x2 - x1) // 2, (y2 - y1) // 2), 0, 0, 360, color, 1, cv2.LINE_AA)
+            else:
+                cv2.rectangle(canvas, (x1, y1), (x2, y2), color, 1)
+            anchor = (x1, y1)
+        cv2.putText(canvas, roi.name, (int(anchor[0]), max(int(anchor[1]) - 4, 10)),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1, cv2.LINE_AA)
+
+    def _draw_colorbar(self, canvas, x0, v_min, v_max):
+        strip = canvas[:, x0:]
+        strip[:] = 0
+        top = 20
+        strip[top:top + len(self.bar), 8:28] = self.bar
+        # Limites atuais acima e abaixo da barra (mudam a cada frame na escala automática)
+        cv2.putText(strip, f"{v_max:.1f}", (2, 13), cv2.FONT_HERSHEY_SIMPLEX, 0.35, (255, 255, 255), 1, cv2.LINE_AA)
+        cv2.putText(strip, f"{v_min:.1f}", (2, top + len(self.bar) + 13), cv2.FONT_HERSHEY_SIMPLEX, 0.35,
+                    (255, 255, 255), 1, cv2.LINE_AA)
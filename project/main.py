@@ -1,8 +1,17 @@
 import ctypes
 import sys
+from utils.profiling import StartupTimer, TRACER
+
+startup = StartupTimer(TRACER) # Antes dos imports pesados (PySide6, OpenCV, núcleo)
+
+from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QApplication
 from ui import MainWindow
+from ui.main_window import get_icon
 from utils import MODERN_DARK_THEME
+from utils.config import STARTUP_REPORT
+
+startup.mark("imports")
 
 
 myappid = 'thermalviewer.v0' 
@@ -11,11 +20,26 @@ try:
 except Exception as e:
     print(f"Erro ao configurar ID do Windows: {e}")
 
+
+def report_startup(app):
+    # Chamado na primeira volta do loop de eventos, depois do primeiro desenho da janela
+    startup.mark("first_paint")
+    print(startup.report(), file=sys.stderr)
+    if STARTUP_REPORT == "quit":
+        app.quit()
+
     
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
     app.setStyleSheet(MODERN_DARK_THEME)
+    # Os ícones em cache precisam ser destruídos antes do QApplication
+    app.aboutToQuit.connect(get_icon.cache_clear)
+    startup.mark("qapplication")
     window = MainWindow()
+    startup.mark("main_window")
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    startup.mark("show")
+    if STARTUP_REPORT != "0":
+        QTimer.singleShot(0, lambda: report_startup(app))
+    sys.exit(app.exec())
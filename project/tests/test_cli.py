@@ -0,0 +1,26 @@
+import os
+
+import numpy as np
+
+import cli
+
+
+def test_same_named_inputs_get_distinct_outputs(tmp_path):
+    cube = np.arange(4 * 8 * 10, dtype=np.uint16).reshape(4, 8, 10)
+    for folder, offset in (("a", 0), ("b", 1000)):
+        os.makedirs(tmp_path / folder)
+        np.save(tmp_path / folder / "rec.npy", cube + offset)
+    out = tmp_path / "out"
+
+    code = cli.main([str(tmp_path / "*" / "rec.npy"), "--out", str(out), "--workers", "2",
+                     "--export", "npz", "--roi", "Rect:0,0,5,5", "--roi-series"])
+
+    assert code == 0
+    assert sorted(os.listdir(out)) == ["a_rec_frames.npz", "a_rec_roi_series.csv",
+                                       "b_rec_frames.npz", "b_rec_roi_series.csv"]
+    assert (out / "a_rec_roi_series.csv").read_text() != (out / "b_rec_roi_series.csv").read_text()
+
+
+def test_output_names_keep_plain_name_when_unique():
+    names = cli.output_names([os.path.join("a", "rec.ats"), os.path.join("b", "other.ats")])
+    assert sorted(names.values()) == ["other", "rec"]
@@ -0,0 +1,23 @@
+import numpy as np
+
+from core.export import write_frame_csv
+
+
+def test_float64_frame_round_trips_exactly(tmp_path):
+    rng = np.random.default_rng(0)
+    frame = rng.normal(300.0, 25.0, size=(12, 16))
+    frame[0, :3] = [0.1, 1 / 3, np.nextafter(300.0, 301.0)]
+    path = tmp_path / "frame.csv"
+
+    write_frame_csv(path, frame)
+
+    np.testing.assert_array_equal(np.loadtxt(path, delimiter=","), frame)
+
+
+def test_float32_frame_round_trips_exactly(tmp_path):
+    frame = (np.random.default_rng(1).random((8, 8)) * 400).astype(np.float32)
+    path = tmp_path / "frame.csv"
+
+    write_frame_csv(path, frame)
+
+    np.testing.assert_array_equal(np.loadtxt(path, delimiter=",", dtype=np.float32), frame)
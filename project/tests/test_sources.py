@@ -0,0 +1,72 @@
+import datetime
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from core import sources
+from core.sources import FnvFrameSource, UNIT_COUNTS
+
+
+class FakeImagerFile:
+    """Imita o ImagerFile do SDK: frames 2 x 3 e tempo em frame_info.time."""
+
+    decoded = [] # Índices passados a get_frame, em todas as instâncias
+
+    def __init__(self, path, start, period, frame_rate=None, num_frames=4):
+        self.num_frames, self.width, self.height = num_frames, 3, 2
+        self.supported_units = ("COUNTS",)
+        self.unit = None
+        if frame_rate is not None:
+            self.frame_rate = frame_rate
+        self._start, self._period = start, period
+        self.final = np.zeros(6, dtype=np.uint16)
+        self.frame_info = None
+
+    def get_frame(self, index):
+        FakeImagerFile.decoded.append(index)
+        self.final[:] = index
+        self.frame_info = SimpleNamespace(time=self._start + datetime.timedelta(seconds=index * self._period))
+
+
+@pytest.fixture
+def fake_fnv(monkeypatch):
+    def install(**kwargs):
+        fnv = SimpleNamespace(
+            Unit=SimpleNamespace(COUNTS="COUNTS", RADIANCE_FACTORY="RADIANCE", TEMPERATURE_FACTORY="TEMPERATURE"),
+            file=SimpleNamespace(ImagerFile=lambda path: FakeImagerFile(path, **kwargs)))
+        monkeypatch.setattr(sources, "_fnv", fnv)
+        monkeypatch.setattr(FakeImagerFile, "decoded", [])
+    return install
+
+
+def test_fnv_open_does_not_decode_frames(fake_fnv):
+    fake_fnv(start=datetime.datetime(2024, 5, 1), period=0.02, num_frames=10000)
+    source = FnvFrameSource("rec.ats")
+    source.open_clone()
+
+    assert FakeImagerFile.decoded == []
+    assert source.frame_times() is None # Reprodução fica na taxa padrão até a leitura dos tempos
+
+
+def test_fnv_frame_times_scanned_from_frame_info(fake_fnv):
+    fake_fnv(start=datetime.datetime(2024, 5, 1, 12, 0, 0), period=0.02)
+    source = FnvFrameSource("rec.ats")
+    progress = []
+
+    times = source.scan_frame_times(progress=lambda done, total: progress.append((done, total)))
+
+    assert times is source.frame_times()
+    assert progress[-1] == (4, 4)
+    # Timestamps absolutos em float64: resolução de ~0,1 µs
+    np.testing.assert_allclose(source.frame_times(), [0.0, 0.02, 0.04, 0.06], atol=1e-6)
+    assert source.supported_units == (UNIT_COUNTS,)
+    assert source.open_clone().frame_times() is source.frame_times()
+
+
+def test_fnv_frame_times_from_frame_rate(fake_fnv):
+    fake_fnv(start=datetime.datetime(2024, 5, 1), period=1.0, frame_rate=50.0)
+    source = FnvFrameSource("rec.ats")
+
+    np.testing.assert_allclose(source.frame_times(), [0.0, 0.02, 0.04, 0.06])
+    assert FakeImagerFile.decoded == []
@@ -1,7 +1,15 @@
+import numpy as np
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QFormLayout, QLabel, 
                                QLineEdit, QCheckBox, QWidget, QPushButton, 
-                               QHBoxLayout, QMessageBox) 
+                               QHBoxLayout, QMessageBox, QComboBox, QFileDialog, QSpinBox) 
 from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor
+
+from core.export import EXPORT_FORMATS, available_formats
+from core.extraction import series_column, write_series_csv
+from core.histogram import write_histogram_csv
+from core.video_export import VIDEO_FORMATS
+from ui.plots import SeriesPlot
 
 class ParamsDialog(QDialog):
     def __init__(self, model, parent=None):
@@ -137,4 +145,166 @@ class CalibrationDialog(QDialog):
             self.accept() # Fecha a janela com sucesso
             
         except ValueError:
-            QMessageBox.warning(self, "Error", "Invalid format. Please use numbers separated by commas.")
\ No newline at end of file
+            QMessageBox.warning(self, "Error", "Invalid format. Please use numbers separated by commas.")
+
+
+class SeriesDialog(QDialog):
+    """Mostra as séries temporais extraídas dos ROIs e exporta a tabela em CSV."""
+    def __init__(self, table, roi_colors, unit_label="", file_name="series", parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("ROI Time Series")
+        self.resize(800, 450)
+        self.setStyleSheet("background-color: #0a0a0a; color: #cccccc;")
+        self.table = table
+        self.roi_colors = roi_colors # Nome do ROI -> QColor (mesma cor do desenho)
+        self.unit_label = unit_label
+        self.file_name = file_name
+
+        layout = QVBoxLayout(self)
+        top_layout = QHBoxLayout()
+        top_layout.addWidget(QLabel("Statistic:"))
+        self.cmb_stat = QComboBox()
+        stats = list(dict.fromkeys(key.rsplit(":", 1)[1] for key in table if ":" in key))
+        self.cmb_stat.addItems(stats)
+        if "mean" in stats: self.cmb_stat.setCurrentText("mean")
+        self.cmb_stat.currentTextChanged.connect(self.update_plot)
+        top_layout.addWidget(self.cmb_stat)
+        top_layout.addStretch()
+
+        btn_export = QPushButton("Export CSV")
+        btn_export.setStyleSheet("background-color: #0e639c; color: white; padding: 5px 15px; border-radius: 3px;")
+        btn_export.clicked.connect(self.export_csv)
+        top_layout.addWidget(btn_export)
+        layout.addLayout(top_layout)
+
+        self.plot = SeriesPlot()
+        layout.addWidget(self.plot, stretch=1)
+        self.update_plot()
+
+    def update_plot(self):
+        stat = self.cmb_stat.currentText()
+        # Usa o tempo dos frames quando a gravação tem, senão o índice do frame
+        if np.isfinite(self.table["time"]).all():
+            x, x_label = self.table["time"], "Time (s)"
+        else:
+            x, x_label = self.table["frame"], "Frame"
+        series = [(f"{name} {stat} {self.unit_label}".strip(), self.table[series_column(name, stat)], color)
+                  for name, color in self.roi_colors.items()]
+        self.plot.set_data(x, series, x_label)
+
+    def export_csv(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Salvar CSV", f"{self.file_name}_roi_series.csv", "CSV (*.csv)")
+        if path:
+            write_series_csv(path, self.table)
+            QMessageBox.information(self, "Sucesso", "CSV Exportado com sucesso!")
+
+
+class HistogramDialog(QDialog):
+    """Mostra o histograma acumulado de um intervalo de frames e exporta em CSV."""
+    def __init__(self, acc, unit_label="", file_name="histogram", parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Recording Histogram ({acc.frames} frames)")
+        self.resize(800, 450)
+        self.setStyleSheet("background-color: #0a0a0a; color: #cccccc;")
+        self.acc = acc
+        self.file_name = file_name
+
+        layout = QVBoxLayout(self)
+        top_layout = QHBoxLayout()
+        self.chk_log = QCheckBox("Log scale")
+        self.chk_log.setChecked(True)
+        self.chk_log.toggled.connect(self.update_plot)
+        top_layout.addWidget(self.chk_log)
+        top_layout.addStretch()
+
+        btn_export = QPushButton("Export CSV")
+        btn_export.setStyleSheet("background-color: #0e639c; color: white; padding: 5px 15px; border-radius: 3px;")
+        btn_export.clicked.connect(self.export_csv)
+        top_layout.addWidget(btn_export)
+        layout.addLayout(top_layout)
+
+        self.plot = SeriesPlot()
+        layout.addWidget(self.plot, stretch=1)
+        self.x_label = unit_label
+        self.update_plot()
+
+    def update_plot(self):
+        edges = self.acc.edges
+        centers = (edges[:-1] + edges[1:]) / 2
+        counts = self.acc.counts.astype(np.float64)
+        if self.chk_log.isChecked():
+            name, y = "log10(pixels + 1)", np.log10(counts + 1)
+        else:
+            name, y = "pixels", counts
+        self.plot.set_data(centers, [(name, y, QColor("#e0a030"))], self.x_label)
+
+    def export_csv(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Salvar CSV", f"{self.file_name}_histogram.csv", "CSV (*.csv)")
+        if path:
+            write_histogram_csv(path, self.acc)
+            QMessageBox.information(self, "Sucesso", "CSV Exportado com sucesso!")
+
+
+class ExportRangeDialog(QDialog):
+    """
+    Escolhe o intervalo de frames e o formato da exportação de vários frames.
+    Com video=True oferece MP4/AVI e as opções de escala, barra de cores e ROIs.
+    """
+    def __init__(self, num_frames, current_frame=0, video=False, parent=None):
+        super().__init__(parent)
+        self.video = video
+        self.setWindowTitle("Export Video" if video else "Export Frames")
+        self.setFixedSize(320, 300 if video else 220)
+        self.setStyleSheet("background-color: #0a0a0a; color: #cccccc;")
+
+        layout = QVBoxLayout(self)
+        form_layout = QFormLayout()
+
+        self.spn_start = QSpinBox(); self.spn_start.setRange(0, max(num_frames - 1, 0))
+        self.spn_stop = QSpinBox(); self.spn_stop.setRange(1, max(num_frames, 1)); self.spn_stop.setValue(num_frames)
+        self.spn_step = QSpinBox(); self.spn_step.setRange(1, max(num_frames, 1))
+        form_layout.addRow(QLabel("First frame:"), self.spn_start)
+        form_layout.addRow(QLabel("Last frame (exclusive):"), self.spn_stop)
+        form_layout.addRow(QLabel("Step:"), self.spn_step)
+
+        # Só os formatos cujas bibliotecas estão instaladas (HDF5/Parquet são opcionais)
+        self.cmb_format = QComboBox()
+        for fmt in (VIDEO_FORMATS if video else available_formats()):
+            self.cmb_format.addItem(fmt.upper(), fmt)
+        form_layout.addRow(QLabel("Format:"), self.cmb_format)
+
+        if video:
+            self.chk_fixed_scale = QCheckBox("Fixed scale (current limits)")
+            self.chk_colorbar = QCheckBox("Colorbar")
+            self.chk_colorbar.setChecked(True)
+            self.chk_rois = QCheckBox("ROI overlay")
+            self.chk_rois.setChecked(True)
+            for chk in (self.chk_fixed_scale, self.chk_colorbar, self.chk_rois):
+                form_layout.addRow(chk)
+        layout.addLayout(form_layout)
+
+        btn_layout = QHBoxLayout()
+        btn_ok = QPushButton("Export")
+        btn_ok.setStyleSheet("background-color: #0e639c; color: white; padding: 5px 15px; border-radius: 3px;")
+        btn_ok.clicked.connect(self.accept)
+        btn_cancel = QPushButton("Cancel")
+        btn_cancel.setStyleSheet("background-color: #333333; color: white; padding: 5px 15px; border-radius: 3px;")
+        btn_cancel.clicked.connect(self.reject)
+        btn_layout.addStretch()
+        btn_layout.addWidget(btn_cancel)
+        btn_layout.addWidget(btn_ok)
+        layout.addLayout(btn_layout)
+
+    @property
+    def frame_range(self):
+        return self.spn_start.value(), self.spn_stop.value(), self.spn_step.value()
+
+    @property
+    def format(self):
+        return self.cmb_format.currentData()
+
+    @property
+    def extension(self):
+        if self.video:
+            return VIDEO_FORMATS[self.format][0]
+        return next(ext for ext, fmt in EXPORT_FORMATS.items() if fmt == self.format)
@@ -0,0 +1,39 @@
+import threading
+import time
+from PySide6.QtCore import QThread, Signal
+
+
+class BackgroundJob(QThread):
+    """
+    Executa fn(progress, cancel) fora da thread da interface.
+
+    progress(done, total) é repassado pelo sinal `progress` (limitado a ~20 emissões
+    por segundo para não inundar o event loop); `cancel` é um threading.Event que a
+    função deve consultar. O retorno da função sai no sinal `succeeded`.
+    """
+    progress = Signal(int, int)
+    succeeded = Signal(object)
+    failed = Signal(str)
+
+    def __init__(self, fn, parent=None):
+        super().__init__(parent)
+        self.fn = fn
+        self.cancel_event = threading.Event()
+        self._last_report = 0.0
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            result = self.fn(self._report, self.cancel_event)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.succeeded.emit(result)
+
+    def _report(self, done, total):
+        now = time.perf_counter()
+        if done >= total or now - self._last_report > 0.05:
+            self._last_report = now
+            self.progress.emit(int(done), int(total))
@@ -1,16 +1,47 @@
 import os
-import cv2
+import copy
+import functools
+import threading
+import time
 import numpy as np
-from PySide6.QtWidgets import (QGroupBox, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                               QPushButton, QFileDialog, QLabel, QSlider, QMessageBox, QButtonGroup, QMenu, QLineEdit)
-from PySide6.QtCore import Qt, QTimer, QSize, QPoint, QRectF, QPropertyAnimation, QEasingCurve
-from PySide6.QtGui import QImage, QPixmap, QIcon, QPainter, QPen, QColor, QPolygon, QLinearGradient, QPainterPath
+from PySide6.QtWidgets import (QDockWidget, QGroupBox, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
+                               QPushButton, QFileDialog, QLabel, QMessageBox, QButtonGroup, QMenu, QLineEdit,
+                               QProgressDialog, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView)
+from PySide6.QtCore import Qt, Signal, QTimer, QSize, QPoint, QRectF, QPropertyAnimation, QEasingCurve
+from PySide6.QtGui import QAction, QImage, QPixmap, QIcon, QPainter, QPen, QColor, QPolygon, QLinearGradient, QPainterPath
 
+from core.autoscale import AutoScaler, SCALE_FRAME, SCALE_GLOBAL, SCALE_PERCENTILE, SCALE_SMOOTHED
+from core.colorize import Colorizer
+from core.extraction import pixel_column, write_series_csv
+from core.histogram import HistogramEngine
+from core.playback import PlaybackScheduler, PLAYBACK_SPEEDS
+from core.sources import UNIT_COUNTS
 from core.thermal_model import ThermalModel
 from ui.video_widget import ThermalVideoWidget
-from ui.dialogs import InfoDialog, ParamsDialog, CalibrationDialog
-from utils.config import PALETTES
+from ui.dialogs import InfoDialog, ParamsDialog, CalibrationDialog, SeriesDialog, HistogramDialog, ExportRangeDialog
+from ui.jobs import BackgroundJob
+from ui.plots import HistogramBar, SeriesPlot
+from ui.timeline import Filmstrip, Sparkline, TimelineSlider, thumbnail_pixmaps
+from utils.profiling import TRACER
+from utils.config import (PALETTES, DEFAULT_FPS, MAX_DISPLAY_FPS, AUTOSCALE_PERCENTILES, AUTOSCALE_SMOOTHING,
+                          AUTOSCALE_STRIDE, HISTOGRAM_BINS, TRACE_ENABLED, COMPUTE_PRECISION)
 
+# Colunas da tabela de ROIs: (título, chave na tabela do RoiManager.compute)
+ROI_TABLE_COLUMNS = [("ROI", "name"), ("Mean", "mean"), ("Std", "std"), ("Min", "min"), ("Max", "max"),
+                     ("P5", "p5"), ("P50", "p50"), ("P95", "p95")]
+
+# Modos de escala automática oferecidos no menu: (texto do menu, texto curto do botão, modo)
+SCALE_MENU = [("Frame (mín/máx do frame)", "Frame", SCALE_FRAME),
+              ("Global (gravação inteira)", "Global", SCALE_GLOBAL),
+              ("Percentil {:g}-{:g}%".format(*AUTOSCALE_PERCENTILES), "Pct", SCALE_PERCENTILE),
+              ("Suavizado no tempo", "Suave", SCALE_SMOOTHED)]
+
+# Etapas mostradas no HUD, na ordem do pipeline (spans do utils.profiling)
+HUD_STAGES = ("update_frame", "get_frame_data", "prefetch_wait", "decode", "calibration", "autoscale",
+              "histogram", "colorize", "clip", "upload", "roi_stats", "paint")
+
+# Ícones desenhados uma vez por (nome, cor, tamanho): o play/pause troca de ícone a cada clique
+@functools.lru_cache(maxsize=None)
 def get_icon(name, color="#aaaaaa", size=24):
     pixmap = QPixmap(size, size)
     pixmap.fill(Qt.transparent)
@@ -60,6 +91,12 @@ def get_icon(name, color="#aaaaaa", size=24):
         painter.drawEllipse(12, 6, 10, 10)
         painter.drawLine(14, 14, 20, 8)
     # ... (Mantenha os ícones antigos folder, cursor, rect, ellipse, clear aqui) ...
+    elif name == "index":
+        # Pilha de camadas: gravação indexada em cubo de frames
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRoundedRect(4, 4, 16, 4, 1, 1)
+        painter.drawRoundedRect(4, 10, 16, 4, 1, 1)
+        painter.drawRoundedRect(4, 16, 16, 4, 1, 1)
     elif name == "folder":
         painter.setBrush(QColor(color)); painter.setPen(Qt.NoPen)
         painter.drawRoundedRect(2, 6, 20, 14, 2, 2); painter.drawRoundedRect(2, 3, 10, 6, 2, 2)
@@ -98,6 +135,21 @@ def get_icon(name, color="#aaaaaa", size=24):
         painter.drawEllipse(3, 6, 18, 12)
     elif name == "rect":
         painter.drawRect(4, 5, 16, 14)
+    elif name == "polygon":
+        painter.drawPolygon(QPolygon([QPoint(4, 8), QPoint(12, 3), QPoint(20, 9), QPoint(17, 20), QPoint(7, 18)]))
+    elif name == "series":
+        # Linha de tendência: série temporal dos ROIs
+        painter.drawLine(4, 20, 20, 20); painter.drawLine(4, 4, 4, 20)
+        painter.drawPolyline(QPolygon([QPoint(6, 16), QPoint(10, 10), QPoint(14, 13), QPoint(20, 5)]))
+    elif name == "probe":
+        # Mira: fixa pixels para a série temporal
+        painter.setBrush(Qt.NoBrush)
+        painter.drawEllipse(6, 6, 12, 12)
+        painter.drawLine(12, 2, 12, 9); painter.drawLine(12, 15, 12, 22)
+        painter.drawLine(2, 12, 9, 12); painter.drawLine(15, 12, 22, 12)
+    elif name == "clear":
+        # X: remove todos os ROIs
+        painter.drawLine(6, 6, 18, 18); painter.drawLine(18, 6, 6, 18)
     elif name == "hamburger":
         painter.setBrush(Qt.NoBrush)
         # Define as alturas das 3 linhas
@@ -111,6 +163,9 @@ def get_icon(name, color="#aaaaaa", size=24):
     return QIcon(pixmap)
 
 class MainWindow(QMainWindow):
+    # Resultado do seek assíncrono, emitido na thread de seek: (frame, contexto, dados, é prévia)
+    frame_ready = Signal(int, object, object, bool)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Thermal Science Files Viewer")
@@ -122,13 +177,37 @@ class MainWindow(QMainWindow):
         self.resize(1100, 700)
         self.model = ThermalModel()
         self.current_frame = 0
+        self.frame_buffer = None # Frame exibido: buffer reaproveitado a cada frame (get_frame_into)
         self.current_palette = PALETTES["Ironbow"]
+        # Timer de disparo único: cada tick agenda o próximo pelo tempo dos frames (PlaybackScheduler)
         self.timer = QTimer()
-        self.timer.timeout.connect(self.next_frame)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.playback_tick)
+        self.playback = PlaybackScheduler(fps=DEFAULT_FPS)
+        self._last_fps_report = 0.0
         self.auto_scale = True
+        self.model.stats_percentiles = AUTOSCALE_PERCENTILES
+        self.autoscaler = AutoScaler(SCALE_FRAME, AUTOSCALE_PERCENTILES, AUTOSCALE_SMOOTHING, AUTOSCALE_STRIDE)
+        self.stats_job = None # Passada de estatísticas por frame em andamento
+        self.histogram = HistogramEngine(HISTOGRAM_BINS) # Histograma do frame exibido (ao lado da colorbar)
+        self.equalize = False # Equalização de histograma na colorização
+        self.probe_job = None # Extração da série dos pixels fixados em andamento
+        self.probe_table = None
+        self.thumb_job = None # Miniaturas da gravação sendo carregadas/geradas
+        self.times_job = None # Leitura dos tempos dos frames (arquivos sem taxa de quadros no cabeçalho)
+        self.thumb_pixmaps = [] # Miniaturas coloridas com a paleta atual
+        self.thumb_colorizer = Colorizer()
+        self.hud_timer = QTimer(self) # Atualiza o HUD de desempenho duas vezes por segundo
+        self.hud_timer.timeout.connect(self.update_hud)
+        self.jobs = [] # Tarefas em segundo plano ativas (indexação, exportações...)
+        self.side_panel_width = 380 # Largura do painel lateral aberto (cabe a tabela de ROIs)
         self.setup_ui()
         self.video_widget.pixel_hovered.connect(self.update_cursor_data)
         self.video_widget.stats_updated.connect(self.update_roi_stats)
+        self.video_widget.rois_updated.connect(self.update_roi_table)
+        self.video_widget.pins_updated.connect(self.update_probe)
+        self.frame_ready.connect(self.on_frame_ready)
 
     def setup_ui(self):
         central_widget = QWidget()
@@ -159,18 +238,36 @@ class MainWindow(QMainWindow):
         btn_open.setIconSize(QSize(30, 30))
         btn_open.clicked.connect(self.open_file); top_layout.addWidget(btn_open)
 
+        btn_index = QPushButton(); btn_index.setIcon(get_icon("index")); btn_index.setProperty("class", "FlatIcon")
+        btn_index.setIconSize(QSize(26, 26))
+        btn_index.setToolTip("Indexar gravação (converte para cubo memmap e acelera os seeks)")
+        btn_index.clicked.connect(self.index_recording); top_layout.addWidget(btn_index)
+
         sep = QLabel("│"); sep.setStyleSheet("color: #444; font-size: 18px; margin: 0 5px;")
         top_layout.addWidget(sep)
 
         self.tool_group = QButtonGroup(self)
-        tools = [("cursor", "None"), ("rect", "Rect"), ("ellipse", "Circle")]
+        tools = [("cursor", "None"), ("rect", "Rect"), ("ellipse", "Circle"), ("polygon", "Polygon"), ("probe", "Probe")]
         for icon_name, mode in tools:
             btn = QPushButton(); btn.setIcon(get_icon(icon_name)); btn.setProperty("class", "FlatIcon")
             btn.setIconSize(QSize(30, 30))
-            btn.setCheckable(True); btn.clicked.connect(lambda checked, m=mode: self.video_widget.set_roi_mode(m))
+            btn.setCheckable(True); btn.clicked.connect(lambda checked, m=mode: self.select_tool(m))
+            if mode == "Probe": btn.setToolTip("Probe: clique fixa um pixel (botão direito remove)")
             self.tool_group.addButton(btn); top_layout.addWidget(btn)
             if mode == "None": btn.setChecked(True)
 
+        btn_clear = QPushButton(); btn_clear.setIcon(get_icon("clear")); btn_clear.setProperty("class", "FlatIcon")
+        btn_clear.setIconSize(QSize(30, 30))
+        btn_clear.setToolTip("Remover todos os ROIs")
+        btn_clear.clicked.connect(lambda: self.video_widget.clear_rois())
+        top_layout.addWidget(btn_clear)
+
+        btn_series = QPushButton(); btn_series.setIcon(get_icon("series")); btn_series.setProperty("class", "FlatIcon")
+        btn_series.setIconSize(QSize(30, 30))
+        btn_series.setToolTip("Série temporal dos ROIs na gravação inteira")
+        btn_series.clicked.connect(self.extract_roi_series)
+        top_layout.addWidget(btn_series)
+
         top_layout.addStretch()
 
        # Botão Paleta (Arco-íris) no topo direito
@@ -203,6 +300,18 @@ class MainWindow(QMainWindow):
         top_layout.addWidget(btn_params)
         top_layout.addWidget(btn_params)
 
+        # Configurações do processamento
+        btn_settings = QPushButton("⚙"); btn_settings.setProperty("class", "FlatIcon")
+        btn_settings.setToolTip("Configurações")
+        settings_menu = QMenu(self)
+        act_float64 = QAction("Precisão dupla (float64)", self)
+        act_float64.setCheckable(True)
+        act_float64.setChecked(np.dtype(COMPUTE_PRECISION) == np.float64)
+        act_float64.toggled.connect(self.set_double_precision)
+        settings_menu.addAction(act_float64)
+        btn_settings.setMenu(settings_menu)
+        top_layout.addWidget(btn_settings)
+
         main_layout.addLayout(top_layout)
 
         # --- CENTRO  ---
@@ -211,7 +320,7 @@ class MainWindow(QMainWindow):
         #  1. PAINEL LATERAL ESQUERDO (Dados e Estatísticas)
         self.side_panel_container = QWidget()
         # Definimos o tamanho máximo e mínimo para 0 para ele começar escondido
-        # Se quiser que comece aberto, mude ambos os '0' abaixo para '180'
+        # Se quiser que comece aberto, mude ambos os '0' abaixo para self.side_panel_width
         self.side_panel_container.setMaximumWidth(0) 
         self.side_panel_container.setMinimumWidth(0)
         self.side_panel_container.setContentsMargins(0, 0, 0, 0)
@@ -235,17 +344,23 @@ class MainWindow(QMainWindow):
         cursor_group.setLayout(cursor_vbox)
         side_layout.addWidget(cursor_group)
 
-        # Grupo: ROI Stats (Média e Desvio Padrão)
+        # Grupo: ROI Stats (tabela com uma linha por ROI)
         roi_group = QGroupBox("ROI Statistics")
         roi_vbox = QVBoxLayout()
-        self.lbl_roi_mean = QLabel("Mean: -")
-        self.lbl_roi_std = QLabel("Std Dev: -")
-        roi_vbox.addWidget(self.lbl_roi_mean)
-        roi_vbox.addWidget(self.lbl_roi_std)
+        self.roi_table = QTableWidget(0, len(ROI_TABLE_COLUMNS))
+        self.roi_table.setHorizontalHeaderLabels([title for title, _ in ROI_TABLE_COLUMNS])
+        self.roi_table.verticalHeader().setVisible(False)
+        self.roi_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.roi_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.roi_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.roi_table.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.roi_table.customContextMenuRequested.connect(self.show_roi_menu)
+        roi_vbox.addWidget(self.roi_table)
+        # Média/desvio ao vivo do ROI que está sendo desenhado
+        self.lbl_roi_live = QLabel("Drawing: -")
+        roi_vbox.addWidget(self.lbl_roi_live)
         roi_group.setLayout(roi_vbox)
-        side_layout.addWidget(roi_group)
-
-        side_layout.addStretch() # Empurra os grupos para o topo
+        side_layout.addWidget(roi_group, stretch=1)
         center_layout.addWidget(self.side_panel_container)
 
             # 2. WIDGET DE VÍDEO NO CENTRO
@@ -264,13 +379,34 @@ class MainWindow(QMainWindow):
         btn_zoom.clicked.connect(lambda: self.video_widget.fitInView(self.video_widget.scene.sceneRect(), Qt.KeepAspectRatio))
         right_panel.addWidget(btn_zoom, alignment=Qt.AlignCenter)
 
+        # Modo da escala automática
+        self.btn_scale = QPushButton("Frame"); self.btn_scale.setProperty("class", "FlatIcon")
+        self.btn_scale.setToolTip("Escala automática")
+        scale_menu = QMenu(self)
+        for text, short, mode in SCALE_MENU:
+            scale_menu.addAction(text, lambda m=mode, t=short: self.set_scale_mode(m, t))
+        scale_menu.addSeparator()
+        act_equalize = scale_menu.addAction("Equalizar histograma")
+        act_equalize.setCheckable(True)
+        act_equalize.toggled.connect(self.set_equalization)
+        scale_menu.addAction("Histograma da gravação...", self.compute_recording_histogram)
+        self.btn_scale.setMenu(scale_menu)
+        right_panel.addWidget(self.btn_scale, alignment=Qt.AlignCenter)
+
         self.txt_max = QLineEdit("0.0")
         self.txt_max.setFixedWidth(60); self.txt_max.setAlignment(Qt.AlignCenter)
         right_panel.addWidget(self.txt_max, alignment=Qt.AlignCenter)
 
+        # Gradiente e, ao lado, o histograma do frame na mesma escala vertical
+        colorbar_layout = QHBoxLayout()
+        colorbar_layout.setSpacing(2)
         self.colorbar_label = QLabel()
-        self.colorbar_label.setFixedWidth(40)
-        right_panel.addWidget(self.colorbar_label, stretch=1, alignment=Qt.AlignCenter)
+        self.colorbar_label.setFixedWidth(28)
+        colorbar_layout.addWidget(self.colorbar_label, alignment=Qt.AlignVCenter)
+        self.hist_bar = HistogramBar()
+        self.hist_bar.setFixedHeight(400) # Mesma altura do gradiente desenhado em draw_colorbar
+        colorbar_layout.addWidget(self.hist_bar, alignment=Qt.AlignVCenter)
+        right_panel.addLayout(colorbar_layout, stretch=1)
 
         self.txt_min = QLineEdit("0.0")
         self.txt_min.setFixedWidth(60); self.txt_min.setAlignment(Qt.AlignCenter)
@@ -280,11 +416,30 @@ class MainWindow(QMainWindow):
         center_layout.addLayout(right_panel)
         main_layout.addLayout(center_layout, stretch=1)
 
+        # --- FILMSTRIP (miniaturas da gravação; o menu de velocidade mostra/esconde) ---
+        self.filmstrip_dock = QDockWidget("Filmstrip", self)
+        self.filmstrip = Filmstrip()
+        self.filmstrip.frame_selected.connect(self.seek_frame)
+        self.filmstrip_dock.setWidget(self.filmstrip)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.filmstrip_dock)
+        self.filmstrip_dock.hide()
+
         # --- SLIDER (Barra Fina) ---
-        self.slider = QSlider(Qt.Horizontal)
+        self.slider = TimelineSlider(Qt.Horizontal)
         self.slider.setEnabled(False)
         self.slider.sliderMoved.connect(self.seek_frame)
+        self.slider.sliderReleased.connect(self.on_slider_released)
+        self.slider.hovered.connect(self.show_thumbnail_popup)
+        self.slider.left.connect(lambda: self.thumb_popup.hide())
         main_layout.addWidget(self.slider)
+        # Máximo e média de cada frame da gravação, alinhados à barra (clique leva ao frame)
+        self.sparkline = Sparkline(self.slider)
+        self.sparkline.frame_selected.connect(self.seek_frame)
+        main_layout.addWidget(self.sparkline)
+        # Prévia do frame sob o mouse na barra de tempo (miniatura mais próxima)
+        self.thumb_popup = QLabel(self, Qt.ToolTip)
+        self.thumb_popup.setStyleSheet("background-color: #000000; color: #dddddd; border: 1px solid #555555;")
+        self.thumb_popup.setAlignment(Qt.AlignCenter)
 
         # --- RODAPÉ (Export, Player, Unit) ---
         bottom_layout = QHBoxLayout()
@@ -294,7 +449,12 @@ class MainWindow(QMainWindow):
         btn_export.setIcon(get_icon("export"))
         btn_export.setProperty("class", "FlatIcon")
         btn_export.setIconSize(QSize(40, 40))
-        btn_export.clicked.connect(self.export_csv)
+        export_menu = QMenu(self)
+        export_menu.addAction("Frame atual (CSV)...", self.export_csv)
+        export_menu.addAction("Intervalo de frames (NPY/NPZ/RAW...)...", self.export_frames)
+        export_menu.addAction("Vídeo colorido (MP4/AVI)...", self.export_video)
+        export_menu.addAction("Estatísticas por frame (CSV)...", self.export_frame_stats)
+        btn_export.setMenu(export_menu)
         bottom_layout.addWidget(btn_export)
         bottom_layout.addStretch()
 
@@ -312,88 +472,402 @@ class MainWindow(QMainWindow):
         btn_next.setIconSize(QSize(40, 40))
         btn_next.clicked.connect(lambda: self.step_frame(1))
         bottom_layout.addWidget(btn_next)
+
+        # Velocidade de reprodução (relativa ao tempo real da gravação)
+        self.btn_speed = QPushButton("1×"); self.btn_speed.setProperty("class", "FlatIcon")
+        self.btn_speed.setToolTip("Velocidade de reprodução")
+        speed_menu = QMenu(self)
+        for speed in PLAYBACK_SPEEDS:
+            speed_menu.addAction(f"{speed:g}×", lambda sp=speed: self.set_playback_speed(sp))
+        speed_menu.addSeparator()
+        self.act_hud = QAction("HUD de desempenho", self)
+        self.act_hud.setCheckable(True)
+        self.act_hud.setShortcut("F3")
+        self.act_hud.toggled.connect(self.set_hud_visible)
+        self.addAction(self.act_hud) # Atalho F3 ativo na janela toda, não só com o menu aberto
+        speed_menu.addAction(self.act_hud)
+        speed_menu.addAction("Exportar trace (Chrome JSON)...", self.export_trace)
+        speed_menu.addSeparator()
+        speed_menu.addAction(self.filmstrip_dock.toggleViewAction())
+        self.btn_speed.setMenu(speed_menu)
+        bottom_layout.addWidget(self.btn_speed)
         
         bottom_layout.addStretch()
 
+        # Canto Direito: fps alcançado / fps alvo e frames pulados
+        self.lbl_fps = QLabel("")
+        self.lbl_fps.setToolTip("Frames exibidos por segundo / taxa alvo (gravação × velocidade)")
+        bottom_layout.addWidget(self.lbl_fps)
+
         main_layout.addLayout(bottom_layout)
 
+        # --- DOCK DO PROBE (série temporal dos pixels fixados) ---
+        self.probe_dock = QDockWidget("Pixel Probe", self)
+        probe_widget = QWidget()
+        probe_layout = QVBoxLayout(probe_widget)
+        probe_top = QHBoxLayout()
+        self.lbl_probe = QLabel("Clique no vídeo com a ferramenta Probe para fixar pixels")
+        probe_top.addWidget(self.lbl_probe)
+        probe_top.addStretch()
+        btn_probe_csv = QPushButton("Export CSV"); btn_probe_csv.clicked.connect(self.export_probe_csv)
+        probe_top.addWidget(btn_probe_csv)
+        btn_probe_clear = QPushButton("Clear"); btn_probe_clear.clicked.connect(lambda: self.video_widget.clear_pins())
+        probe_top.addWidget(btn_probe_clear)
+        probe_layout.addLayout(probe_top)
+        self.probe_plot = SeriesPlot()
+        self.probe_plot.setMinimumHeight(160)
+        probe_layout.addWidget(self.probe_plot, stretch=1)
+        self.probe_dock.setWidget(probe_widget)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.probe_dock)
+        self.probe_dock.hide()
+
     # --- LÓGICA (Mantenha suas funções open_file, update_frame, etc) ---
     def open_file(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Open", "", "Files (*.ats *.jpg)")
-        if path and self.model.load_file(path):
+        path, _ = QFileDialog.getOpenFileName(self, "Open", "", "Files (*.ats *.jpg *.npy *.raw)")
+        if not path: return
+        try:
+            loaded = self.model.load_file(path)
+        except (RuntimeError, ValueError, OSError) as e:
+            QMessageBox.warning(self, "Erro", f"Não foi possível abrir o arquivo:\n{e}")
+            return
+        if loaded:
             self.auto_scale = True
             self.unit_menu.clear()
             self.update_unit_menu()
             self.slider.setEnabled(True)
             self.slider.setMaximum(self.model.num_frames - 1)
             self.current_frame = 0
+            self.video_widget.clear_pins() # Coordenadas do arquivo anterior podem nem existir neste
+            self.refresh_frame_stats()
+            self.refresh_thumbnails()
             self.update_frame()
             self.draw_colorbar()
-            self.btn_play.setIcon(get_icon("pause"))
-            self.timer.start(33)
+            self.refresh_frame_times()
+            self.start_playback()
 
-    def update_frame(self):
-        data = self.model.get_frame_data(self.current_frame)
-        if data is not None:
+    def update_frame(self, decoded=None):
+        with TRACER.span("update_frame"):
+            data = self.model.get_frame_into(self.current_frame, self.frame_buffer, decoded)
+            if data is None: return
+            self.frame_buffer = data
             # 1. Decide os limites baseado na flag
-            if self.auto_scale:
-                v_min = np.min(data)
-                v_max = np.max(data)
-                self.txt_min.setText(f"{v_min:.1f}")
-                self.txt_max.setText(f"{v_max:.1f}")
-            else:
-                try:
-                    v_min = float(self.txt_min.text())
-                    v_max = float(self.txt_max.text())
-                except ValueError:
-                    v_min = np.min(data)
-                    v_max = np.max(data)
-            
-            # 2. Limita (clip) os dados térmicos aos limites definidos. 
-            # Valores fora da faixa recebem a cor extrema da paleta, gerando a isoterma.
-            display_data = np.clip(data, v_min, v_max)
+            with TRACER.span("autoscale"):
+                if self.auto_scale:
+                    v_min, v_max = self.autoscaler.limits(self.current_frame, data)
+                    self.txt_min.setText(f"{v_min:.1f}")
+                    self.txt_max.setText(f"{v_max:.1f}")
+                else:
+                    try:
+                        v_min = float(self.txt_min.text())
+                        v_max = float(self.txt_max.text())
+                    except ValueError:
+                        v_min = np.min(data)
+                        v_max = np.max(data)
+
+            # Histograma do frame na faixa exibida; com a equalização ele também define o mapeamento de cores
+            with TRACER.span("histogram"):
+                counts = self.histogram.compute(data, v_min, v_max)
+                self.hist_bar.set_counts(counts)
+                if self.equalize:
+                    self.video_widget.colorizer.set_equalization(counts)
+                    self.draw_colorbar()
 
-            self.video_widget.update_image(display_data, self.current_palette)
+            # 2. O colorizador limita os dados aos limites definidos na própria passada de cor.
+            # Valores fora da faixa recebem a cor extrema da paleta, gerando a isoterma.
+            self.video_widget.update_image(data, self.current_palette, v_min, v_max)
             self.slider.setValue(self.current_frame)
+            self.sparkline.set_current(self.current_frame)
+            if self.filmstrip_dock.isVisible():
+                self.filmstrip.set_current(self.current_frame)
 
-    def next_frame(self):
-        if self.model.num_frames > 0:
-            self.current_frame = (self.current_frame + 1) % self.model.num_frames
+    def playback_tick(self):
+        if self.model.num_frames == 0: return
+        if self.slider.isSliderDown():
+            # Arrastando a barra: o seek assíncrono cuida da imagem; a reprodução retoma ao soltar
+            self.timer.start(int(1000 / MAX_DISPLAY_FPS))
+            return
+        now = time.perf_counter()
+        index, wait = self.playback.tick(now)
+        # Só desenha quando o relógio já pede outro frame; se ficou para trás, os intermediários são pulados
+        if index != self.current_frame:
+            self.current_frame = index
             self.update_frame()
+        self.report_playback_fps(now)
+        # Desconta o tempo gasto neste tick; nunca agenda acima da taxa máxima de exibição
+        elapsed = time.perf_counter() - now
+        self.timer.start(max(int((wait - elapsed) * 1000), int(1000 / MAX_DISPLAY_FPS)))
 
-    def toggle_pause(self):
+    def start_playback(self):
+        self.playback.start(self.current_frame)
+        self.timer.start(0)
+        self.btn_play.setIcon(get_icon("pause"))
+
+    def stop_playback(self):
+        self.timer.stop()
+        self.playback.stop()
+        self.btn_play.setIcon(get_icon("play"))
+
+    def set_playback_speed(self, speed):
+        self.playback.set_speed(speed)
+        self.playback.reset_stats()
+        self.btn_speed.setText(f"{speed:g}×")
+
+    def report_playback_fps(self, now):
+        if now - self._last_fps_report < 0.5: return
+        self._last_fps_report = now
+        pb = self.playback
+        self.lbl_fps.setText(f"{pb.achieved_fps:.1f} / {pb.target_fps:.1f} fps  (pulados: {pb.dropped})")
+
+    def set_hud_visible(self, visible):
+        # O HUD liga a instrumentação; com THERMAL_VIEWER_TRACE=1 ela fica sempre ligada
+        TRACER.set_enabled(visible or TRACE_ENABLED)
+        self.video_widget.hud.setVisible(visible)
+        if visible:
+            self.update_hud()
+            self.hud_timer.start(500)
+        else:
+            self.hud_timer.stop()
+
+    def set_double_precision(self, enabled):
+        # Frames calibrados em float64 (padrão) ou float32 (metade da memória e da banda)
+        precision = np.float64 if enabled else np.float32
+        self.model.set_precision(precision)
+        self.video_widget.set_precision(precision)
+        self.refresh_frame_stats()
+        if not self.timer.isActive(): self.update_frame()
+
+    def update_hud(self):
+        # Etapas da thread da interface; decodificação nas outras threads aparece à parte
+        main = TRACER.summary(1.0, thread=threading.main_thread().ident)
+        every = TRACER.summary(1.0)
         if self.timer.isActive():
-            self.timer.stop(); self.btn_play.setIcon(get_icon("play"))
+            fps = f"{self.playback.achieved_fps:5.1f} / {self.playback.target_fps:.1f}  pulados {self.playback.dropped}"
         else:
-            self.timer.start(33); self.btn_play.setIcon(get_icon("pause"))
+            fps = f"{main.get('update_frame', (0, 0))[1]:5d} frames/s (pausado)"
+        lines = [f"fps {fps}"]
+        for stage in HUD_STAGES:
+            if stage in main:
+                lines.append(f"{stage:<15}{main[stage][0]:7.2f} ms")
+        for stage in ("decode", "calibration"):
+            ms_all, n_all = every.get(stage, (0.0, 0))
+            ms_main, n_main = main.get(stage, (0.0, 0))
+            if n_all > n_main:
+                ms = (ms_all * n_all - ms_main * n_main) / (n_all - n_main)
+                lines.append(f"{stage + '*':<15}{ms:7.2f} ms  x{n_all - n_main}")
+        if any(line.split()[0].endswith("*") for line in lines[1:]):
+            lines.append("* outras threads (pré-decodificação, estatísticas)")
+        self.video_widget.set_hud_text("\n".join(lines))
+
+    def export_trace(self):
+        if not TRACER.events:
+            QMessageBox.warning(self, "Aviso", "Nenhuma etapa registrada. Ligue o HUD (F3) e reproduza a gravação.")
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Salvar trace", "thermal_trace.json", "Chrome trace (*.json)")
+        if path:
+            count = TRACER.export_chrome_trace(path)
+            QMessageBox.information(self, "Sucesso",
+                                    f"{count} eventos exportados (abra em chrome://tracing ou ui.perfetto.dev).")
+
+    def toggle_pause(self):
+        if self.timer.isActive():
+            self.stop_playback()
+        elif self.model.num_frames > 0:
+            self.start_playback()
 
     def seek_frame(self, pos):
+        # Decodifica na thread de seek: arrastar a barra não trava a interface e só o último pedido é exibido
         self.current_frame = pos
-        if not self.timer.isActive(): self.update_frame()
+        if self.timer.isActive():
+            self.playback.start(pos) # Continua tocando a partir do ponto escolhido
+        self.model.request_frame(pos, self.frame_ready.emit)
+
+    def on_frame_ready(self, index, context, data, is_preview):
+        if index == self.current_frame and not is_preview:
+            self.update_frame(decoded=(context, data))
+        elif data is not None and (index == self.current_frame or self.slider.isSliderDown()):
+            # Prévia, ou frame de um pedido já superado durante o arraste: só a imagem, até o frame pedido chegar
+            self.show_preview(data)
+
+    def show_preview(self, data):
+        # Prévia com os limites de cor atuais: sem escala automática, histograma nem ROIs
+        try:
+            v_min, v_max = float(self.txt_min.text()), float(self.txt_max.text())
+        except ValueError:
+            v_min, v_max = float(np.min(data)), float(np.max(data))
+        self.video_widget.update_image(data, self.current_palette, v_min, v_max, preview=True)
+
+    def on_slider_released(self):
+        if self.timer.isActive():
+            self.playback.start(self.current_frame)
 
     def step_frame(self, dir):
         if self.model.num_frames > 0:
             self.current_frame = max(0, min(self.current_frame + dir, self.model.num_frames - 1))
             self.slider.setValue(self.current_frame)
-            if not self.timer.isActive(): self.update_frame()
+            if self.timer.isActive():
+                self.playback.start(self.current_frame)
+            self.update_frame()
 
     def change_unit(self, unit):
         self.model.set_unit(unit)
         self.btn_unit.setText(unit.split()[0]) # Escreve só "Counts" ou "Temperature"
+        self.refresh_frame_stats()
+        self.update_probe(self.video_widget.pins)
+        if not self.timer.isActive(): self.update_frame()
+
+    def set_scale_mode(self, mode, label):
+        self.autoscaler.set_mode(mode)
+        self.btn_scale.setText(label)
+        self.auto_scale = True # Escolher um modo volta para a escala automática
+        if not self.timer.isActive(): self.update_frame()
+
+    def set_equalization(self, enabled):
+        self.equalize = enabled
+        if not enabled:
+            self.video_widget.colorizer.set_equalization(None)
+            self.draw_colorbar()
+        if not self.timer.isActive(): self.update_frame()
+
+    def compute_recording_histogram(self):
+        if not self.model.source:
+            QMessageBox.warning(self, "Aviso", "Nenhum termograma carregado.")
+            return
+        unit = self.model.current_unit_label
+        self.run_job("Calculando histograma da gravação...",
+                     lambda progress, cancel: self.model.compute_histogram(bins=HISTOGRAM_BINS, progress=progress,
+                                                                          cancel=cancel),
+                     lambda acc: self.on_recording_histogram(acc, unit))
+
+    def on_recording_histogram(self, acc, unit):
+        if acc is None: return # Cancelado
+        dialog = HistogramDialog(acc, unit, self.model.file_name, self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.show()
+
+    def refresh_frame_stats(self):
+        """
+        Descarta as estatísticas da unidade/calibração anterior e dispara, em segundo plano
+        e sem diálogo, a passada que calcula mínimo/máximo/percentis de todos os frames.
+        Enquanto ela roda, o AutoScaler usa estimativas; o resultado fica em cache no modelo.
+        """
+        if self.stats_job is not None:
+            self.stats_job.cancel()
+        self.autoscaler.reset()
+        self.sparkline.set_stats(None)
+        self.stats_job = None
+        if not self.model.source: return
+        cached = self.model.get_frame_stats()
+        if cached is not None:
+            self.autoscaler.set_stats(cached)
+            self.sparkline.set_stats(cached, self.model.current_unit_label)
+            return
+        job = BackgroundJob(lambda progress, cancel: self.model.compute_frame_stats(cancel=cancel), self)
+        job.succeeded.connect(self.on_frame_stats_ready)
+        job.finished.connect(lambda: self.jobs.remove(job))
+        self.jobs.append(job)
+        self.stats_job = job
+        job.start()
+
+    def on_frame_stats_ready(self, table):
+        # Ignora resultados de um arquivo/unidade que já não está ativo (o modelo só guarda o do contexto atual)
+        if table is None or table is not self.model.get_frame_stats(): return
+        self.stats_job = None
+        self.autoscaler.set_stats(table)
+        self.sparkline.set_stats(table, self.model.current_unit_label)
         if not self.timer.isActive(): self.update_frame()
 
+    def refresh_thumbnails(self):
+        """
+        Miniaturas da gravação para a barra de tempo e o filmstrip: lidas do arquivo ao lado
+        da gravação ou geradas em segundo plano (sem diálogo, sem parar a reprodução).
+        """
+        if self.thumb_job is not None:
+            self.thumb_job.cancel()
+        self.thumb_job = None
+        self.thumb_pixmaps = []
+        self.filmstrip.set_thumbnails([], [])
+        if not self.model.source: return
+        if self.model.thumbnails is not None:
+            self.on_thumbnails_ready(self.model.thumbnails)
+            return
+        model = self.model
+        job = BackgroundJob(lambda progress, cancel: model.load_thumbnails() or
+                            model.build_thumbnails(progress=progress, cancel=cancel), self)
+        job.progress.connect(lambda done, total: self.filmstrip_dock.setWindowTitle(
+            f"Filmstrip (gerando miniaturas... {100 * done // max(total, 1)}%)"))
+        job.succeeded.connect(self.on_thumbnails_ready)
+        job.finished.connect(lambda: self.jobs.remove(job))
+        self.jobs.append(job)
+        self.thumb_job = job
+        job.start()
+
+    def refresh_frame_times(self):
+        """
+        Agenda a reprodução pelos tempos reais dos frames. Se a fonte não os informou na
+        abertura, usa a taxa padrão e lê os tempos em segundo plano.
+        """
+        if self.times_job is not None:
+            self.times_job.cancel()
+        self.times_job = None
+        self.reset_playback_times()
+        if not self.model.source or self.model.source.frame_times() is not None: return
+        model, source = self.model, self.model.source
+        job = BackgroundJob(lambda progress, cancel: model.load_frame_times(progress, cancel), self)
+        job.succeeded.connect(lambda times: self.on_frame_times_ready(source, times))
+        job.finished.connect(lambda: self.jobs.remove(job))
+        self.jobs.append(job)
+        self.times_job = job
+        job.start()
+
+    def on_frame_times_ready(self, source, times):
+        # Ignora tempos de um arquivo que já foi fechado
+        if times is None or source is not self.model.source: return
+        self.times_job = None
+        self.reset_playback_times()
+
+    def reset_playback_times(self):
+        # Agenda pelos tempos reais dos frames (ou pela taxa da gravação, se conhecida)
+        running = self.timer.isActive()
+        times = self.model.source.frame_times() if self.model.source else None
+        self.playback.reset(self.model.num_frames, times, self.model.frame_rate or DEFAULT_FPS)
+        if running: self.playback.start(self.current_frame)
+
+    def on_thumbnails_ready(self, strip):
+        # Ignora miniaturas de um arquivo que já foi fechado
+        if strip is None or strip is not self.model.thumbnails: return
+        self.thumb_job = None
+        self.filmstrip_dock.setWindowTitle(f"Filmstrip ({len(strip)} miniaturas)")
+        self.update_thumbnail_images()
+
+    def update_thumbnail_images(self):
+        strip = self.model.thumbnails
+        if strip is None: return
+        self.thumb_pixmaps = thumbnail_pixmaps(strip, self.thumb_colorizer, self.current_palette)
+        self.filmstrip.set_thumbnails(strip.frames, self.thumb_pixmaps)
+        self.filmstrip.set_current(self.current_frame)
+
+    def show_thumbnail_popup(self, frame_index, global_pos):
+        strip = self.model.thumbnails
+        if strip is None or not self.thumb_pixmaps: return
+        pos = strip.nearest(frame_index)
+        pixmap = self.thumb_pixmaps[pos]
+        self.thumb_popup.setPixmap(pixmap.scaled(pixmap.size() * 2, Qt.KeepAspectRatio, Qt.FastTransformation))
+        self.thumb_popup.adjustSize()
+        top = self.slider.mapToGlobal(QPoint(0, 0)).y()
+        self.thumb_popup.move(global_pos.x() - self.thumb_popup.width() // 2, top - self.thumb_popup.height() - 4)
+        self.thumb_popup.show()
+
     def change_palette(self, pal):
         self.current_palette = PALETTES.get(pal)
+        self.video_widget.colorizer.set_palette(self.current_palette) # Só troca a tabela de cores
         self.draw_colorbar()
+        self.update_thumbnail_images()
         if not self.timer.isActive(): self.update_frame()
 
     def draw_colorbar(self):
-        # A barra do meio isolada (o histograma lateral exigiria PyqtGraph, 
-        # mas mantivemos o gradiente com as caixas separadas perfeitamente)
-        grad = np.linspace(255, 0, 500).astype(np.uint8)
-        grad = np.tile(grad, (20, 1)).T
-        colored = cv2.applyColorMap(grad, self.current_palette)
-        rgb = cv2.cvtColor(colored, cv2.COLOR_BGR2RGB)
+        # Gradiente da paleta na ordem exibida (equalizada, se ligada); o histograma fica no HistogramBar ao lado
+        lut = self.video_widget.colorizer.rgb_lut()
+        rgb = np.ascontiguousarray(np.repeat(lut[::-1, np.newaxis, :], 20, axis=1))
         h, w, ch = rgb.shape
         qimg = QImage(rgb.data, w, h, ch * w, QImage.Format_RGB888)
         self.colorbar_label.setPixmap(QPixmap.fromImage(qimg).scaled(25, 400, Qt.IgnoreAspectRatio))
@@ -413,6 +887,194 @@ class MainWindow(QMainWindow):
                 self.model.export_csv(path)
                 QMessageBox.information(self, "Sucesso", "CSV Exportado com sucesso!")
 
+    def export_frames(self):
+        if not self.model.source:
+            QMessageBox.warning(self, "Aviso", "Nenhum termograma carregado para exportar.")
+            return
+        dialog = ExportRangeDialog(self.model.num_frames, self.current_frame, parent=self)
+        if not dialog.exec(): return
+        start, stop, step = dialog.frame_range
+        if start >= stop:
+            QMessageBox.warning(self, "Aviso", "Intervalo de frames vazio.")
+            return
+        suggested = f"{self.model.file_name}_frames_{start}-{stop}{dialog.extension}"
+        path, _ = QFileDialog.getSaveFileName(self, "Exportar frames", suggested, f"{dialog.format.upper()} (*{dialog.extension})")
+        if not path: return
+        fmt = dialog.format
+        self.run_job("Exportando frames...",
+                     lambda progress, cancel: self.model.export_frames(path, start, stop, step, fmt, progress, cancel),
+                     lambda result: result and QMessageBox.information(self, "Sucesso", "Frames exportados com sucesso!"))
+
+    def export_frame_stats(self):
+        if not self.model.source:
+            QMessageBox.warning(self, "Aviso", "Nenhum termograma carregado para exportar.")
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Salvar CSV", f"{self.model.file_name}_frame_stats.csv",
+                                              "CSV (*.csv)")
+        if not path: return
+        if self.model.get_frame_stats() is None and self.stats_job is not None:
+            # A exportação calcula com barra de progresso; a passada silenciosa seria repetida
+            self.stats_job.cancel()
+            self.stats_job = None
+
+        def on_done(result):
+            if not result:
+                self.refresh_frame_stats() # Cancelado: volta à passada silenciosa
+                return
+            self.on_frame_stats_ready(self.model.get_frame_stats())
+            QMessageBox.information(self, "Sucesso", "CSV Exportado com sucesso!")
+
+        self.run_job("Calculando estatísticas por frame...",
+                     lambda progress, cancel: self.model.export_frame_stats(path, progress, cancel), on_done)
+
+    def export_video(self):
+        if not self.model.source:
+            QMessageBox.warning(self, "Aviso", "Nenhum termograma carregado para exportar.")
+            return
+        dialog = ExportRangeDialog(self.model.num_frames, self.current_frame, video=True, parent=self)
+        if not dialog.exec(): return
+        start, stop, step = dialog.frame_range
+        if start >= stop:
+            QMessageBox.warning(self, "Aviso", "Intervalo de frames vazio.")
+            return
+        suggested = f"{self.model.file_name}_{start}-{stop}{dialog.extension}"
+        path, _ = QFileDialog.getSaveFileName(self, "Exportar vídeo", suggested, f"{dialog.format.upper()} (*{dialog.extension})")
+        if not path: return
+
+        v_range = None
+        if dialog.chk_fixed_scale.isChecked():
+            try:
+                v_range = (float(self.txt_min.text()), float(self.txt_max.text()))
+            except ValueError:
+                pass
+        rois, colors = None, None
+        if dialog.chk_rois.isChecked() and len(self.video_widget.roi_manager):
+            # Mesmas cores do desenho na tela (o vídeo é BGR)
+            rois = copy.deepcopy(self.video_widget.roi_manager)
+            colors = {}
+            for name in rois.rois:
+                c = self.video_widget.roi_items[name][0].pen().color()
+                colors[name] = (c.blue(), c.green(), c.red())
+        colormap, colorbar = self.current_palette, dialog.chk_colorbar.isChecked()
+        self.run_job("Exportando vídeo...",
+                     lambda progress, cancel: self.model.export_video(path, colormap, start, stop, step, v_range,
+                                                                      colorbar=colorbar, rois=rois, roi_colors=colors,
+                                                                      progress=progress, cancel=cancel),
+                     lambda result: result and QMessageBox.information(self, "Sucesso", "Vídeo exportado com sucesso!"))
+
+    def index_recording(self):
+        if not self.model.source or not self.model.path:
+            QMessageBox.warning(self, "Aviso", "Nenhum termograma carregado para indexar.")
+            return
+        if self.model.is_indexed:
+            QMessageBox.information(self, "Indexar", "Esta gravação já está indexada.")
+            return
+        # Só counts (as unidades do usuário saem deles); a unidade de fábrica em uso também entra no cubo
+        units = [UNIT_COUNTS]
+        if self.model.active_user_unit is None and self.model.source.unit != UNIT_COUNTS:
+            units.append(self.model.source.unit)
+        self.run_job("Indexando gravação...",
+                     lambda progress, cancel: self.model.convert_to_cube(progress, cancel, units),
+                     self.on_recording_indexed)
+
+    def on_recording_indexed(self, converted):
+        if converted:
+            if not self.model.reopen_indexed():
+                self.btn_unit.setText("Counts")
+            self.update_unit_menu()
+            self.refresh_thumbnails()
+            self.refresh_frame_times() # O cubo guarda os tempos de cada frame
+            if not self.timer.isActive(): self.update_frame()
+
+    def extract_roi_series(self):
+        if not self.model.source:
+            QMessageBox.warning(self, "Aviso", "Nenhum termograma carregado.")
+            return
+        if not len(self.video_widget.roi_manager):
+            QMessageBox.warning(self, "Aviso", "Desenhe ao menos um ROI para extrair a série temporal.")
+            return
+        # Cópia dos ROIs: editar a cena durante a extração não afeta o resultado
+        rois = copy.deepcopy(self.video_widget.roi_manager)
+        colors = {name: self.video_widget.roi_items[name][0].pen().color() for name in rois.rois}
+        unit = self.model.current_unit_label
+        self.run_job("Extraindo séries dos ROIs...",
+                     lambda progress, cancel: self.model.extract_roi_series(rois, progress=progress, cancel=cancel),
+                     lambda table: self.on_roi_series_extracted(table, colors, unit))
+
+    def on_roi_series_extracted(self, table, colors, unit):
+        if table is None: return # Cancelado
+        dialog = SeriesDialog(table, colors, unit, self.model.file_name, self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.show()
+
+    def select_tool(self, mode):
+        self.video_widget.set_roi_mode(mode)
+        if mode == "Probe":
+            self.probe_dock.show()
+
+    def update_probe(self, pins):
+        # Só a extração mais recente interessa: fixar outro pixel cancela a anterior
+        if self.probe_job is not None:
+            self.probe_job.cancel()
+            self.probe_job = None
+        if not pins or not self.model.source:
+            self.probe_table = None
+            self.probe_plot.set_data([], [])
+            self.lbl_probe.setText("Clique no vídeo com a ferramenta Probe para fixar pixels")
+            return
+        self.probe_dock.show()
+        self.lbl_probe.setText("Extraindo série dos pixels...")
+        pins = list(pins)
+        started = time.perf_counter()
+        job = BackgroundJob(lambda progress, cancel: self.model.extract_pixel_series(pins, progress=progress,
+                                                                                     cancel=cancel), self)
+        job.progress.connect(lambda done, total: self.lbl_probe.setText(
+            f"Extraindo série dos pixels... {100 * done // max(total, 1)}%"))
+        job.succeeded.connect(lambda table: self.on_probe_extracted(table, pins, time.perf_counter() - started))
+        job.failed.connect(lambda msg: self.lbl_probe.setText(f"Erro: {msg}"))
+        job.finished.connect(lambda: self.jobs.remove(job))
+        self.jobs.append(job)
+        self.probe_job = job
+        job.start()
+
+    def on_probe_extracted(self, table, pins, elapsed):
+        if table is None or pins != self.video_widget.pins: return # Cancelado ou já substituído
+        self.probe_job = None
+        self.probe_table = table
+        unit = self.model.current_unit_label
+        if np.isfinite(table["time"]).all():
+            x, x_label = table["time"], "Time (s)"
+        else:
+            x, x_label = table["frame"], "Frame"
+        series = [(f"P{i + 1} ({px}, {py}) {unit}".strip(), table[pixel_column(px, py)], color)
+                  for i, ((px, py), color) in enumerate(zip(pins, self.video_widget.pin_colors()))]
+        self.probe_plot.set_data(x, series, x_label)
+        self.lbl_probe.setText(f"{len(pins)} pixel(s), {len(table['frame'])} frames em {elapsed * 1000:.0f} ms")
+
+    def export_probe_csv(self):
+        if self.probe_table is None:
+            QMessageBox.warning(self, "Aviso", "Nenhum pixel fixado.")
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Salvar CSV", f"{self.model.file_name}_pixel_probe.csv",
+                                              "CSV (*.csv)")
+        if path:
+            write_series_csv(path, self.probe_table)
+            QMessageBox.information(self, "Sucesso", "CSV Exportado com sucesso!")
+
+    def run_job(self, title, fn, on_done):
+        # Roda fn(progress, cancel) numa QThread com uma barra de progresso cancelável
+        dialog = QProgressDialog(title, "Cancelar", 0, 100, self)
+        dialog.setMinimumDuration(0)
+        job = BackgroundJob(fn, self)
+        job.progress.connect(lambda done, total: (dialog.setMaximum(total), dialog.setValue(done)))
+        dialog.canceled.connect(job.cancel)
+        job.succeeded.connect(lambda result: (dialog.reset(), on_done(result)))
+        job.failed.connect(lambda msg: (dialog.reset(), QMessageBox.warning(self, "Erro", msg)))
+        job.finished.connect(lambda: self.jobs.remove(job))
+        self.jobs.append(job)
+        job.start()
+        return job
+
     def update_cursor_data(self, x, y):
         # Atualiza as coordenadas na tela
         self.lbl_cursor_pos.setText(f"X: {x}, Y: {y}")
@@ -427,27 +1089,67 @@ class MainWindow(QMainWindow):
             self.lbl_cursor_val.setText("Value: -")
 
     def update_roi_stats(self, mean_val, std_val):
-        # Esta função recebe os dois floats emitidos pelo sinal stats_updated
+        # Esta função recebe os dois floats emitidos pelo sinal stats_updated (ROI em desenho)
         if mean_val == 0.0 and std_val == 0.0:
-            self.lbl_roi_mean.setText("Mean: -")
-            self.lbl_roi_std.setText("Std Dev: -")
+            self.lbl_roi_live.setText("Drawing: -")
         else:
-            self.lbl_roi_mean.setText(f"Mean: {mean_val:.2f}")
-            self.lbl_roi_std.setText(f"Std Dev: {std_val:.2f}")
+            self.lbl_roi_live.setText(f"Drawing: Mean {mean_val:.2f}, Std Dev {std_val:.2f}")
+
+    def update_roi_table(self, table):
+        # Recebe as colunas do RoiManager.compute; os itens da tabela são reaproveitados
+        names = table["name"]
+        self.roi_table.setRowCount(len(names))
+        for col, (_, key) in enumerate(ROI_TABLE_COLUMNS):
+            values = table.get(key)
+            for row in range(len(names)):
+                if key == "name":
+                    text = names[row]
+                elif values is None or np.isnan(values[row]):
+                    text = "-"
+                else:
+                    text = f"{values[row]:.2f}"
+                item = self.roi_table.item(row, col)
+                if item is None:
+                    item = QTableWidgetItem()
+                    self.roi_table.setItem(row, col, item)
+                if item.text() != text:
+                    item.setText(text)
+
+    def show_roi_menu(self, pos):
+        menu = QMenu(self)
+        rows = sorted({index.row() for index in self.roi_table.selectedIndexes()})
+        names = [self.roi_table.item(row, 0).text() for row in rows]
+        remove = menu.addAction("Remover ROI selecionado")
+        remove.setEnabled(bool(names))
+        clear = menu.addAction("Remover todos os ROIs")
+        action = menu.exec(self.roi_table.viewport().mapToGlobal(pos))
+        if action == remove:
+            for name in names:
+                self.video_widget.remove_roi(name)
+        elif action == clear:
+            self.video_widget.clear_rois()
+
 
+    def closeEvent(self, event):
+        # Para o player e encerra as threads de pré-decodificação antes de sair
+        self.timer.stop()
+        for job in list(self.jobs):
+            job.cancel(); job.wait()
+        self.model.close()
+        super().closeEvent(event)
 
     def toggle_side_panel(self):
         # Descobre qual é a largura atual do painel
         width = self.side_panel_container.maximumWidth()
         
         if width == 0:
-            # Se está fechado (0), anima até abrir (180)
+            # Se está fechado (0), anima até abrir
             self.panel_animation.setStartValue(0)
-            self.panel_animation.setEndValue(180)
-            self.side_panel_container.setMinimumWidth(180) # Impede que o conteúdo esmague
+            self.panel_animation.setEndValue(self.side_panel_width)
+            self.side_panel_container.setMinimumWidth(self.side_panel_width) # Impede que o conteúdo esmague
         else:
-            # Se está aberto (180), anima até fechar (0)
-            self.panel_animation.setStartValue(180)
+            # Se está aberto, anima até fechar (0)
+            self.panel_animation.setStartValue(self.side_panel_width)
             self.panel_animation.setEndValue(0)
             self.side_panel_container.setMinimumWidth(0)
             
@@ -470,6 +1172,8 @@ class MainWindow(QMainWindow):
         dialog = CalibrationDialog(self.model, self)
         if dialog.exec(): # Se o usuário clicar em "Save && Apply"
             self.update_unit_menu() # Recarrega o menu para mostrar a nova unidade
+            self.refresh_frame_stats() # Coeficientes novos mudam os valores da unidade do usuário
+            self.update_probe(self.video_widget.pins)
             if not self.timer.isActive(): 
                 self.update_frame() # Atualiza as cores do vídeo imediatamente
 
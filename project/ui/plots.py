@@ -0,0 +1,130 @@
+import numpy as np
+from PySide6.QtWidgets import QWidget
+from PySide6.QtGui import QPainter, QPen, QColor, QPolygonF
+from PySide6.QtCore import Qt, QPointF, QRectF
+
+
+class SeriesPlot(QWidget):
+    """
+    Gráfico de linhas leve (QPainter puro) para séries longas.
+    Séries com mais pontos que pixels são reduzidas a mínimo/máximo por coluna
+    de pixel, então o desenho não depende do número de frames.
+    """
+    MARGIN_LEFT, MARGIN_RIGHT, MARGIN_TOP, MARGIN_BOTTOM = 72, 10, 10, 24
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumSize(400, 220)
+        self.x = None
+        self.series = [] # Lista de (nome, valores, QColor)
+        self.x_label = ""
+
+    def set_data(self, x, series, x_label=""):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.series = [(name, np.asarray(y, dtype=np.float64), color) for name, y, color in series]
+        self.x_label = x_label
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#0a0a0a"))
+        plot = QRectF(self.MARGIN_LEFT, self.MARGIN_TOP,
+                      self.width() - self.MARGIN_LEFT - self.MARGIN_RIGHT,
+                      self.height() - self.MARGIN_TOP - self.MARGIN_BOTTOM)
+        painter.setPen(QPen(QColor("#333333")))
+        painter.drawRect(plot)
+        if self.x is None or len(self.x) < 2 or not self.series or plot.width() < 2:
+            painter.end()
+            return
+
+        all_y = np.concatenate([y for _, y, _ in self.series])
+        y_min, y_max = 0.0, 1.0
+        if np.isfinite(all_y).any():
+            y_min, y_max = float(np.nanmin(all_y)), float(np.nanmax(all_y))
+        if not y_max > y_min:
+            y_min, y_max = y_min - 0.5, y_max + 0.5
+        x_min, x_max = self.x[0], self.x[-1]
+        if not x_max > x_min:
+            x_max = x_min + 1
+
+        # Eixos: só os extremos, para não poluir
+        painter.setPen(QColor("#aaaaaa"))
+        painter.drawText(QRectF(0, plot.top() - 6, self.MARGIN_LEFT - 4, 14), Qt.AlignRight, f"{y_max:.2f}")
+        painter.drawText(QRectF(0, plot.bottom() - 8, self.MARGIN_LEFT - 4, 14), Qt.AlignRight, f"{y_min:.2f}")
+        painter.drawText(QRectF(plot.left(), plot.bottom() + 4, 80, 16), Qt.AlignLeft, f"{x_min:g}")
+        painter.drawText(QRectF(plot.right() - 80, plot.bottom() + 4, 80, 16), Qt.AlignRight, f"{x_max:g}")
+        painter.drawText(QRectF(plot.left(), plot.bottom() + 4, plot.width(), 16), Qt.AlignCenter, self.x_label)
+
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setClipRect(plot)
+        columns = int(plot.width())
+        for i, (name, y, color) in enumerate(self.series):
+            px, py = self._envelope(self.x, y, columns)
+            px = plot.left() + (px - x_min) / (x_max - x_min) * plot.width()
+            py = plot.bottom() - (py - y_min) / (y_max - y_min) * plot.height()
+            pen = QPen(color); pen.setWidthF(1.5)
+            painter.setPen(pen)
+            # NaN (ROI fora do frame) quebra a linha em trechos
+            valid = np.isfinite(py)
+            for run in np.split(np.arange(len(py)), np.flatnonzero(np.diff(valid)) + 1):
+                if len(run) > 1 and valid[run[0]]:
+                    painter.drawPolyline(QPolygonF([QPointF(a, b) for a, b in zip(px[run], py[run])]))
+
+            # Legenda no canto superior esquerdo
+            painter.drawText(QPointF(plot.left() + 8, plot.top() + 16 + 14 * i), name)
+        painter.end()
+
+    @staticmethod
+    def _envelope(x, y, columns):
+        # Mais pontos que colunas: um par (mínimo, máximo) por coluna preserva picos
+        if len(x) <= 2 * columns:
+            return x, y
+        edges = np.linspace(0, len(x), columns + 1).astype(np.intp)
+        starts = edges[:-1][np.diff(edges) > 0]
+        with np.errstate(invalid="ignore"):
+            lo = np.fmin.reduceat(y, starts)
+            hi = np.fmax.reduceat(y, starts)
+        px = np.repeat(x[starts], 2)
+        py = np.column_stack([lo, hi]).ravel()
+        return px, py
+
+
+class HistogramBar(QWidget):
+    """
+    Histograma vertical ao lado da colorbar: v_max em cima, v_min embaixo, mesma
+    orientação do gradiente. Contagens em escala logarítmica para que as classes com
+    poucos pixels (pontos quentes) continuem visíveis.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFixedWidth(36)
+        self.levels = None
+
+    def set_counts(self, counts):
+        if counts is None:
+            self.levels = None
+        else:
+            levels = np.log1p(np.asarray(counts, dtype=np.float64))
+            peak = levels.max()
+            self.levels = levels / peak if peak > 0 else levels
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#0a0a0a"))
+        if self.levels is not None and len(self.levels):
+            w, h = self.width() - 2, self.height()
+            n = len(self.levels)
+            # Contorno em degraus: cada classe vira um trecho vertical de altura h/n
+            ys = h - np.arange(n + 1) * (h / n)
+            xs = 1 + self.levels * w
+            points = [QPointF(1, ys[0])]
+            for i in range(n):
+                points.append(QPointF(xs[i], ys[i]))
+                points.append(QPointF(xs[i], ys[i + 1]))
+            points.append(QPointF(1, ys[-1]))
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(170, 170, 170, 160))
+            painter.drawPolygon(QPolygonF(points))
+        painter.end()
@@ -0,0 +1,208 @@
+import numpy as np
+from PySide6.QtWidgets import (QAbstractItemView, QListView, QListWidget, QListWidgetItem, QSlider, QStyle,
+                               QStyleOptionSlider, QToolTip, QWidget)
+from PySide6.QtGui import QColor, QIcon, QImage, QPainter, QPen, QPixmap, QPolygonF
+from PySide6.QtCore import Qt, QPoint, QPointF, QSize, Signal
+
+from core.frame_stats import frame_percentiles
+
+
+def thumbnail_pixmaps(strip, colorizer, colormap):
+    """
+    Colore todas as miniaturas com a paleta `colormap` numa passada só, na mesma
+    faixa (percentis 1-99 de todas elas) para que fiquem comparáveis entre si.
+    """
+    if strip is None or len(strip) == 0:
+        return []
+    count, h, w = strip.data.shape
+    v_min, v_max = (float(v) for v in frame_percentiles(strip.data, (1, 99)))
+    colorizer.set_palette(colormap)
+    # Pilha como uma imagem alta (count*h, w): o colorizador trabalha em 2D
+    packed = colorizer.colorize(strip.data.reshape(count * h, w), v_min, v_max)
+    pixmaps = []
+    for i in range(count):
+        tile = packed[i * h:(i + 1) * h]
+        image = QImage(tile.data, w, h, 4 * w, QImage.Format_RGB32)
+        pixmaps.append(QPixmap.fromImage(image)) # fromImage copia: o buffer pode ser liberado
+    return pixmaps
+
+
+class TimelineSlider(QSlider):
+    """Barra de tempo que informa o frame sob o mouse (prévia por miniatura)."""
+    hovered = Signal(int, QPoint) # Frame sob o mouse e posição global do mouse
+    left = Signal()
+
+    def __init__(self, orientation=Qt.Horizontal, parent=None):
+        super().__init__(orientation, parent)
+        self.setMouseTracking(True)
+
+    def value_at(self, x):
+        # Mesma conta do estilo para posicionar a alça: o frame bate com o que um clique escolheria
+        left, span = self._track()
+        return QStyle.sliderValueFromPosition(self.minimum(), self.maximum(), int(x - left), span)
+
+    def x_of(self, value):
+        """Posição x (coordenadas da barra) do centro da alça no valor `value`."""
+        left, span = self._track()
+        return left + QStyle.sliderPositionFromValue(self.minimum(), self.maximum(), int(value), span)
+
+    def _track(self):
+        # Trecho percorrido pelo centro da alça: início e comprimento
+        opt = QStyleOptionSlider()
+        self.initStyleOption(opt)
+        groove = self.style().subControlRect(QStyle.CC_Slider, opt, QStyle.SC_SliderGroove, self)
+        handle = self.style().subControlRect(QStyle.CC_Slider, opt, QStyle.SC_SliderHandle, self)
+        return groove.x() + handle.width() / 2, max(groove.width() - handle.width(), 1)
+
+    def mouseMoveEvent(self, event):
+        super().mouseMoveEvent(event)
+        if self.isEnabled():
+            self.hovered.emit(self.value_at(event.position().x()), event.globalPosition().toPoint())
+
+    def leaveEvent(self, event):
+        super().leaveEvent(event)
+        self.left.emit()
+
+
+class Filmstrip(QListWidget):
+    """Faixa horizontal com as miniaturas da gravação; clicar numa leva ao frame dela."""
+    frame_selected = Signal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setViewMode(QListView.IconMode)
+        self.setFlow(QListView.LeftToRight)
+        self.setWrapping(False)
+        self.setMovement(QListView.Static)
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.frames = np.zeros(0, dtype=np.int64)
+        self.itemClicked.connect(lambda item: self.frame_selected.emit(item.data(Qt.UserRole)))
+
+    def set_thumbnails(self, frames, pixmaps):
+        self.clear()
+        self.frames = np.asarray(frames, dtype=np.int64)
+        if pixmaps:
+            size = pixmaps[0].size()
+            self.setIconSize(size)
+            self.setFixedHeight(size.height() + 44)
+        for frame, pixmap in zip(self.frames, pixmaps):
+            item = QListWidgetItem(QIcon(pixmap), str(int(frame)))
+            item.setData(Qt.UserRole, int(frame))
+            item.setSizeHint(QSize(self.iconSize().width() + 8, self.iconSize().height() + 22))
+            self.addItem(item)
+
+    def set_current(self, frame_index):
+        """Destaca a miniatura do trecho do frame exibido (só rola quando ela muda)."""
+        if len(self.frames) == 0: return
+        row = max(int(np.searchsorted(self.frames, frame_index, side="right")) - 1, 0)
+        if row != self.currentRow():
+            self.setCurrentRow(row)
+            self.scrollToItem(self.item(row), QAbstractItemView.PositionAtCenter)
+
+
+class Sparkline(QWidget):
+    """
+    Resumo da gravação inteira sob a barra de tempo, alinhado a ela: o máximo de cada
+    frame (envelope preenchido, onde os eventos térmicos aparecem como picos) e a média
+    (linha), cada um na própria escala. Passar o mouse mostra os valores do frame;
+    clicar vai até ele.
+    """
+    frame_selected = Signal(int)
+
+    def __init__(self, slider, parent=None):
+        super().__init__(parent)
+        self.slider = slider
+        self.setFixedHeight(32)
+        self.setMouseTracking(True)
+        self.table = None
+        self.unit_label = ""
+        self.current = None
+        self._columns = None # (chave de geometria, x, máximo por coluna, média por coluna)
+
+    def set_stats(self, table, unit_label=""):
+        self.table = table
+        self.unit_label = unit_label
+        self._columns = None
+        self.update()
+
+    def set_current(self, frame_index):
+        # Só redesenha quando o marcador muda de pixel
+        if self.table is None:
+            self.current = frame_index
+            return
+        old = self._x(self.current) if self.current is not None else None
+        self.current = frame_index
+        if int(self._x(frame_index)) != (int(old) if old is not None else None):
+            self.update()
+
+    def _x(self, frame_index):
+        # Coordenadas da barra -> coordenadas deste widget (os dois estão na mesma coluna do layout)
+        return self.slider.x_of(frame_index) + self.slider.x() - self.x()
+
+    def _frame_at(self, x):
+        return self.slider.value_at(x - self.slider.x() + self.x())
+
+    def _reduce(self):
+        """Máximo (do máximo) e média (da média) dos frames que caem em cada coluna de pixel."""
+        frames = self.table["frame"]
+        x0, x1 = self._x(frames[0]), self._x(frames[-1])
+        key = (x0, x1, self.width())
+        if self._columns is not None and self._columns[0] == key:
+            return self._columns[1:]
+        columns = max(int(x1 - x0), 1)
+        edges = np.linspace(0, len(frames), columns + 1).astype(np.intp)
+        starts = np.unique(edges[:-1])
+        v_max = np.fmax.reduceat(self.table["max"], starts)
+        v_mean = np.add.reduceat(self.table["mean"], starts) / np.diff(np.append(starts, len(frames)))
+        xs = x0 + (x1 - x0) * starts / max(len(frames) - 1, 1)
+        self._columns = (key, xs, v_max, v_mean)
+        return xs, v_max, v_mean
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#0a0a0a"))
+        if self.table is None or len(self.table["frame"]) < 2:
+            painter.end()
+            return
+        xs, v_max, v_mean = self._reduce()
+        bottom = self.height() - 2
+
+        def y(values):
+            # Cada série na própria escala: a variação do máximo não some perto da média
+            finite = values[np.isfinite(values)]
+            lo, hi = (float(finite.min()), float(finite.max())) if len(finite) else (0.0, 0.0)
+            scale = (self.height() - 4) / (hi - lo) if hi > lo else 0.0
+            return np.where(np.isfinite(values), bottom - (values - lo) * scale, bottom)
+
+        # Envelope do máximo preenchido até a base
+        top = y(v_max)
+        outline = [QPointF(float(x), float(v)) for x, v in zip(xs, top)]
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(255, 120, 0, 150))
+        painter.drawPolygon(QPolygonF([QPointF(float(xs[0]), bottom)] + outline + [QPointF(float(xs[-1]), bottom)]))
+        painter.setPen(QPen(QColor("#dddddd"), 1))
+        painter.drawPolyline(QPolygonF([QPointF(float(x), float(v)) for x, v in zip(xs, y(v_mean))]))
+
+        if self.current is not None:
+            painter.setPen(QPen(QColor("#00aaff"), 1))
+            x = int(self._x(self.current))
+            painter.drawLine(x, 0, x, self.height())
+        painter.end()
+
+    def mouseMoveEvent(self, event):
+        if self.table is None: return
+        frame = self._frame_at(event.position().x())
+        row = int(np.clip(np.searchsorted(self.table["frame"], frame), 0, len(self.table["frame"]) - 1))
+        t, unit = self.table, self.unit_label
+        QToolTip.showText(event.globalPosition().toPoint(),
+                          f"Frame {int(t['frame'][row])}\n"
+                          f"Máx {t['max'][row]:.2f} {unit} em ({t['hot_x'][row]:.0f}, {t['hot_y'][row]:.0f})\n"
+                          f"Média {t['mean'][row]:.2f} ± {t['std'][row]:.2f} {unit}\n"
+                          f"Mín {t['min'][row]:.2f} {unit}", self)
+
+    def mousePressEvent(self, event):
+        if self.table is not None and event.button() == Qt.LeftButton:
+            self.frame_selected.emit(self._frame_at(event.position().x()))
@@ -1,12 +1,48 @@
-import cv2
 import numpy as np
-from PySide6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsPixmapItem, QGraphicsRectItem, QGraphicsEllipseItem
-from PySide6.QtGui import QImage, QPixmap, QPen, QColor, QWheelEvent, QMouseEvent
+from PySide6.QtWidgets import QLabel, QWidget, QGraphicsView, QGraphicsScene, QGraphicsItem, QGraphicsRectItem, QGraphicsEllipseItem
+from PySide6.QtGui import QImage, QPen, QColor, QPolygonF, QWheelEvent, QMouseEvent
 from PySide6.QtCore import Qt, Signal, QRectF
 
+from core.colorize import Colorizer
+from core.roi_manager import RoiManager
+from core.roi_stats import RoiStatsEngine
+from utils.config import COMPUTE_PRECISION, USE_OPENGL_VIEWPORT
+from utils.profiling import TRACER
+
+# Cores dos ROIs, em ordem de criação
+ROI_COLORS = [QColor(0, 255, 0), QColor(0, 200, 255), QColor(255, 210, 0),
+              QColor(255, 80, 200), QColor(255, 120, 40), QColor(170, 130, 255)]
+
+class FrameItem(QGraphicsItem):
+    """
+    Item que desenha um QImage persistente sem passar por QPixmap.
+    Só a parte exposta é desenhada, então zoom e pan não re-rasterizam o frame inteiro.
+    """
+    def __init__(self):
+        super().__init__()
+        self.image = QImage()
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption) # Habilita option.exposedRect
+
+    def set_image(self, image):
+        if image.size() != self.image.size():
+            self.prepareGeometryChange()
+        self.image = image
+        self.update()
+
+    def boundingRect(self):
+        return QRectF(0, 0, self.image.width(), self.image.height())
+
+    def paint(self, painter, option, widget=None):
+        if self.image.isNull(): return
+        with TRACER.span("paint"):
+            rect = option.exposedRect.toAlignedRect().intersected(self.image.rect())
+            painter.drawImage(rect, self.image, rect)
+
 class ThermalVideoWidget(QGraphicsView):
     pixel_hovered = Signal(int, int)
-    stats_updated = Signal(float, float) # Emite (Média, Desvio Padrão)
+    stats_updated = Signal(float, float) # Emite (Média, Desvio Padrão) do ROI sendo desenhado
+    rois_updated = Signal(object) # Emite a tabela do RoiManager.compute (colunas por estatística)
+    pins_updated = Signal(object) # Emite a lista de pixels fixados [(x, y), ...] (ferramenta "Probe")
 
     def __init__(self):
         super().__init__()
@@ -19,43 +55,171 @@ class ThermalVideoWidget(QGraphicsView):
         self.setDragMode(QGraphicsView.ScrollHandDrag)
         self.setStyleSheet("background-color: #000000; border: none;")
 
-        self.pixmap_item = QGraphicsPixmapItem()
-        self.scene.addItem(self.pixmap_item)
+        self.frame_item = FrameItem()
+        self.scene.addItem(self.frame_item)
+        self.opengl = False
+        if USE_OPENGL_VIEWPORT:
+            self.set_opengl_viewport(True)
+
+        # HUD de desempenho sobreposto ao vídeo (fps e ms por etapa), desligado por padrão
+        self.hud = QLabel(self)
+        self.hud.setStyleSheet("background-color: rgba(0, 0, 0, 170); color: #7CFC00; padding: 6px;"
+                               "font-family: monospace; font-size: 11px;")
+        self.hud.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.hud.move(8, 8)
+        self.hud.hide()
 
+        self.colorizer = Colorizer()
+        self.argb = None # Buffer 0xffRRGGBB reaproveitado entre frames do mesmo tamanho
+        self.image = None # QImage que aponta para self.argb (sem cópia)
+
+        self.roi_engine = RoiStatsEngine(COMPUTE_PRECISION) # Estatísticas ao vivo do ROI sendo desenhado
+        self.roi_manager = RoiManager(dtype=COMPUTE_PRECISION) # ROIs já desenhados, calculados juntos a cada frame
+        self.roi_items = {} # Nome do ROI -> (item da forma, rótulo com o nome)
         self.raw_data = None
-        self.current_roi = None
-        self.roi_type = "None" # Pode ser "None", "Rect" ou "Circle"
+        self.current_roi = None # ROI em desenho (ainda fora do gerenciador)
+        self.roi_type = "None" # Pode ser "None", "Rect", "Circle", "Polygon" ou "Probe"
         self.start_pos = None
+        self.polygon_points = [] # Vértices do polígono em desenho
+        self.pins = [] # Pixels fixados para a série temporal: lista de (x, y)
+        self.pin_items = [] # Marcador (cruz + rótulo) de cada pixel fixado
 
-    def update_image(self, raw_data, colormap):
-        self.raw_data = raw_data
-        if self.raw_data is None: return
+    def update_image(self, raw_data, colormap, v_min=None, v_max=None, preview=False):
+        # `preview`: prévia do seek em baixa resolução, só a imagem (ROIs e leitura do cursor esperam o frame completo)
+        if not preview:
+            self.raw_data = raw_data
+            if self.raw_data is None: return
+            self.roi_engine.set_frame(raw_data)
+        if v_min is None or v_max is None:
+            v_min, v_max = np.min(raw_data), np.max(raw_data)
 
-        # Normaliza e aplica cor
-        norm = cv2.normalize(self.raw_data, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
-        color = cv2.applyColorMap(norm, colormap)
-        rgb = cv2.cvtColor(color, cv2.COLOR_BGR2RGB)
+        # Buffer e QImage só são recriados quando o tamanho do frame muda
+        if self.argb is None or self.argb.shape != raw_data.shape:
+            h, w = raw_data.shape
+            self.argb = np.empty((h, w), dtype=np.uint32)
+            self.image = QImage(self.argb.data, w, h, 4 * w, QImage.Format_RGB32)
+            self.scene.setSceneRect(0, 0, w, h)
 
-        h, w, ch = rgb.shape
-        qimg = QImage(rgb.data, w, h, ch * w, QImage.Format_RGB888)
-        self.pixmap_item.setPixmap(QPixmap.fromImage(qimg))
-        
-        # Atualiza os cálculos caso exista um ROI desenhado
-        self.calculate_roi_stats()
+        # Mapeia [v_min, v_max] na paleta numa passada só, direto no buffer de exibição.
+        # Valores fora da faixa recebem a cor extrema da paleta (isoterma)
+        with TRACER.span("colorize"):
+            self.colorizer.set_palette(colormap)
+            self.colorizer.colorize(raw_data, v_min, v_max, out=self.argb)
+
+        # bits() não copia nada, mas muda o cacheKey do QImage: caches de textura
+        # (viewport OpenGL) sabem que o conteúdo mudou. O desenho em si aparece como "paint"
+        with TRACER.span("upload"):
+            self.image.bits()
+            self.frame_item.set_image(self.image)
+
+        # Atualiza os cálculos dos ROIs desenhados
+        if not preview:
+            with TRACER.span("roi_stats"):
+                self.calculate_roi_stats()
+
+    def set_precision(self, precision):
+        """Precisão (float32/float64) do trabalho por pixel dos ROIs; as somas seguem em float64."""
+        self.roi_engine.dtype = self.roi_manager.dtype = np.dtype(precision)
+        self.roi_engine.set_frame(self.raw_data) # Tabelas montadas na precisão anterior deixam de valer
+
+    def set_hud_text(self, text):
+        self.hud.setText(text)
+        self.hud.adjustSize()
+
+    def set_opengl_viewport(self, enabled):
+        """
+        Troca o viewport por um QOpenGLWidget: o frame vira uma textura e zoom/pan
+        ficam por conta da GPU (ou do rasterizador em software, ex: LIBGL_ALWAYS_SOFTWARE=1).
+        """
+        if enabled == self.opengl: return
+        if enabled:
+            try:
+                from PySide6.QtOpenGLWidgets import QOpenGLWidget
+            except ImportError:
+                return
+            self.setViewport(QOpenGLWidget())
+            # Com OpenGL o quadro inteiro é redesenhado a cada atualização
+            self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        else:
+            self.setViewport(QWidget())
+            self.setViewportUpdateMode(QGraphicsView.MinimalViewportUpdate)
+        self.setStyleSheet("background-color: #000000; border: none;")
+        self.opengl = enabled
 
     def set_roi_mode(self, mode):
+        # Trocar de ferramenta só descarta o ROI em desenho; os já criados continuam na cena
+        self.cancel_drawing()
         self.roi_type = mode
         if mode == "None":
             self.setDragMode(QGraphicsView.ScrollHandDrag)
-            self.clear_roi()
         else:
             self.setDragMode(QGraphicsView.NoDrag) # Desativa o Pan para poder desenhar
 
-    def clear_roi(self):
+    def cancel_drawing(self):
         if self.current_roi:
             self.scene.removeItem(self.current_roi)
             self.current_roi = None
             self.stats_updated.emit(0.0, 0.0)
+        self.start_pos = None
+        self.polygon_points = []
+
+    def remove_roi(self, name):
+        items = self.roi_items.pop(name, None)
+        if items is None: return
+        for item in items:
+            self.scene.removeItem(item)
+        self.roi_manager.remove(name)
+        if len(self.roi_manager):
+            self.calculate_roi_stats()
+        else:
+            self.rois_updated.emit({"name": []})
+
+    def clear_rois(self):
+        self.cancel_drawing()
+        for items in self.roi_items.values():
+            for item in items:
+                self.scene.removeItem(item)
+        self.roi_items.clear()
+        self.roi_manager.clear()
+        self.rois_updated.emit({"name": []})
+
+    def add_pin(self, x, y):
+        if (x, y) in self.pins: return
+        color = ROI_COLORS[len(self.pins) % len(ROI_COLORS)]
+        pen = QPen(color); pen.setCosmetic(True) # Espessura constante em qualquer zoom
+        # Cruz centrada no pixel
+        cx, cy = x + 0.5, y + 0.5
+        cross_h = self.scene.addLine(cx - 4, cy, cx + 4, cy, pen)
+        cross_v = self.scene.addLine(cx, cy - 4, cx, cy + 4, pen)
+        label = self.scene.addSimpleText(f"P{len(self.pins) + 1}")
+        label.setBrush(color)
+        label.setPos(cx + 3, cy - label.boundingRect().height() - 2)
+        self.pins.append((x, y))
+        self.pin_items.append((cross_h, cross_v, label))
+        self.pins_updated.emit(list(self.pins))
+
+    def remove_pin(self, index):
+        for item in self.pin_items.pop(index):
+            self.scene.removeItem(item)
+        self.pins.pop(index)
+        # Renumera e recolore os restantes para casarem com as séries do gráfico (P1, P2...)
+        for i, (cross_h, cross_v, label) in enumerate(self.pin_items):
+            color = ROI_COLORS[i % len(ROI_COLORS)]
+            pen = QPen(color); pen.setCosmetic(True)
+            cross_h.setPen(pen); cross_v.setPen(pen)
+            label.setText(f"P{i + 1}"); label.setBrush(color)
+        self.pins_updated.emit(list(self.pins))
+
+    def clear_pins(self):
+        for items in self.pin_items:
+            for item in items:
+                self.scene.removeItem(item)
+        self.pins.clear()
+        self.pin_items.clear()
+        self.pins_updated.emit([])
+
+    def pin_colors(self):
+        return [ROI_COLORS[i % len(ROI_COLORS)] for i in range(len(self.pins))]
 
     # --- EVENTOS DE MOUSE (ZOOM E DESENHO) ---
 
@@ -69,12 +233,30 @@ class ThermalVideoWidget(QGraphicsView):
             self.scale(zoom_out_factor, zoom_out_factor)
 
     def mousePressEvent(self, event: QMouseEvent):
-        if self.roi_type != "None" and event.button() == Qt.LeftButton:
-            self.clear_roi()
+        if self.roi_type == "Probe" and event.button() in (Qt.LeftButton, Qt.RightButton):
+            # Probe: clique fixa o pixel, botão direito remove o fixado mais próximo
+            pos = self.mapToScene(event.position().toPoint())
+            x, y = int(pos.x()), int(pos.y())
+            if event.button() == Qt.RightButton:
+                if self.pins:
+                    dist = [(px - x) ** 2 + (py - y) ** 2 for px, py in self.pins]
+                    self.remove_pin(int(np.argmin(dist)))
+            elif self.raw_data is not None and 0 <= x < self.raw_data.shape[1] and 0 <= y < self.raw_data.shape[0]:
+                self.add_pin(x, y)
+        elif self.roi_type == "Polygon" and event.button() in (Qt.LeftButton, Qt.RightButton):
+            # Polígono: cada clique adiciona um vértice, botão direito fecha
+            if event.button() == Qt.RightButton:
+                self.finish_polygon()
+                return
+            pos = self.mapToScene(event.position().toPoint())
+            self.polygon_points.append(pos)
+            if self.current_roi is None:
+                self.current_roi = self.scene.addPolygon(QPolygonF(self.polygon_points), self._next_pen())
+            else:
+                self.current_roi.setPolygon(QPolygonF(self.polygon_points))
+        elif self.roi_type != "None" and event.button() == Qt.LeftButton:
             self.start_pos = self.mapToScene(event.position().toPoint())
-            
-            pen = QPen(QColor(0, 255, 0)) # Borda verde
-            pen.setWidth(2)
+            pen = self._next_pen()
             
             if self.roi_type == "Rect":
                 self.current_roi = self.scene.addRect(QRectF(self.start_pos, self.start_pos), pen)
@@ -83,6 +265,13 @@ class ThermalVideoWidget(QGraphicsView):
         else:
             super().mousePressEvent(event)
 
+    def mouseDoubleClickEvent(self, event: QMouseEvent):
+        # O primeiro clique do duplo-clique já adicionou o último vértice
+        if self.roi_type == "Polygon" and event.button() == Qt.LeftButton:
+            self.finish_polygon()
+        else:
+            super().mouseDoubleClickEvent(event)
+
     def mouseMoveEvent(self, event: QMouseEvent):
         # Emite a posição do pixel para o MainWindow
         scene_pos = self.mapToScene(event.position().toPoint())
@@ -91,47 +280,69 @@ class ThermalVideoWidget(QGraphicsView):
             self.pixel_hovered.emit(x, y)
 
         # Atualiza o desenho do ROI
-        if self.current_roi and self.start_pos and event.buttons() == Qt.LeftButton:
-            current_pos = scene_pos
-            rect = QRectF(self.start_pos, current_pos).normalized()
-            if self.roi_type == "Rect":
-                self.current_roi.setRect(rect)
-            elif self.roi_type == "Circle":
-                self.current_roi.setRect(rect)
+        if self.roi_type == "Polygon" and self.current_roi:
+            # Aresta provisória até o cursor
+            self.current_roi.setPolygon(QPolygonF(self.polygon_points + [scene_pos]))
+        elif self.current_roi and self.start_pos and event.buttons() == Qt.LeftButton:
+            rect = QRectF(self.start_pos, scene_pos).normalized()
+            self.current_roi.setRect(rect)
+            # Estatísticas ao vivo enquanto arrasta (tabelas de área somada reaproveitadas)
+            self.calculate_drawing_stats()
         else:
             super().mouseMoveEvent(event)
 
     def mouseReleaseEvent(self, event: QMouseEvent):
-        if self.current_roi and event.button() == Qt.LeftButton:
-            self.calculate_roi_stats()
+        if self.roi_type in ("Rect", "Circle") and self.current_roi and event.button() == Qt.LeftButton:
+            rect = self.current_roi.rect()
+            if rect.width() >= 1 and rect.height() >= 1:
+                self._add_roi(self.roi_type, (rect.left(), rect.top(), rect.right(), rect.bottom()))
+            else:
+                self.cancel_drawing() # Clique sem arrastar
+            return
         super().mouseReleaseEvent(event)
 
-    # --- LÓGICA MATEMÁTICA ---
+    def finish_polygon(self):
+        if len(self.polygon_points) < 3:
+            self.cancel_drawing()
+            return
+        self.current_roi.setPolygon(QPolygonF(self.polygon_points))
+        self._add_roi("Polygon", [(p.x(), p.y()) for p in self.polygon_points])
 
-    def calculate_roi_stats(self):
-        if not self.current_roi or self.raw_data is None: return
+    def _next_pen(self):
+        pen = QPen(ROI_COLORS[len(self.roi_items) % len(ROI_COLORS)])
+        pen.setWidth(2)
+        return pen
 
-        rect = self.current_roi.rect()
-        x1, y1 = int(max(0, rect.left())), int(max(0, rect.top()))
-        x2, y2 = int(min(self.raw_data.shape[1], rect.right())), int(min(self.raw_data.shape[0], rect.bottom()))
+    def _add_roi(self, kind, geometry):
+        # Passa o ROI em desenho para o gerenciador, com um rótulo com o nome acima dele
+        name = self.roi_manager.add(kind, geometry)
+        item = self.current_roi
+        label = self.scene.addSimpleText(name)
+        label.setBrush(item.pen().color())
+        top_left = item.boundingRect().topLeft()
+        label.setPos(top_left.x(), top_left.y() - label.boundingRect().height())
+        self.roi_items[name] = (item, label)
+        self.current_roi = None
+        self.start_pos = None
+        self.polygon_points = []
+        self.stats_updated.emit(0.0, 0.0)
+        self.calculate_roi_stats()
 
-        if x1 >= x2 or y1 >= y2: return # Seleção vazia
+    # --- LÓGICA MATEMÁTICA ---
 
-        roi_data = self.raw_data[y1:y2, x1:x2]
+    def calculate_roi_stats(self):
+        # Todos os ROIs numa passada vetorizada; a tabela vai para o painel lateral
+        if self.raw_data is None: return
+        self.calculate_drawing_stats()
+        if len(self.roi_manager):
+            self.rois_updated.emit(self.roi_manager.compute(self.raw_data))
 
-        if self.roi_type == "Circle":
-            # Cria uma máscara circular para o array NumPy
-            h, w = roi_data.shape
-            cx, cy = w / 2, h / 2
-            a, b = w / 2, h / 2 # Raios da elipse
-            Y, X = np.ogrid[:h, :w]
-            mask = ((X - cx)**2 / (a**2 + 1e-6) + (Y - cy)**2 / (b**2 + 1e-6)) <= 1
-            valid_pixels = roi_data[mask]
-        else:
-            # Retângulo (usa todos os pixels do slice)
-            valid_pixels = roi_data
+    def calculate_drawing_stats(self):
+        if self.roi_type not in ("Rect", "Circle") or not self.current_roi or self.raw_data is None: return
 
-        if valid_pixels.size > 0:
-            mean_val = np.mean(valid_pixels)
-            std_val = np.std(valid_pixels)
-            self.stats_updated.emit(mean_val, std_val)
\ No newline at end of file
+        rect = self.current_roi.rect()
+        # O motor recorta o ROI aos limites do frame; elipses usam máscaras em cache
+        result = self.roi_engine.stats(self.roi_type, rect.left(), rect.top(), rect.right(), rect.bottom())
+        if result is not None:
+            mean_val, std_val = result
+            self.stats_updated.emit(mean_val, std_val)
@@ -1,5 +1,5 @@
 # utils/__init__.py
-from .config import PALETTES, BG_COLOR, PANEL_COLOR, TEXT_COLOR
+from .config import PALETTES, PALETTE_BITS, BG_COLOR, PANEL_COLOR, TEXT_COLOR
 from .theme import MODERN_DARK_THEME
 
-__all__ = ["PALETTES", "BG_COLOR", "PANEL_COLOR", "TEXT_COLOR", "MODERN_DARK_THEME"]
\ No newline at end of file
+__all__ = ["PALETTES", "PALETTE_BITS", "BG_COLOR", "PANEL_COLOR", "TEXT_COLOR", "MODERN_DARK_THEME"]
\ No newline at end of file
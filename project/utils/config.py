@@ -1,3 +1,4 @@
+import os
 import cv2
 
 # --- CONFIGURAÇÃO DE CORES (Estilo Dark) ---
@@ -14,4 +15,45 @@ PALETTES = {
     "Rainbow": cv2.COLORMAP_RAINBOW,
     "Viridis": cv2.COLORMAP_VIRIDIS,
     "Bone (P&B)": cv2.COLORMAP_BONE,
-}
\ No newline at end of file
+}
+
+# Resolução das tabelas de cor: 8 bits = 256 cores do OpenCV; 12 bits = 4096 cores interpoladas
+PALETTE_BITS = 8
+
+# Reprodução: taxa usada quando a gravação não informa os tempos dos frames, e
+# limite de redesenhos por segundo (acima disso o agendador pula frames)
+DEFAULT_FPS = 30.0
+MAX_DISPLAY_FPS = 120
+
+# Escala automática: percentis do modo "recorte por percentil", peso do frame novo no
+# modo suavizado e passo da amostragem usada nas estimativas durante a reprodução
+AUTOSCALE_PERCENTILES = (1, 99)
+AUTOSCALE_SMOOTHING = 0.1
+AUTOSCALE_STRIDE = 4
+
+# Classes do histograma ao lado da colorbar (e da equalização de histograma)
+HISTOGRAM_BINS = 256
+
+# Precisão dos frames em ponto flutuante (calibração do usuário, cache, ROIs). THERMAL_VIEWER_PRECISION=float32
+# ocupa metade da memória e da banda e sobra para sensores de 14-16 bits; as somas (média, desvio) seguem em float64.
+PRECISION_CHOICES = ("float32", "float64")
+COMPUTE_PRECISION = os.environ.get("THERMAL_VIEWER_PRECISION", "float64")
+if COMPUTE_PRECISION not in PRECISION_CHOICES:
+    raise ValueError(f"THERMAL_VIEWER_PRECISION inválida: '{COMPUTE_PRECISION}' (use float32 ou float64)")
+
+# Miniaturas da gravação (filmstrip e prévia na barra de tempo): no máximo THUMBNAIL_COUNT
+# por gravação, com THUMBNAIL_WIDTH pixels de largura
+THUMBNAIL_COUNT = 400
+THUMBNAIL_WIDTH = 80
+
+# Instrumentação das etapas do frame (HUD/trace): ligada desde o início com
+# THERMAL_VIEWER_TRACE=1 e limitada aos últimos TRACE_CAPACITY eventos
+TRACE_ENABLED = os.environ.get("THERMAL_VIEWER_TRACE", "0") == "1"
+TRACE_CAPACITY = 200_000
+
+# Relatório de tempos da inicialização (até a primeira janela) no stderr: THERMAL_VIEWER_STARTUP=1,
+# ou THERMAL_VIEWER_STARTUP=quit para fechar logo depois (medições automatizadas)
+STARTUP_REPORT = os.environ.get("THERMAL_VIEWER_STARTUP", "0")
+
+# Viewport OpenGL no vídeo (frame enviado como textura). Pode ser ligado com THERMAL_VIEWER_OPENGL=1
+USE_OPENGL_VIEWPORT = os.environ.get("THERMAL_VIEWER_OPENGL", "0") == "1"
\ No newline at end of file
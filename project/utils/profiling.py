@@ -0,0 +1,143 @@
+import collections
+import json
+import os
+import threading
+import time
+
+from utils.config import TRACE_ENABLED, TRACE_CAPACITY
+
+
+class _NullSpan:
+    """Span do tracer desligado: entrar e sair não fazem nada."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "start")
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+
+class Tracer:
+    """
+    Marca a duração de cada etapa do pipeline de frames (`with TRACER.span("colorize"):`).
+
+    Desligado, span() devolve sempre o mesmo objeto vazio: o custo é uma chamada de
+    método. Ligado, cada span vira um evento (nome, início, duração, thread) num buffer
+    circular de `capacity` eventos, de onde saem o resumo do HUD e o trace no formato
+    Chrome trace-event (chrome://tracing, Perfetto).
+    """
+
+    def __init__(self, capacity=TRACE_CAPACITY, enabled=False):
+        self.enabled = enabled
+        self.events = collections.deque(maxlen=capacity)
+        self.origin = time.perf_counter_ns()
+        self._lock = threading.Lock() # Threads de pré-decodificação também gravam spans
+
+    def span(self, name):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name, start_ns, end_ns):
+        thread = threading.current_thread()
+        with self._lock:
+            self.events.append((name, start_ns, end_ns - start_ns, thread.ident, thread.name))
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+
+    def clear(self):
+        with self._lock:
+            self.events.clear()
+
+    def summary(self, window=1.0, thread=None):
+        """
+        Tempo médio (ms) e contagem de cada etapa nos últimos `window` segundos:
+        {nome: (média_ms, contagem)}. Com `thread` (ident), só os spans dessa thread.
+        """
+        cutoff = time.perf_counter_ns() - int(window * 1e9)
+        totals = {}
+        with self._lock:
+            for name, start, duration, tid, _ in reversed(self.events):
+                if start < cutoff:
+                    break
+                if thread is not None and tid != thread:
+                    continue
+                total, count = totals.get(name, (0, 0))
+                totals[name] = (total + duration, count + 1)
+        return {name: (total / count / 1e6, count) for name, (total, count) in totals.items()}
+
+    def export_chrome_trace(self, path):
+        """Grava os eventos em JSON trace-event (eventos "X" com início e duração em µs)."""
+        with self._lock:
+            events = list(self.events)
+        pid = os.getpid()
+        trace = []
+        threads = {}
+        for name, start, duration, tid, thread_name in events:
+            threads[tid] = thread_name
+            trace.append({"name": name, "cat": "frame", "ph": "X", "pid": pid, "tid": tid,
+                          "ts": (start - self.origin) / 1000, "dur": duration / 1000})
+        # Metadados: nome de cada thread na linha do tempo
+        for tid, thread_name in threads.items():
+            trace.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}})
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+
+class StartupTimer:
+    """
+    Marcos da inicialização (imports, QApplication, janela, primeiro desenho) para
+    acompanhar o tempo até a primeira janela. Cada etapa vai do marco anterior até
+    mark(nome) e também vira um span no `tracer`, se ele estiver ligado.
+    """
+
+    def __init__(self, tracer=None):
+        self.tracer = tracer
+        self.start = self._last = time.perf_counter_ns()
+        self.marks = [] # (nome, duração_ns)
+
+    def mark(self, name):
+        now = time.perf_counter_ns()
+        self.marks.append((name, now - self._last))
+        if self.tracer is not None and self.tracer.enabled:
+            self.tracer.record(name, self._last, now)
+        self._last = now
+
+    @property
+    def total_ms(self):
+        return (self._last - self.start) / 1e6
+
+    def report(self):
+        """Texto com a duração de cada etapa e o tempo acumulado."""
+        lines = ["Inicialização:"]
+        elapsed = 0
+        for name, duration in self.marks:
+            elapsed += duration
+            lines.append(f"  {name:<18}{duration / 1e6:8.1f} ms  (total {elapsed / 1e6:7.1f} ms)")
+        return "\n".join(lines)
+
+
+# Tracer único do aplicativo (ligado pelo HUD ou com THERMAL_VIEWER_TRACE=1)
+TRACER = Tracer(enabled=TRACE_ENABLED)
@@ -62,4 +62,20 @@ QGroupBox::title {
     left: 10px;                    /* Afastamento da borda esquerda */
     padding: 0 3px;
 }
+
+/* Tabela de estatísticas dos ROIs */
+QTableWidget {
+    background-color: #1a1a1a;
+    color: #cccccc;
+    gridline-color: #333333;
+    border: 1px solid #333333;
+    selection-background-color: #0e639c;
+}
+QHeaderView::section {
+    background-color: #252525;
+    color: #cccccc;
+    border: none;
+    border-right: 1px solid #333333;
+    padding: 3px;
+}
 """
\ No newline at end of file